@@ -1,8 +1,11 @@
+from functools import partial
+
 import streamlit as st
 
-from modules.db.db_absences import load_active_absences_db
+from modules.db.db_absences import get_absence_index_db, load_active_absences_db
 from modules.db.db_competitions import load_competitions_db
 from modules.db.db_players import load_players_db
+from modules.db.db_prefetch import load_page_data
 from modules.db.db_records import get_records_db
 from modules.ui.absents_ui import filtrar_jugadoras_ausentes
 from modules.util.util import clean_df, data_format
@@ -19,6 +22,7 @@ from modules.ui.ui_app import (
 )
 
 from modules.i18n.i18n import t
+from modules.util.profiler import render_profile, section
 import modules.app_config.config as config
 config.init_config()
 
@@ -27,20 +31,32 @@ st.header(t("Resumen de :red[Wellness] [1er Equipo]"), divider="red")
 # ============================================================
 # 📦 CARGA DE DATOS
 # ============================================================
-df = get_records_db()
+# data_format solo trabaja con el primer equipo: el filtro va en la consulta
+# Consultas independientes → en paralelo
+with section("Carga de datos"):
+    datos = load_page_data({
+        "df": partial(get_records_db, plantel="1FF"),
+        "jug_df": load_players_db,
+        "comp_df": load_competitions_db,
+        "ausencias_df": load_active_absences_db,
+        "indice_ausencias": get_absence_index_db,
+    })
+df = datos["df"]
 
 if df.empty:
     st.warning(t("No hay registros de Wellness o RPE disponibles."))
+    render_profile()
     st.stop()
 
-df = data_format(df)
-jug_df = load_players_db()
+with section("data_format"):
+    df = data_format(df)
+jug_df = datos["jug_df"]
 #st.dataframe(jug_df)
  
 #jug_df = jug_df[jug_df["plantel"] == "1FF"]
    
-comp_df = load_competitions_db()
-ausencias_df = load_active_absences_db()
+comp_df = datos["comp_df"]
+ausencias_df = datos["ausencias_df"]
 
 # ============================================================
 # INTERFAZ PRINCIPAL
@@ -66,28 +82,33 @@ with col1:
         index=list(OPCIONES_PERIODO.keys()).index(default_period))
 
     periodo = next(k for k, v in OPCIONES_PERIODO.items() if v == periodo_traducido)
-    df_periodo, articulo = filter_df_by_period(df, periodo)
+    with section("filter_df_by_period"):
+        df_periodo, articulo = filter_df_by_period(df, periodo)
 
 #st.dataframe(df, hide_index=True)
 #st.dataframe(df_periodo, hide_index=True)
 
 # Cálculos principales
-wellness_prom, chart_wellness, delta_wellness = calc_metric_block(df_periodo, periodo, "wellness_score", "mean")
-rpe_prom, chart_rpe, delta_rpe = calc_metric_block(df_periodo, periodo, "rpe", "mean")
-ua_total, chart_ua, delta_ua = calc_metric_block(df_periodo, periodo, "ua", "sum")
-alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas = calc_alertas(df_periodo, df, periodo)
+with section("calc_metric_block"):
+    wellness_prom, chart_wellness, delta_wellness = calc_metric_block(df_periodo, periodo, "wellness_score", "mean")
+    rpe_prom, chart_rpe, delta_rpe = calc_metric_block(df_periodo, periodo, "rpe", "mean")
+    ua_total, chart_ua, delta_ua = calc_metric_block(df_periodo, periodo, "ua", "sum")
+with section("calc_alertas"):
+    alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas = calc_alertas(df_periodo, df, periodo)
 
 # ============================================================
 # 💠 TARJETAS DE MÉTRICAS
 # ============================================================
-render_metric_cards(wellness_prom, delta_wellness, chart_wellness, rpe_prom, delta_rpe, chart_rpe, ua_total, delta_ua, chart_ua, alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas, articulo)
+with section("Tarjetas (estilos y gráficos)"):
+    render_metric_cards(wellness_prom, delta_wellness, chart_wellness, rpe_prom, delta_rpe, chart_rpe, ua_total, delta_ua, chart_ua, alertas_count, total_jugadoras, alertas_pct, chart_alertas, delta_alertas, articulo)
 
 # ============================================================
 # 📋 INTERPRETACIÓN Y RESUMEN TÉCNICO
 # ============================================================
-show_interpretation(wellness_prom, rpe_prom, ua_total, alertas_count, alertas_pct, delta_ua, total_jugadoras)
+with section("Interpretación y resumen técnico"):
+    show_interpretation(wellness_prom, rpe_prom, ua_total, alertas_count, alertas_pct, delta_ua, total_jugadoras)
 
-mostrar_resumen_tecnico(wellness_prom, rpe_prom, ua_total, alertas_count, total_jugadoras)
+    mostrar_resumen_tecnico(wellness_prom, rpe_prom, ua_total, alertas_count, total_jugadoras)
 
 # ============================================================
 # 📊 REGISTROS DEL PERIODO
@@ -122,15 +143,19 @@ tabs = st.tabs([
 
 if df_periodo.empty:
     st.info(t("No hay registros disponibles en este periodo."))
+    render_profile()
     st.stop()
 
-with tabs[0]: 
+with tabs[0], section("generar_resumen_periodo"):
     generar_resumen_periodo(df_periodo)
-with tabs[1]: 
+with tabs[1], section("Tabla de registros"):
     st.dataframe(clean_df(df_periodo), hide_index=True)
-with tabs[2]:
+with tabs[2], section("Pendientes de registro"):
 
-    jugadoras_disponibles_df = filtrar_jugadoras_ausentes(jug_df, ausencias_df)
+    # Ausencias del último día del periodo (también para periodos pasados)
+    jugadoras_disponibles_df = filtrar_jugadoras_ausentes(
+        jug_df, ausencias_df, datos["indice_ausencias"], df_periodo["fecha_sesion"].max()
+    )
     pendientes_in, pendientes_out = get_pendientes_check(df_periodo, jugadoras_disponibles_df)
 
     col1, col2 = st.columns(2)
@@ -146,4 +171,6 @@ with tabs[2]:
         if pendientes_out.empty:
             st.success(t(":material/check_circle: Todas las jugadoras han realizado el check-out."))
         else:
-            st.dataframe(pendientes_out, hide_index=True)
\ No newline at end of file
+            st.dataframe(pendientes_out, hide_index=True)
+
+render_profile()
@@ -1,6 +1,7 @@
 import streamlit as st
 from modules.auth_system.auth_core import bootstrap_auth_from_cookie, init_app_state, validate_login
 from modules.auth_system.auth_ui import login_view, menu
+from modules.util.profiler import start_profile
 import uuid
 
 def init_config():
@@ -22,4 +23,7 @@ def init_config():
         login_view()
         st.stop()
 
-    menu()
\ No newline at end of file
+    menu()
+
+    # Perfil del rerun (modo perfilado de la página developer)
+    start_profile()
\ No newline at end of file
@@ -1,6 +1,8 @@
 # src/auth_system/auth_core.py
 
 import datetime
+import threading
+import time
 import uuid
 import bcrypt
 import jwt
@@ -145,6 +147,60 @@ def bootstrap_auth_from_cookie():
     #st.text("Bootstrap completado.")
 
 
+# ======================================================
+# Caché de sesión validada + revocación por session id
+# ======================================================
+# Verificar la firma del JWT en cada rerun es innecesario: una vez validado,
+# el payload se guarda en session_state junto al token. Solo se vuelve a
+# verificar si cambia el token o cuando falta poco para que expire. Las
+# sesiones revocadas (logout, revoke_session) se comprueban en cada rerun
+# con una búsqueda en un conjunto compartido por el proceso.
+
+_REVALIDAR_ANTES_S = 60
+_SESION_VALIDADA = "_auth_validada"
+
+@st.cache_resource(show_spinner=False)
+def _revoked_sessions() -> dict:
+    return {"lock": threading.Lock(), "sids": {}}   # sid → instante de revocación
+
+def revoke_session(session_id: str) -> None:
+    """Invalida una sesión (sid del JWT) en todas las pestañas del proceso."""
+    if not session_id:
+        return
+    ahora = time.time()
+    revocadas = _revoked_sessions()
+    with revocadas["lock"]:
+        # Pasado JWT_EXP_SECONDS el token ya habrá expirado por sí solo
+        caducadas = [sid for sid, t in revocadas["sids"].items() if ahora - t > auth_config.JWT_EXP_SECONDS]
+        for sid in caducadas:
+            del revocadas["sids"][sid]
+        revocadas["sids"][session_id] = ahora
+
+def is_session_revoked(session_id: str) -> bool:
+    return session_id in _revoked_sessions()["sids"]
+
+def _validated_payload(token: str):
+    """Payload del token usando la caché de sesión; None si no es válido."""
+    cache = st.session_state.get(_SESION_VALIDADA)
+    if cache and cache["token"] == token and time.time() < cache["exp"] - _REVALIDAR_ANTES_S:
+        payload = cache["payload"]
+    else:
+        payload = decode_jwt(token)
+        if not payload:
+            st.session_state.pop(_SESION_VALIDADA, None)
+            return None
+        st.session_state[_SESION_VALIDADA] = {
+            "token": token,
+            "payload": payload,
+            "exp": payload.get("exp", 0),
+        }
+
+    if is_session_revoked(payload.get("sid")):
+        st.session_state.pop(_SESION_VALIDADA, None)
+        return None
+    return payload
+
+
 # ======================================================
 # get_current_user (YA SIN LEER COOKIES)
 # ======================================================
@@ -160,7 +216,7 @@ def get_current_user():
     if not token:
         return None
 
-    payload = decode_jwt(token)
+    payload = _validated_payload(token)
     if not payload:
         logout()
         return None
@@ -179,6 +235,10 @@ def validate_login():
 def logout():
     ensure_state()
 
+    # 0) Revocar la sesión: otras pestañas con el mismo token dejan de validar
+    revoke_session(st.session_state["auth"].get("session_id"))
+    st.session_state.pop(_SESION_VALIDADA, None)
+
     # 1) Marcar que hay un logout en curso
     st.session_state["_logout_pending"] = True
 
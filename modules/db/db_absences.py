@@ -1,6 +1,33 @@
 import pandas as pd
 import streamlit as st
 from modules.db.db_client import query, execute
+from modules.util.absence_index import build_absence_index
+
+_SQL_AUSENCIAS = """
+    SELECT 
+        a.id,
+        a.id_jugadora,
+        UPPER(CONCAT(f.nombre, ' ', f.apellido)) AS nombre_jugadora,
+        f.competicion AS plantel,
+        a.fecha_inicio,
+        a.fecha_fin,
+        ta.nombre AS motivo_nombre,
+        a.turno,
+        a.observacion,
+        a.usuario
+    FROM ausencias a
+    LEFT JOIN futbolistas f 
+        ON a.id_jugadora = f.identificacion
+    LEFT JOIN tipo_ausencia ta
+        ON a.motivo_id = ta.id
+    WHERE f.genero = 'F' AND f.id_estado = 1
+"""
+
+def _filtrar_por_rol(df: pd.DataFrame, developer: bool) -> pd.DataFrame:
+    """Las ausencias de prueba (usuario developer) solo las ve el rol developer."""
+    if developer:
+        return df[df["usuario"] == "developer"]
+    return df[df["usuario"] != "developer"]
 
 def load_active_absences_db(activas: bool = True):
     """
@@ -9,25 +36,7 @@ def load_active_absences_db(activas: bool = True):
     - activas=True → solo las activas hoy
     """
 
-    base_sql = """
-        SELECT 
-            a.id,
-            a.id_jugadora,
-            UPPER(CONCAT(f.nombre, ' ', f.apellido)) AS nombre_jugadora,
-            f.competicion AS plantel,
-            a.fecha_inicio,
-            a.fecha_fin,
-            ta.nombre AS motivo_nombre,
-            a.turno,
-            a.observacion,
-            a.usuario
-        FROM ausencias a
-        LEFT JOIN futbolistas f 
-            ON a.id_jugadora = f.identificacion
-        LEFT JOIN tipo_ausencia ta
-            ON a.motivo_id = ta.id
-        WHERE f.genero = 'F' AND f.id_estado = 1
-    """
+    base_sql = _SQL_AUSENCIAS
 
     if activas:
         base_sql += "AND CURDATE() BETWEEN a.fecha_inicio AND a.fecha_fin"
@@ -40,12 +49,24 @@ def load_active_absences_db(activas: bool = True):
 
     # Filtrado por developer
     rol = st.session_state["auth"]["rol"].lower()
-    if rol == "developer":
-        df = df[df["usuario"] == "developer"]
-    else:
-        df = df[df["usuario"] != "developer"]
+    return _filtrar_por_rol(df, rol == "developer")
 
-    return df
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_absence_index(developer: bool) -> dict:
+    rows = query(_SQL_AUSENCIAS)
+    df = pd.DataFrame(rows or [])
+    if not df.empty:
+        df = _filtrar_por_rol(df, developer)
+    return build_absence_index(df)
+
+def get_absence_index_db() -> dict:
+    """
+    Índice de intervalos de todas las ausencias (ver modules.util.absence_index)
+    para consultar quién está ausente en cualquier día o rango, no solo hoy.
+    Se cachea por visibilidad y se invalida al insertar o borrar ausencias.
+    """
+    rol = st.session_state["auth"]["rol"].lower()
+    return _load_absence_index(rol == "developer")
 
 def insert_absence(id_jugadora, fecha_inicio, fecha_fin, motivo_id, turno, observacion):
 
@@ -66,6 +87,8 @@ def insert_absence(id_jugadora, fecha_inicio, fecha_fin, motivo_id, turno, obser
     )
 
     ok = execute(sql, params)
+    if ok:
+        _load_absence_index.clear()
 
     return ok
 
@@ -86,6 +109,7 @@ def delete_absences(ids: list[int]) -> tuple[bool, str]:
     ok = execute(sql, tuple(ids))
 
     if ok:
+        _load_absence_index.clear()
         return True, f"Se eliminaron {len(ids)} registro(s) correctamente."
     
     return False, "Error al eliminar ausencias."
@@ -1,5 +1,7 @@
+import time
 import streamlit as st
 from modules.db.db_connection import get_connection
+from modules.db.db_query_stats import record_query
 
 # ============================================================
 #  🔹 FUNCIÓN GENÉRICA PARA EJECUTAR SELECT
@@ -21,10 +23,13 @@ def query(sql: str, params=None, fetch="all"):
             - True for no-fetch operations
             - None on error
     """
+    inicio = time.perf_counter()
     try:
         conn = get_connection()
         if conn is None:
             return None
+        # La espera por una conexión libre va a las métricas del pool, no al tiempo de la consulta
+        inicio = time.perf_counter()
 
         cursor = conn.cursor(dictionary=True)
 
@@ -38,9 +43,11 @@ def query(sql: str, params=None, fetch="all"):
             conn.commit()
             result = True
 
+        record_query(sql, time.perf_counter() - inicio, result)
         return result
 
     except Exception as e:
+        record_query(sql, time.perf_counter() - inicio, error=True)
         st.error(f"Error ejecutando operación: {e} - SQL: {sql}")
         return None
 
@@ -54,6 +61,55 @@ def query(sql: str, params=None, fetch="all"):
         except:
             pass
 
+# ============================================================
+#  🔹 SELECT POR BLOQUES (exportaciones grandes)
+# ============================================================
+
+def query_chunks(sql: str, params=None, chunksize: int = 5000):
+    """
+    Executes a SELECT and yields the rows in blocks of `chunksize` dicts,
+    reading from the server cursor with fetchmany() instead of fetchall().
+
+    The pooled connection stays checked out until the generator is
+    exhausted or closed.
+    """
+    conn, cursor = None, None
+    inicio = time.perf_counter()
+    filas = 0
+    try:
+        conn = get_connection()
+        if conn is None:
+            return
+        inicio = time.perf_counter()
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, params)
+
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+            filas += len(rows)
+            yield rows
+
+        record_query(sql, time.perf_counter() - inicio, filas=filas)
+
+    except Exception as e:
+        record_query(sql, time.perf_counter() - inicio, filas=filas, error=True)
+        st.error(f"Error ejecutando operación: {e} - SQL: {sql}")
+        raise
+
+    finally:
+        try:
+            if conn is not None and conn.unread_result:
+                conn.consume_results()
+        except:
+            pass
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
 # ============================================================
 #  🔹 FUNCIÓN GENÉRICA PARA EJECUTAR INSERT / UPDATE / DELETE
 # ============================================================
@@ -70,14 +126,22 @@ def execute(sql: str, params=None):
     Returns:
         bool: True if committed successfully, False on error.
     """
+    conn, cursor = None, None
+    inicio = time.perf_counter()
     try:
         conn = get_connection()
+        if conn is None:
+            return False
+        inicio = time.perf_counter()
+
         cursor = conn.cursor()
         cursor.execute(sql, params)
         conn.commit()
+        record_query(sql, time.perf_counter() - inicio, filas=max(cursor.rowcount, 0))
         return True
     
     except Exception as e:
+        record_query(sql, time.perf_counter() - inicio, error=True)
         st.error(f"Error ejecutando operación: {e}")
         return False
     
@@ -86,3 +150,55 @@ def execute(sql: str, params=None):
             cursor.close()
         if conn:
             conn.close()
+
+# ============================================================
+#  🔹 VARIAS SENTENCIAS EN UNA SOLA TRANSACCIÓN
+# ============================================================
+
+def execute_transaction(statements: list[tuple[str, object]]):
+    """
+    Executes several INSERT / UPDATE / DELETE statements atomically.
+
+    Args:
+        statements (list[tuple[str, params]]): (sql, params) pairs. If params
+            is a list, the statement is run with executemany().
+
+    Returns:
+        bool: True if everything was committed, False (rolled back) on error.
+    """
+    conn, cursor = None, None
+    en_curso, inicio = None, 0.0  # sentencia en ejecución, para registrar la que falla
+    try:
+        conn = get_connection()
+        if conn is None:
+            return False
+
+        conn.start_transaction()
+        cursor = conn.cursor()
+        for sql, params in statements:
+            en_curso, inicio = sql, time.perf_counter()
+            if isinstance(params, list):
+                if params:
+                    cursor.executemany(sql, params)
+            else:
+                cursor.execute(sql, params)
+            record_query(sql, time.perf_counter() - inicio, filas=max(cursor.rowcount, 0))
+            en_curso = None
+        conn.commit()
+        return True
+
+    except Exception as e:
+        if en_curso is not None:
+            record_query(en_curso, time.perf_counter() - inicio, error=True)
+        try:
+            conn.rollback()
+        except:
+            pass
+        st.error(f"Error ejecutando operación: {e}")
+        return False
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
@@ -1,15 +1,81 @@
+import threading
+import time
 import streamlit as st
 import mysql.connector
 from mysql.connector import pooling
 
+# ============================================================
+#  🔹 CONFIGURACIÓN DEL POOL
+# ============================================================
+# Valores por defecto; se pueden sobrescribir en secrets.toml:
+#
+#   [connections.mysql]
+#   pool_size = 20          # conexiones físicas (máx. 32 en mysql-connector)
+#   pool_timeout = 10       # segundos esperando una conexión libre
+#   pool_retries = 1        # reintentos si la reconexión de una conexión caída falla
+#   backend = "sqlite"      # opcional: BD SQLite local en lugar de MySQL (ver db_sqlite)
+
+_POOL_SIZE = 15
+_POOL_TIMEOUT = 10.0
+_POOL_RETRIES = 1
+_RETRY_DELAY = 0.2
+
+def _pool_config(db_config) -> tuple[int, float, int]:
+    """Lee tamaño, timeout y reintentos del pool desde los secrets."""
+    size = int(db_config.get("pool_size", _POOL_SIZE))
+    size = max(1, min(size, pooling.CNX_POOL_MAXSIZE))
+    timeout = float(db_config.get("pool_timeout", _POOL_TIMEOUT))
+    retries = max(0, int(db_config.get("pool_retries", _POOL_RETRIES)))
+    return size, timeout, retries
+
+def _pool_state(pool, size: int, timeout: float, retries: int = _POOL_RETRIES) -> dict:
+    """
+    Envuelve el pool con un semáforo del mismo tamaño: las peticiones que no
+    encuentran conexión libre esperan en cola (hasta 'timeout') en lugar de
+    fallar al instante con "pool exhausted".
+    """
+    return {
+        "pool": pool,
+        "size": size,
+        "timeout": timeout,
+        "retries": retries,
+        "semaforo": threading.BoundedSemaphore(size),
+        "lock": threading.Lock(),
+        "stats": _empty_stats(),
+    }
+
+def _empty_stats() -> dict:
+    return {
+        "checkouts": 0,
+        "esperas": 0,           # checkouts que tuvieron que esperar en cola
+        "espera_total_s": 0.0,
+        "espera_max_s": 0.0,
+        "timeouts": 0,          # sin conexión libre tras pool_timeout
+        "fallos": 0,            # errores de MySQL al obtener/reconectar
+        "reintentos": 0,
+        "en_uso": 0,
+        "max_en_uso": 0,
+    }
+
 @st.cache_resource(show_spinner=False)
 def init_connection():
     """Inicializa un pool de conexiones MySQL usando st.secrets."""
     db_config = st.secrets["connections"]["mysql"]
+    size, timeout, retries = _pool_config(db_config)
+
+    if str(db_config.get("backend", "mysql")).lower() == "sqlite":
+        # Pruebas de carga/latencia en local: mismo pool y semáforo, sin servidor
+        from modules.db.db_sqlite import SQLitePool
+        pool = SQLitePool(
+            db_config.get("sqlite_path", "tmp/wellness.db"),
+            latencia_ms=db_config.get("latency_ms", 0),
+            seed=bool(db_config.get("seed", False)),
+        )
+        return _pool_state(pool, size, timeout, retries)
 
     pool = pooling.MySQLConnectionPool(
         pool_name="main_pool",
-        pool_size=15,
+        pool_size=size,
         pool_reset_session=True,
         host=db_config["host"],
         user=db_config["username"],
@@ -18,14 +84,121 @@ def init_connection():
         port=db_config["port"],
         auth_plugin="mysql_native_password"
     )
-    return pool
+    return _pool_state(pool, size, timeout, retries)
+
+# ============================================================
+#  🔹 CONEXIÓN PRESTADA
+# ============================================================
+
+class _PooledConnection:
+    """
+    Conexión del pool que devuelve su hueco del semáforo al cerrarse.
+    Delega todo lo demás (cursor, commit, rollback...) en la conexión real.
+    """
+
+    def __init__(self, conn, estado: dict):
+        self._conn = conn
+        self._estado = estado
+        self._cerrada = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._cerrada:
+            return
+        self._cerrada = True
+        try:
+            # Devuelve la conexión al pool (reset_session incluido)
+            self._conn.close()
+        except mysql.connector.Error:
+            # La conexión vuelve al pool igualmente; el siguiente checkout la reconecta
+            _record(self._estado, fallo=True)
+        finally:
+            _record(self._estado, liberada=True)
+            self._estado["semaforo"].release()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+def _record(estado: dict, espera: float | None = None, timeout=False, fallo=False, reintento=False, liberada=False):
+    """Actualiza los contadores del pool."""
+    with estado["lock"]:
+        s = estado["stats"]
+        if espera is not None:
+            s["checkouts"] += 1
+            s["en_uso"] += 1
+            s["max_en_uso"] = max(s["max_en_uso"], s["en_uso"])
+            s["espera_total_s"] += espera
+            s["espera_max_s"] = max(s["espera_max_s"], espera)
+            if espera > 0.001:
+                s["esperas"] += 1
+        if timeout:
+            s["timeouts"] += 1
+        if fallo:
+            s["fallos"] += 1
+        if reintento:
+            s["reintentos"] += 1
+        if liberada:
+            s["en_uso"] = max(0, s["en_uso"] - 1)
 
 def get_connection():
-    """Obtiene una conexión activa desde el pool."""
-    pool = init_connection()
-    try:
-        conn = pool.get_connection()
-        return conn
-    except mysql.connector.Error as e:
-        st.error(f":material/warning: Error al conectar con MySQL: {e}")
+    """
+    Obtiene una conexión activa desde el pool.
+
+    Si no hay conexiones libres, espera en cola hasta pool_timeout. El pool
+    hace ping al entregar la conexión y la reconecta si estaba caída; si esa
+    reconexión falla se reintenta pool_retries veces antes de dar error.
+    """
+    estado = init_connection()
+
+    t0 = time.perf_counter()
+    if not estado["semaforo"].acquire(timeout=estado["timeout"]):
+        _record(estado, timeout=True)
+        st.error(
+            f":material/warning: No hay conexiones libres con MySQL tras "
+            f"{estado['timeout']:.0f} s de espera. Inténtalo de nuevo."
+        )
         return None
+    espera = time.perf_counter() - t0
+
+    for intento in range(estado["retries"] + 1):
+        try:
+            conn = estado["pool"].get_connection()
+            _record(estado, espera=espera)
+            return _PooledConnection(conn, estado)
+        except mysql.connector.Error as e:
+            _record(estado, fallo=True)
+            if intento < estado["retries"]:
+                _record(estado, reintento=True)
+                time.sleep(_RETRY_DELAY)
+                continue
+            estado["semaforo"].release()
+            st.error(f":material/warning: Error al conectar con MySQL: {e}")
+            return None
+
+# ============================================================
+#  🔹 MÉTRICAS DEL POOL (página developer)
+# ============================================================
+
+def get_pool_stats() -> dict:
+    """Copia de los contadores del pool más su tamaño y timeout."""
+    estado = init_connection()
+    with estado["lock"]:
+        stats = dict(estado["stats"])
+    stats["pool_size"] = estado["size"]
+    stats["pool_timeout"] = estado["timeout"]
+    stats["espera_media_s"] = stats["espera_total_s"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    return stats
+
+def reset_pool_stats():
+    """Reinicia los contadores (sin tocar las conexiones en uso)."""
+    estado = init_connection()
+    with estado["lock"]:
+        en_uso = estado["stats"]["en_uso"]
+        estado["stats"] = _empty_stats()
+        estado["stats"]["en_uso"] = en_uso
+        estado["stats"]["max_en_uso"] = en_uso
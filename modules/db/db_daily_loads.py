@@ -0,0 +1,229 @@
+import datetime
+import threading
+import pandas as pd
+import streamlit as st
+from modules.db.db_client import query, execute, execute_transaction
+
+# ============================================================
+#  🔹 RESUMEN DIARIO POR JUGADORA (wellness_diario)
+# ============================================================
+# Una fila por (jugadora, día, visibilidad). Se mantiene al día desde las
+# escrituras de db_records, así que los reportes no tienen que reagrupar
+# los registros crudos de check-in/check-out en cada rerun.
+#
+#   registros      → filas de wellness del día
+#   sesiones       → filas con UA (check-out)
+#   ua_total       → suma de UA
+#   ua_cuadrados   → suma de UA² (permite recomputar la desviación por semana)
+#   minutos_total  → suma de minutos de sesión
+#   rpe_medio      → RPE medio de las sesiones
+#   recuperacion, energia, sueno, stress, dolor → medias del día (1-5)
+
+_SQL_CREATE = """
+    CREATE TABLE IF NOT EXISTS wellness_diario (
+        id_jugadora VARCHAR(50) NOT NULL,
+        fecha_sesion DATE NOT NULL,
+        developer TINYINT NOT NULL DEFAULT 0,
+        registros INT NOT NULL DEFAULT 0,
+        sesiones INT NOT NULL DEFAULT 0,
+        ua_total DOUBLE NULL,
+        ua_cuadrados DOUBLE NULL,
+        minutos_total DOUBLE NULL,
+        rpe_medio DOUBLE NULL,
+        recuperacion DOUBLE NULL,
+        energia DOUBLE NULL,
+        sueno DOUBLE NULL,
+        stress DOUBLE NULL,
+        dolor DOUBLE NULL,
+        PRIMARY KEY (id_jugadora, fecha_sesion, developer)
+    );
+"""
+
+_SQL_AGREGADO = """
+    INSERT INTO wellness_diario (
+        id_jugadora, fecha_sesion, developer, registros, sesiones,
+        ua_total, ua_cuadrados, minutos_total, rpe_medio,
+        recuperacion, energia, sueno, stress, dolor
+    )
+    SELECT
+        w.id_jugadora,
+        w.fecha_sesion,
+        CASE WHEN w.usuario = 'developer' THEN 1 ELSE 0 END AS developer,
+        COUNT(*),
+        COUNT(w.ua),
+        SUM(w.ua),
+        SUM(w.ua * w.ua),
+        SUM(w.minutos_sesion),
+        AVG(w.rpe),
+        AVG(w.recuperacion),
+        AVG(w.fatiga),
+        AVG(w.sueno),
+        AVG(w.stress),
+        AVG(w.dolor)
+    FROM wellness w
+    WHERE w.estatus_id <= 2
+    {filtro}
+    GROUP BY w.id_jugadora, w.fecha_sesion, CASE WHEN w.usuario = 'developer' THEN 1 ELSE 0 END
+"""
+
+_COLUMNAS_RESUMEN = (
+    "registros", "sesiones", "ua_total", "ua_cuadrados", "minutos_total", "rpe_medio",
+    "recuperacion", "energia", "sueno", "stress", "dolor",
+)
+
+# Recalcula de una vez los días afectados: upsert de los que siguen teniendo
+# registros y borrado solo de los que se han quedado sin ninguno
+_SQL_UPSERT_DIAS = _SQL_AGREGADO.format(filtro="AND (w.id_jugadora, w.fecha_sesion) IN ({pares})") + (
+    "ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in _COLUMNAS_RESUMEN)
+)
+
+_SQL_BORRAR_DIAS_VACIOS = """
+    DELETE FROM wellness_diario
+    WHERE (id_jugadora, fecha_sesion) IN ({pares})
+      AND NOT EXISTS (
+          SELECT 1 FROM wellness w
+          WHERE w.id_jugadora = wellness_diario.id_jugadora
+            AND w.fecha_sesion = wellness_diario.fecha_sesion
+            AND w.estatus_id <= 2
+            AND CASE WHEN w.usuario = 'developer' THEN 1 ELSE 0 END = wellness_diario.developer
+      );
+"""
+
+# La tabla se crea y se rellena al desplegar con
+# modules/db/migrations/001_wellness_diario.sql. Si falta, la primera
+# petición del proceso la crea y la rellena. Solo se recuerda el éxito:
+# tras un error se vuelve a comprobar en la siguiente llamada.
+_tabla = {"lista": False, "lock": threading.Lock()}
+
+def ensure_daily_loads_table() -> bool:
+    """True si wellness_diario existe y tiene datos (la crea/rellena si falta)."""
+    if _tabla["lista"]:
+        return True
+
+    with _tabla["lock"]:
+        if _tabla["lista"]:
+            return True
+
+        if not execute(_SQL_CREATE):
+            return False
+        rows = query("SELECT 1 AS n FROM wellness_diario LIMIT 1;")
+        if rows is None:
+            return False
+        if not rows:
+            return rebuild_daily_loads()
+
+        _tabla["lista"] = True
+        return True
+
+def rebuild_daily_loads() -> bool:
+    """Recalcula el resumen diario completo desde la tabla wellness (la crea si falta)."""
+    if not execute(_SQL_CREATE):
+        return False
+
+    ok = execute_transaction([
+        ("DELETE FROM wellness_diario;", None),
+        (_SQL_AGREGADO.format(filtro=""), None),
+    ])
+    if ok:
+        _tabla["lista"] = True
+        _load_daily_loads.clear()
+    return ok
+
+def daily_loads_statements(pares: list[tuple[str, datetime.date]]) -> list[tuple[str, tuple]] | None:
+    """
+    Sentencias que recalculan los días (id_jugadora, fecha_sesion) indicados:
+    un INSERT … SELECT … ON DUPLICATE KEY UPDATE y un DELETE de los días que
+    se han quedado sin registros, para todos los pares a la vez. db_records
+    las añade a la misma transacción que la escritura de wellness, así el
+    resumen no puede quedar desfasado respecto al registro guardado.
+
+    Devuelve None si la tabla no está disponible.
+    """
+    pares = list(dict.fromkeys((str(j), f) for j, f in pares))
+    if not pares:
+        return []
+    if not ensure_daily_loads_table():
+        return None
+
+    marcadores = ", ".join(["(%s, %s)"] * len(pares))
+    params = tuple(valor for par in pares for valor in par)
+    return [
+        (_SQL_UPSERT_DIAS.format(pares=marcadores) + ";", params),
+        (_SQL_BORRAR_DIAS_VACIOS.format(pares=marcadores), params),
+    ]
+
+def clear_daily_loads_cache() -> None:
+    """Descarta las lecturas cacheadas del resumen tras confirmar una escritura."""
+    _load_daily_loads.clear()
+
+@st.cache_data(show_spinner=False)
+def _load_daily_loads(developer: bool, start, end, id_jugadora) -> pd.DataFrame | None:
+    condiciones = ["d.developer = %(developer)s"]
+    params = {"developer": 1 if developer else 0}
+    if start is not None:
+        condiciones.append("d.fecha_sesion >= %(start)s")
+        params["start"] = start
+    if end is not None:
+        condiciones.append("d.fecha_sesion <= %(end)s")
+        params["end"] = end
+    if id_jugadora:
+        condiciones.append("d.id_jugadora = %(id_jugadora)s")
+        params["id_jugadora"] = id_jugadora
+
+    sql = f"""
+        SELECT
+            d.id_jugadora,
+            UPPER(CONCAT(f.nombre, ' ', f.apellido)) AS nombre_jugadora,
+            f.competicion AS plantel,
+            d.fecha_sesion,
+            d.registros,
+            d.sesiones,
+            d.ua_total,
+            d.ua_cuadrados,
+            d.minutos_total,
+            d.rpe_medio,
+            d.recuperacion,
+            d.energia,
+            d.sueno,
+            d.stress,
+            d.dolor
+        FROM wellness_diario d
+        LEFT JOIN futbolistas f ON d.id_jugadora = f.identificacion
+        WHERE f.genero = 'F' AND f.id_estado = 1
+          AND {" AND ".join(condiciones)}
+        ORDER BY d.fecha_sesion;
+    """
+
+    rows = query(sql, params)
+    if rows is None:
+        return None
+
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+
+    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.date
+    num_cols = df.columns.drop(["id_jugadora", "nombre_jugadora", "plantel", "fecha_sesion"])
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
+    df["nombre_jugadora"] = df["nombre_jugadora"].str.strip()
+
+    return df
+
+def load_daily_loads_db(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    id_jugadora: str | None = None,
+) -> pd.DataFrame | None:
+    """
+    Carga el resumen diario por jugadora para la ventana indicada,
+    respetando la visibilidad por rol.
+
+    Devuelve None si la tabla no está disponible; en ese caso los reportes
+    construyen el mismo resumen en memoria (metrics.build_daily_loads).
+    """
+    # Fuera de la caché: si la tabla no está lista no se recuerda el None
+    if not ensure_daily_loads_table():
+        return None
+
+    rol = st.session_state["auth"]["rol"].lower()
+    return _load_daily_loads(rol == "developer", start, end, id_jugadora)
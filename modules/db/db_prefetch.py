@@ -0,0 +1,61 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# ============================================================
+#  🔹 CARGA PARALELA DE DATOS DE PÁGINA
+# ============================================================
+# Las páginas piden varias tablas independientes (jugadoras, planteles,
+# registros, ausencias, catálogos). Cada una es su propio round trip a la
+# BD; lanzadas a la vez, el arranque en frío tarda lo que la más lenta.
+#
+# Cada tarea corre con el contexto de la sesión que la lanza, así que
+# st.session_state (rol, auth) y las cachés de Streamlit funcionan igual
+# que en el hilo principal. El pool de conexiones (db_connection) limita
+# cuántas consultas llegan a la vez a MySQL.
+
+_MAX_WORKERS = 6
+
+def _run_with_ctx(ctx, tarea: Callable):
+    hilo = threading.current_thread()
+    if ctx is not None:
+        add_script_run_ctx(hilo, ctx)
+    try:
+        inicio = time.perf_counter()
+        return tarea(), time.perf_counter() - inicio
+    finally:
+        if ctx is not None:
+            add_script_run_ctx(hilo, None)
+
+def load_page_data(tareas: dict[str, Callable], max_workers: int = _MAX_WORKERS) -> dict:
+    """
+    Ejecuta en paralelo las cargas independientes de una página.
+
+    tareas: {nombre → callable sin argumentos}; para pasar filtros usar
+    functools.partial, p. ej. partial(get_records_db, start=hoy, end=hoy).
+
+    Devuelve {nombre → resultado} en el mismo orden. Si una carga lanza una
+    excepción se propaga aquí, como en la versión secuencial. La duración de
+    cada carga queda en st.session_state["page_data_tiempos"].
+    """
+    if not tareas:
+        return {}
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    workers = max(1, min(max_workers, len(tareas)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page_data") as pool:
+        futuros = {
+            nombre: pool.submit(_run_with_ctx, ctx, tarea)
+            for nombre, tarea in tareas.items()
+        }
+        resultados = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+    if ctx is not None:
+        st.session_state["page_data_tiempos"] = {n: d for n, (_, d) in resultados.items()}
+
+    return {nombre: valor for nombre, (valor, _) in resultados.items()}
@@ -0,0 +1,165 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+import pandas as pd
+import streamlit as st
+
+from modules.util.profiler import call_site, count
+
+# ============================================================
+#  🔹 INSTRUMENTACIÓN DE CONSULTAS (db_client.query / execute)
+# ============================================================
+# Cada sentencia registra tiempo de reloj, filas y tamaño aproximado del
+# resultado. Se agregan por "huella" (SQL normalizado sin literales ni
+# parámetros) para ver qué consultas y qué páginas cargan más la base.
+
+SLOW_QUERY_S = 0.5
+_MAX_LENTAS = 50
+_MUESTRA_PAYLOAD = 50
+
+_DB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_RE_COMENTARIOS = re.compile(r"(--[^\n]*|/\*.*?\*/)", re.S)
+_RE_CADENAS = re.compile(r"'(?:[^'\\]|\\.)*'")
+_RE_PARAMS = re.compile(r"%\(\w+\)s|%s")
+_RE_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_RE_LISTAS_FILAS = re.compile(r"\(\s*\(\?\+\)(?:\s*,\s*\(\?\+\))*\s*\)")  # IN ((?, ?), ...)
+_RE_ESPACIOS = re.compile(r"\s+")
+
+@lru_cache(maxsize=512)
+def fingerprint(sql: str) -> str:
+    """
+    Normaliza una sentencia: sin comentarios, literales ni parámetros,
+    listas IN (...) colapsadas y espacios compactados.
+    """
+    s = _RE_COMENTARIOS.sub(" ", sql)
+    s = _RE_CADENAS.sub("?", s)
+    s = _RE_PARAMS.sub("?", s)
+    s = _RE_NUMEROS.sub("?", s)
+    s = _RE_LISTAS.sub("(?+)", s)
+    s = _RE_LISTAS_FILAS.sub("((?+)+)", s)
+    return _RE_ESPACIOS.sub(" ", s).strip().rstrip(";").strip()
+
+@st.cache_resource(show_spinner=False)
+def _query_log() -> dict:
+    """Registro compartido por todas las sesiones del proceso."""
+    return {
+        "lock": threading.Lock(),
+        "umbral_s": SLOW_QUERY_S,
+        "agregados": {},
+        "lentas": deque(maxlen=_MAX_LENTAS),
+    }
+
+def _payload_bytes(result) -> int:
+    """Tamaño aproximado del resultado (muestra de filas, extrapolada)."""
+    if not isinstance(result, (list, dict)):
+        return 0
+    filas = result if isinstance(result, list) else [result]
+    if not filas:
+        return 0
+    muestra = filas[:_MUESTRA_PAYLOAD]
+    tam = sum(len(str(v)) for fila in muestra for v in (fila.values() if isinstance(fila, dict) else fila))
+    return int(tam * len(filas) / len(muestra))
+
+def record_query(sql: str, duracion: float, result=None, filas: int | None = None, error: bool = False):
+    """
+    Registra una sentencia ejecutada. Lo llaman db_client.query/execute;
+    nunca debe romper la consulta, así que cualquier fallo se ignora.
+    """
+    try:
+        if filas is None:
+            filas = len(result) if isinstance(result, list) else int(isinstance(result, dict))
+        huella = fingerprint(sql)
+        origen, pagina = call_site(excluir=_DB_DIR)
+        payload = _payload_bytes(result)
+
+        count("consultas")
+        count("sql_s", duracion)
+
+        log = _query_log()
+        with log["lock"]:
+            a = log["agregados"].get(huella)
+            if a is None:
+                a = log["agregados"][huella] = {
+                    "llamadas": 0, "total_s": 0.0, "max_s": 0.0, "filas": 0,
+                    "bytes": 0, "errores": 0, "lentas": 0, "origenes": {}, "paginas": {},
+                }
+            a["llamadas"] += 1
+            a["total_s"] += duracion
+            a["max_s"] = max(a["max_s"], duracion)
+            a["filas"] += filas
+            a["bytes"] += payload
+            a["errores"] += int(error)
+            a["origenes"][origen] = a["origenes"].get(origen, 0) + 1
+            a["paginas"][pagina] = a["paginas"].get(pagina, 0) + 1
+
+            if duracion >= log["umbral_s"]:
+                a["lentas"] += 1
+                log["lentas"].append({
+                    "momento": time.strftime("%H:%M:%S"),
+                    "duracion_ms": round(duracion * 1000, 1),
+                    "filas": filas,
+                    "origen": origen,
+                    "pagina": pagina,
+                    "sql": huella,
+                })
+    except Exception:
+        pass
+
+# ============================================================
+#  🔹 CONSULTA DE LAS MÉTRICAS (página developer)
+# ============================================================
+
+def get_slow_query_threshold() -> float:
+    return _query_log()["umbral_s"]
+
+def set_slow_query_threshold(segundos: float):
+    _query_log()["umbral_s"] = float(segundos)
+
+def query_count() -> int:
+    """Total de sentencias registradas (la diferencia entre dos lecturas da las de un rerun)."""
+    log = _query_log()
+    with log["lock"]:
+        return sum(a["llamadas"] for a in log["agregados"].values())
+
+def top_queries(n: int = 15, orden: str = "total_s") -> pd.DataFrame:
+    """Top-N huellas ordenadas por 'total_s', 'max_s', 'llamadas', 'filas' o 'bytes'."""
+    log = _query_log()
+    with log["lock"]:
+        filas = [
+            {
+                "sql": huella,
+                "llamadas": a["llamadas"],
+                "total_s": a["total_s"],
+                "media_ms": a["total_s"] / a["llamadas"] * 1000,
+                "max_s": a["max_s"],
+                "filas": a["filas"],
+                "bytes": a["bytes"],
+                "lentas": a["lentas"],
+                "errores": a["errores"],
+                "pagina": max(a["paginas"], key=a["paginas"].get),
+                "origen": max(a["origenes"], key=a["origenes"].get),
+            }
+            for huella, a in log["agregados"].items()
+        ]
+    if not filas:
+        return pd.DataFrame()
+    return pd.DataFrame(filas).sort_values(orden, ascending=False).head(n).reset_index(drop=True)
+
+def slow_queries() -> pd.DataFrame:
+    """Últimas sentencias por encima del umbral (más recientes primero)."""
+    log = _query_log()
+    with log["lock"]:
+        lentas = list(log["lentas"])
+    return pd.DataFrame(lentas[::-1])
+
+def reset_query_stats():
+    log = _query_log()
+    with log["lock"]:
+        log["agregados"].clear()
+        log["lentas"].clear()
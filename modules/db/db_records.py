@@ -2,62 +2,173 @@ import streamlit as st
 import pandas as pd
 import json
 import datetime
+import threading
+from collections import OrderedDict
 
 from modules.db.db_catalogs import load_catalog_list_db
-from modules.db.db_client import query, execute
+from modules.db.db_client import query, query_chunks, execute_transaction
+from modules.db.db_daily_loads import clear_daily_loads_cache, daily_loads_statements
+from modules.util.profiler import count
+from modules.util.records_util import build_check_index, update_check_index
+
+# Margen de solapamiento del watermark: cubre transacciones que confirman
+# con una marca de tiempo anterior a la última fila ya leída.
+_MARGEN_WATERMARK = datetime.timedelta(seconds=5)
+
+# Número máximo de combinaciones de filtros guardadas en la caché compartida
+_MAX_ENTRADAS_CACHE = 32
+
+# Columnas que solo se usan para la carga incremental (no se exponen)
+_COLS_INTERNAS = ["estatus_id", "ultima_modificacion"]
+
+_SQL_RECORDS = """
+    SELECT 
+        w.id,
+        w.id_jugadora,
+        f.nombre,
+        f.apellido,
+        f.competicion AS plantel,
+        w.fecha_sesion,
+        w.tipo,
+        w.turno,
+        w.recuperacion,
+        w.fatiga AS energia,
+        w.sueno,
+        w.stress,
+        w.dolor,
+        zs.nombre AS zona_segmento,
+        w.zonas_anatomicas_dolor,
+        w.lateralidad_dolor,
+        w.periodizacion_tactica,
+        ec.nombre AS tipo_carga,
+        er.nombre AS rehabilitación_readaptación,
+        tc.nombre AS condicion,
+        w.minutos_sesion,
+        w.rpe,
+        w.ua,
+        w.en_periodo,
+        w.observacion,
+        w.fecha_hora_registro,
+        w.usuario,
+        w.estatus_id,
+        GREATEST(
+            w.fecha_hora_registro,
+            COALESCE(w.updated_at, w.fecha_hora_registro),
+            COALESCE(w.deleted_at, w.fecha_hora_registro)
+        ) AS ultima_modificacion
+    FROM wellness AS w
+    LEFT JOIN futbolistas f ON w.id_jugadora = f.identificacion
+    LEFT JOIN tipo_carga ec ON w.id_tipo_carga = ec.id
+    LEFT JOIN estimulos_readaptacion er ON w.id_tipo_readaptacion = er.id
+    LEFT JOIN tipo_condicion tc ON w.id_condicion = tc.id
+    LEFT JOIN zonas_segmento zs ON w.id_zona_segmento_dolor = zs.id
+    WHERE f.genero = 'F' AND f.id_estado = 1
+    {filtros}
+    ORDER BY w.fecha_hora_registro DESC, w.id DESC
+    {limite};
+"""
+
+def _records_filters(start=None, end=None, plantel=None, id_jugadora=None, desde=None) -> tuple[str, dict]:
+    """
+    Construye las condiciones WHERE y sus parámetros para la consulta de wellness.
 
-def get_records_db(as_df: bool = True):
+    - start / end: ventana sobre fecha_sesion (inclusive).
+    - plantel: código de competición de la jugadora.
+    - id_jugadora: una sola jugadora.
+    - desde: watermark; solo filas creadas, modificadas o eliminadas después.
+      En ese caso NO se filtra por estatus, para poder detectar los borrados.
     """
-    Carga registros de wellness, con joins ya incluidos.
+    rol = st.session_state["auth"]["rol"].lower()
+
+    condiciones = [
+        "w.usuario = 'developer'" if rol == "developer" else "w.usuario != 'developer'"
+    ]
+    params = {}
+
+    if desde is None:
+        condiciones.append("w.estatus_id <= 2")
+    else:
+        condiciones.append("""GREATEST(
+            w.fecha_hora_registro,
+            COALESCE(w.updated_at, w.fecha_hora_registro),
+            COALESCE(w.deleted_at, w.fecha_hora_registro)
+        ) >= %(desde)s""")
+        params["desde"] = desde
+
+    if start is not None:
+        condiciones.append("w.fecha_sesion >= %(start)s")
+        params["start"] = start
+    if end is not None:
+        condiciones.append("w.fecha_sesion <= %(end)s")
+        params["end"] = end
+    if plantel:
+        condiciones.append("f.competicion = %(plantel)s")
+        params["plantel"] = plantel
+    if id_jugadora:
+        condiciones.append("w.id_jugadora = %(id_jugadora)s")
+        params["id_jugadora"] = id_jugadora
+
+    filtros = "".join(f"\n    AND {c}" for c in condiciones)
+    return filtros, params
+
+# ============================================================
+#  🔹 TIPOS COMPACTOS DE LA CACHÉ
+# ============================================================
+# Las entradas de la caché compartida viven mientras no haya escrituras y
+# hay una por combinación de filtros, así que se guardan con tipos compactos:
+#
+#   - texto repetido (jugadora, plantel, tipo, turno, usuario, catálogos) → category
+#   - escalas 1–5 de wellness y RPE → Int8 (admite nulos)
+#   - fecha_sesion → datetime64 (las comparaciones son vectoriales)
+#   - zonas_anatomicas_dolor → category con los nombres unidos por ", "
+#
+# Las páginas de la tabla del administrador y la exportación siguen usando
+# _process_records sin compactar (listas de zonas y fechas date).
+
+_COLS_CATEGORIA = [
+    "id_jugadora", "nombre_jugadora", "plantel", "tipo", "turno", "usuario",
+    "zona_segmento", "lateralidad_dolor", "periodizacion_tactica",
+    "tipo_carga", "rehabilitación_readaptación", "condicion",
+]
+
+_COLS_ESCALA = ["recuperacion", "energia", "sueno", "stress", "dolor", "rpe"]
+
+def _unir_zonas(zonas):
+    return ", ".join(str(z) for z in zonas) if isinstance(zonas, list) else zonas
+
+def _compact_records(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pasa el DataFrame de registros a los tipos compactos de la caché.
+    Es idempotente: se aplica también tras fusionar el delta, porque
+    concatenar categorías distintas devuelve texto.
+    """
+    if df.empty:
+        return df
+
+    for col in _COLS_CATEGORIA:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    for col in _COLS_ESCALA:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int8")
+
+    if "zonas_anatomicas_dolor" in df.columns:
+        df["zonas_anatomicas_dolor"] = df["zonas_anatomicas_dolor"].map(_unir_zonas).astype("category")
+
+    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+
+    return df
+
+def _process_records(rows: list[dict], compacto: bool = False) -> pd.DataFrame:
+    """
+    Convierte filas crudas de wellness en el DataFrame que consumen las páginas.
+    Con compacto=True devuelve los tipos de la caché (ver _compact_records).
     """
 
     zonas_anatomicas_df = load_catalog_list_db("zonas_anatomicas", as_df=True)
     map_zonas = dict(zip(zonas_anatomicas_df["id"], zonas_anatomicas_df["nombre"]))
 
-    sql = """
-        SELECT 
-            w.id,
-            w.id_jugadora,
-            f.nombre,
-            f.apellido,
-            f.competicion AS plantel,
-            w.fecha_sesion,
-            w.tipo,
-            w.turno,
-            w.recuperacion,
-            w.fatiga AS energia,
-            w.sueno,
-            w.stress,
-            w.dolor,
-            zs.nombre AS zona_segmento,
-            w.zonas_anatomicas_dolor,
-            w.lateralidad_dolor,
-            w.periodizacion_tactica,
-            ec.nombre AS tipo_carga,
-            er.nombre AS rehabilitación_readaptación,
-            tc.nombre AS condicion,
-            w.minutos_sesion,
-            w.rpe,
-            w.ua,
-            w.en_periodo,
-            w.observacion,
-            w.fecha_hora_registro,
-            w.usuario
-        FROM wellness AS w
-        LEFT JOIN futbolistas f ON w.id_jugadora = f.identificacion
-        LEFT JOIN tipo_carga ec ON w.id_tipo_carga = ec.id
-        LEFT JOIN estimulos_readaptacion er ON w.id_tipo_readaptacion = er.id
-        LEFT JOIN tipo_condicion tc ON w.id_condicion = tc.id
-        LEFT JOIN zonas_segmento zs ON w.id_zona_segmento_dolor = zs.id
-        WHERE f.genero = 'F' AND f.id_estado = 1
-        AND w.estatus_id <= 2
-        ORDER BY w.fecha_hora_registro DESC;
-    """
-
-    rows = query(sql)
-    if not rows:
-        return pd.DataFrame() if as_df else []
-
     df = pd.DataFrame(rows)
 
     # Procesar JSON
@@ -70,23 +181,373 @@ def get_records_db(as_df: bool = True):
     )
 
     # Convertir fechas
-    df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.date
+    fecha_sesion = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+    df["fecha_sesion"] = fecha_sesion if compacto else fecha_sesion.dt.date
     df["fecha_hora_registro"] = pd.to_datetime(df["fecha_hora_registro"], errors="coerce")
-
-    # Filtrar por rol
-    rol = st.session_state["auth"]["rol"].lower()
-    if rol == "developer":
-        df = df[df["usuario"] == "developer"]
-    else:
-        df = df[df["usuario"] != "developer"]
+    df["ultima_modificacion"] = pd.to_datetime(df["ultima_modificacion"], errors="coerce")
 
     # Columna nombre_jugadora
     df.insert(2, "nombre_jugadora", (df["nombre"] + " " + df["apellido"]).str.strip().str.upper())
 
     df = df.drop(columns=["nombre", "apellido"], errors="ignore")
-    
+
+    return _compact_records(df) if compacto else df
+
+def _merge_records(df_cache: pd.DataFrame, df_delta: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fusiona las filas modificadas sobre el DataFrame cacheado:
+    la versión más reciente de cada id sustituye a la anterior y
+    las filas eliminadas (estatus_id > 2) desaparecen. El resultado
+    conserva los tipos compactos de la caché.
+    """
+    if df_delta.empty:
+        return df_cache
+
+    df = df_delta if df_cache.empty else pd.concat([df_cache, df_delta], ignore_index=True)
+    df = df.drop_duplicates(subset="id", keep="last")
+    df = df[df["estatus_id"] <= 2]
+
+    df = df.sort_values("fecha_hora_registro", ascending=False).reset_index(drop=True)
+    return _compact_records(df)
+
+@st.cache_resource(show_spinner=False)
+def _records_store() -> dict:
+    """
+    Caché de registros compartida por todas las sesiones del proceso.
+
+    Cada entrada guarda el DataFrame de una combinación de filtros
+    (visibilidad por rol, plantel, ventana de fechas, jugadora), su watermark
+    y si sigue vigente. Solo las escrituras la invalidan (no hay TTL).
+    """
+    return {"lock": threading.Lock(), "entradas": OrderedDict()}
+
+def _get_entry(clave: tuple) -> dict:
+    store = _records_store()
+    with store["lock"]:
+        entradas = store["entradas"]
+        entrada = entradas.get(clave)
+        if entrada is None:
+            entrada = {"df": None, "watermark": None, "vigente": False, "indice": None, "lock": threading.Lock()}
+            entradas[clave] = entrada
+        entradas.move_to_end(clave)
+
+        while len(entradas) > _MAX_ENTRADAS_CACHE:
+            entradas.popitem(last=False)
+
+    return entrada
+
+def _refresh_entry(entrada: dict, start, end, plantel, id_jugadora) -> None:
+    """Carga completa la primera vez; después solo el delta desde el watermark."""
+
+    # Se marca vigente ANTES de consultar: una escritura concurrente que
+    # llegue durante la consulta vuelve a invalidar la entrada.
+    entrada["vigente"] = True
+
+    if entrada["df"] is None or entrada["watermark"] is None:
+        filtros, params = _records_filters(start, end, plantel, id_jugadora)
+        rows = query(_SQL_RECORDS.format(filtros=filtros, limite=""), params)
+        if rows is None:
+            entrada["vigente"] = False
+            return
+        df = _process_records(rows, compacto=True) if rows else pd.DataFrame()
+        entrada["indice"] = None  # se construye al pedirlo (get_check_index_db)
+    else:
+        desde = entrada["watermark"] - _MARGEN_WATERMARK
+        filtros, params = _records_filters(start, end, plantel, id_jugadora, desde=desde)
+        rows = query(_SQL_RECORDS.format(filtros=filtros, limite=""), params)
+        if rows is None:
+            entrada["vigente"] = False
+            return
+        delta = _process_records(rows, compacto=True) if rows else pd.DataFrame()
+        df = _merge_records(entrada["df"], delta)
+
+        # El índice de check-in/check-out se amplía con el delta; si hay
+        # borrados se descarta y se reconstruye en la siguiente consulta.
+        if entrada["indice"] is not None and not delta.empty:
+            if (delta["estatus_id"] > 2).any():
+                entrada["indice"] = None
+            else:
+                entrada["indice"] = update_check_index(entrada["indice"], delta)
+
+    watermark = df["ultima_modificacion"].max() if not df.empty else None
+    entrada["df"] = df
+    entrada["watermark"] = None if pd.isna(watermark) else watermark
+
+def invalidate_records_cache(
+    ids: list[int] | None = None,
+    id_jugadora: str | None = None,
+    fecha_sesion: datetime.date | None = None,
+    developer: bool | None = None,
+) -> int:
+    """
+    Marca como no vigentes solo las entradas afectadas por una escritura.
+
+    - ids: filas concretas (borrados); afecta a las entradas que las contienen.
+    - id_jugadora / fecha_sesion / developer: fila nueva o modificada; afecta a
+      las entradas cuya jugadora, ventana de fechas y visibilidad la incluyen.
+
+    Sin argumentos invalida todo. Devuelve el número de entradas invalidadas.
+    """
+    store = _records_store()
+    with store["lock"]:
+        entradas = list(store["entradas"].items())
+
+    invalidadas = 0
+    for (es_dev, _plantel, start, end, jugadora), entrada in entradas:
+        if not entrada["vigente"]:
+            continue
+
+        if ids is not None:
+            df = entrada["df"]
+            afectada = df is not None and not df.empty and bool(df["id"].isin(ids).any())
+        else:
+            afectada = (
+                (developer is None or developer == es_dev)
+                and (id_jugadora is None or jugadora is None or str(jugadora) == str(id_jugadora))
+                and (fecha_sesion is None or start is None or fecha_sesion >= start)
+                and (fecha_sesion is None or end is None or fecha_sesion <= end)
+            )
+
+        if afectada:
+            entrada["vigente"] = False
+            invalidadas += 1
+
+    return invalidadas
+
+def clear_records_cache() -> None:
+    """Vacía por completo la caché compartida de registros."""
+    store = _records_store()
+    with store["lock"]:
+        store["entradas"].clear()
+
+def _fresh_entry(start, end, plantel, id_jugadora) -> dict:
+    """Entrada de la caché para los filtros y el rol actuales, refrescada si hace falta."""
+    rol = st.session_state["auth"]["rol"].lower()
+    clave = (rol == "developer", plantel, start, end, id_jugadora)
+    entrada = _get_entry(clave)
+
+    # Sin df aún: la primera carga está en curso en otra sesión (se marca
+    # vigente antes de consultar), así que se espera al lock en vez de
+    # devolver un resultado vacío.
+    if not entrada["vigente"] or entrada["df"] is None:
+        with entrada["lock"]:
+            # Otra sesión pudo refrescarla mientras esperábamos el lock
+            if not entrada["vigente"] or entrada["df"] is None:
+                count("registros_miss")
+                _refresh_entry(entrada, start, end, plantel, id_jugadora)
+                return entrada
+
+    count("registros_hit")
+
+    return entrada
+
+def get_records_db(
+    as_df: bool = True,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    plantel: str | None = None,
+    id_jugadora: str | None = None,
+):
+    """
+    Carga registros de wellness, con joins ya incluidos.
+
+    Los filtros (ventana de fechas, plantel, jugadora y visibilidad por rol)
+    se resuelven en el WHERE de la consulta. El resultado se guarda en una
+    caché compartida entre sesiones y se reutiliza mientras ninguna escritura
+    (upsert_record_db, delete_record) la invalide. Al invalidarse, solo se
+    piden las filas modificadas desde el último watermark
+    (fecha_hora_registro / updated_at / deleted_at) y se fusionan por id.
+
+    El DataFrame tiene los tipos compactos de la caché (category, Int8,
+    fecha_sesion datetime64); filtrar_registros y data_format devuelven las
+    filas filtradas con texto, escalas float y fechas date para los informes.
+    """
+
+    entrada = _fresh_entry(start, end, plantel, id_jugadora)
+
+    df = entrada["df"]
+    if df is None or df.empty:
+        return pd.DataFrame() if as_df else []
+
+    df = df.drop(columns=_COLS_INTERNAS, errors="ignore")
+
     return df if as_df else df.to_dict("records")
       
+def get_check_index_db(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    plantel: str | None = None,
+    id_jugadora: str | None = None,
+) -> dict[tuple, frozenset]:
+    """
+    Índice {(fecha_sesion, turno, tipo) → id_jugadora} de los mismos registros
+    que get_records_db con esos filtros. Se construye una vez por carga y
+    tras cada guardado solo se amplía con las filas nuevas (ver _refresh_entry).
+    """
+    entrada = _fresh_entry(start, end, plantel, id_jugadora)
+
+    if entrada["indice"] is None:
+        with entrada["lock"]:
+            if entrada["indice"] is None:
+                entrada["indice"] = build_check_index(entrada["df"])
+
+    return entrada["indice"]
+
+def _admin_filters(start=None, end=None, id_jugadora=None, turno=None) -> tuple[str, dict]:
+    """Filtros de la tabla del administrador: los de _records_filters más el turno."""
+    filtros, params = _records_filters(start, end, None, id_jugadora)
+    if turno and turno != "Todos":
+        filtros += "\n    AND w.turno = %(turno)s"
+        params["turno"] = turno
+    return filtros, params
+
+def records_export_query(start=None, end=None, id_jugadora=None, turno=None) -> tuple[str, dict]:
+    """
+    SQL y parámetros de la exportación con los mismos filtros que la tabla
+    del administrador. Se construye en el hilo de la página (necesita el rol
+    de la sesión); la lectura se hace después con iter_records_chunks.
+    """
+    filtros, params = _admin_filters(start, end, id_jugadora, turno)
+    return _SQL_RECORDS.format(filtros=filtros, limite=""), params
+
+def get_records_page_db(
+    start=None,
+    end=None,
+    id_jugadora=None,
+    turno=None,
+    after: tuple | None = None,
+    page_size: int = 50,
+) -> tuple[pd.DataFrame | None, tuple | None]:
+    """
+    Una página de registros ordenada por (fecha_hora_registro, id) descendente,
+    con paginación por clave (keyset): en lugar de OFFSET se continúa después
+    de la última fila de la página anterior, así el coste no crece con el
+    histórico.
+
+    - after: (fecha_hora_registro, id) de la última fila ya mostrada.
+
+    Retorna (df, siguiente) donde 'siguiente' es el 'after' de la página
+    siguiente o None si no hay más filas. df es None si la consulta falla.
+    """
+    filtros, params = _admin_filters(start, end, id_jugadora, turno)
+    if after is not None:
+        filtros += """
+    AND (w.fecha_hora_registro < %(k_fecha)s
+         OR (w.fecha_hora_registro = %(k_fecha)s AND w.id < %(k_id)s))"""
+        params["k_fecha"], params["k_id"] = after
+    params["limite"] = page_size + 1
+
+    rows = query(_SQL_RECORDS.format(filtros=filtros, limite="LIMIT %(limite)s"), params)
+    if rows is None:
+        return None, None
+
+    siguiente = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        siguiente = (rows[-1]["fecha_hora_registro"], rows[-1]["id"])
+
+    if not rows:
+        return pd.DataFrame(), None
+
+    df = _process_records(rows).drop(columns=_COLS_INTERNAS, errors="ignore")
+    return df, siguiente
+
+def iter_records_chunks(sql: str, params: dict, chunksize: int = 5000):
+    """Genera DataFrames procesados de `chunksize` registros leídos del cursor."""
+    for rows in query_chunks(sql, params, chunksize):
+        yield _process_records(rows).drop(columns=_COLS_INTERNAS, errors="ignore")
+
+_SQL_INSERT = """
+    INSERT INTO wellness (
+        id_jugadora, fecha_sesion, tipo, turno, periodizacion_tactica,
+        id_tipo_carga, id_tipo_readaptacion, recuperacion, fatiga, sueno,
+        stress, dolor, id_zona_segmento_dolor, zonas_anatomicas_dolor, lateralidad_dolor,
+        minutos_sesion, rpe, ua, en_periodo, observacion, usuario
+    ) VALUES (
+        %(id_jugadora)s, %(fecha_sesion)s, %(tipo)s, %(turno)s, %(periodizacion_tactica)s,
+        %(id_tipo_carga)s, %(id_tipo_readaptacion)s, %(recuperacion)s, %(fatiga)s, %(sueno)s,
+        %(stress)s, %(dolor)s, %(id_zona_segmento_dolor)s, CAST(%(zonas_anatomicas_dolor)s AS JSON),
+        %(lateralidad)s, %(minutos_sesion)s, %(rpe)s, %(ua)s,
+        %(en_periodo)s, %(observacion)s, %(usuario)s
+    );
+"""
+
+# Parámetros de _SQL_INSERT (los que falten en el registro se envían como NULL)
+_INSERT_FIELDS = [
+    "id_jugadora", "fecha_sesion", "tipo", "turno", "periodizacion_tactica",
+    "id_tipo_carga", "id_tipo_readaptacion", "recuperacion", "fatiga", "sueno",
+    "stress", "dolor", "id_zona_segmento_dolor", "zonas_anatomicas_dolor", "lateralidad",
+    "minutos_sesion", "rpe", "ua", "en_periodo", "observacion", "usuario",
+]
+
+_SQL_CHECKOUT = """
+    UPDATE wellness
+    SET 
+        tipo = 'checkOut',
+        minutos_sesion = %(minutos_sesion)s,
+        rpe = %(rpe)s,
+        ua = %(ua)s,
+        modified_by = %(modified_by)s,
+        estatus_id = 2,
+        updated_at = NOW()
+    WHERE id = %(id)s;
+"""
+
+# Check-out de un check-in insertado en la misma transacción (sin id todavía)
+_SQL_CHECKOUT_NUEVO = _SQL_CHECKOUT.replace(
+    "WHERE id = %(id)s;",
+    """WHERE id_jugadora = %(id_jugadora)s
+      AND fecha_sesion = %(fecha_sesion)s
+      AND turno = %(turno)s
+      AND usuario = %(usuario)s
+      AND estatus_id <= 2;""",
+)
+
+def _as_date(value) -> datetime.date | None:
+    """Normaliza fecha_sesion (str ISO, date, datetime o Timestamp) a date."""
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10])
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+def _insert_params(record: dict) -> dict:
+    params = {campo: record.get(campo) for campo in _INSERT_FIELDS}
+    params["fecha_sesion"] = _as_date(params["fecha_sesion"])
+    return params
+
+def _checkout_params(record: dict, id_registro: int, usuario_actual: str) -> dict:
+    return {
+        "minutos_sesion": record.get("minutos_sesion"),
+        "rpe": record.get("rpe"),
+        "ua": record.get("ua"),
+        "modified_by": usuario_actual,
+        "id": id_registro,
+    }
+
+def _write_with_daily_loads(statements: list[tuple[str, object]], pares) -> bool:
+    """
+    Ejecuta la escritura de wellness y el recálculo de wellness_diario de los
+    días afectados en UNA transacción: o se guardan los dos o ninguno.
+
+    Si la tabla de resumen no está disponible se guarda solo el registro y
+    se avisa de que el resumen queda pendiente de reconstruir (mientras
+    tanto los reportes lo calculan en memoria).
+    """
+    resumen = daily_loads_statements(pares)
+    ok = execute_transaction(statements + (resumen or []))
+    if not ok:
+        return False
+
+    if resumen:
+        clear_daily_loads_cache()
+    elif resumen is None:
+        st.warning(
+            "Registro guardado. No se pudo actualizar el resumen diario (wellness_diario); "
+            "reconstrúyelo desde la página developer."
+        )
+    return True
+
 def upsert_record_db(record: dict, modo: str = "checkin") -> bool:
 
     usuario_actual = st.session_state["auth"]["name"].lower()
@@ -104,25 +565,9 @@ def upsert_record_db(record: dict, modo: str = "checkin") -> bool:
     # ============================
     if existing:
         if modo.lower() == "checkout":
-            sql = """
-                UPDATE wellness
-                SET 
-                    tipo = 'checkOut',
-                    minutos_sesion = %(minutos_sesion)s,
-                    rpe = %(rpe)s,
-                    ua = %(ua)s,
-                    modified_by = %(modified_by)s,
-                    estatus_id = 2,
-                    updated_at = NOW()
-                WHERE id = %(id)s;
-            """
-            params = {
-                "minutos_sesion": record.get("minutos_sesion"),
-                "rpe": record.get("rpe"),
-                "ua": record.get("ua"),
-                "modified_by": usuario_actual,
-                "id": existing["id"],
-            }
+            sql = _SQL_CHECKOUT
+            params = _checkout_params(record, existing["id"], usuario_actual)
+            developer = st.session_state["auth"]["rol"].lower() == "developer"
 
         else:
             st.rerun()
@@ -154,7 +599,12 @@ def upsert_record_db(record: dict, modo: str = "checkin") -> bool:
         #     params = dict(record)
         #     params["id"] = existing["id"]
 
-        return execute(sql, params)
+        ok = _write_with_daily_loads([(sql, params)], [(record["id_jugadora"], fecha_sesion)])
+        if ok:
+            invalidate_records_cache(
+                id_jugadora=record["id_jugadora"], fecha_sesion=fecha_sesion, developer=developer
+            )
+        return ok
 
     # ============================
     # INSERT (solo checkin)
@@ -163,25 +613,17 @@ def upsert_record_db(record: dict, modo: str = "checkin") -> bool:
         st.warning("No existe un check-in previo.")
         return False
 
-    sql = """
-        INSERT INTO wellness (
-            id_jugadora, fecha_sesion, tipo, turno, periodizacion_tactica,
-            id_tipo_carga, id_tipo_readaptacion, recuperacion, fatiga, sueno,
-            stress, dolor, id_zona_segmento_dolor, zonas_anatomicas_dolor, lateralidad_dolor,
-            minutos_sesion, rpe, ua, en_periodo, observacion, usuario
-        ) VALUES (
-            %(id_jugadora)s, %(fecha_sesion)s, %(tipo)s, %(turno)s, %(periodizacion_tactica)s,
-            %(id_tipo_carga)s, %(id_tipo_readaptacion)s, %(recuperacion)s, %(fatiga)s, %(sueno)s,
-            %(stress)s, %(dolor)s, %(id_zona_segmento_dolor)s, CAST(%(zonas_anatomicas_dolor)s AS JSON),
-            %(lateralidad)s, %(minutos_sesion)s, %(rpe)s, %(ua)s,
-            %(en_periodo)s, %(observacion)s, %(usuario)s
-        );
-    """
+    sql = _SQL_INSERT
+    params = _insert_params(record)
 
-    params = dict(record)
-    params["fecha_sesion"] = fecha_sesion
-
-    return execute(sql, params)
+    ok = _write_with_daily_loads([(sql, params)], [(record["id_jugadora"], fecha_sesion)])
+    if ok:
+        invalidate_records_cache(
+            id_jugadora=record["id_jugadora"],
+            fecha_sesion=fecha_sesion,
+            developer=str(record.get("usuario", "")).lower() == "developer",
+        )
+    return ok
 
 def search_existing_record(record):
 
@@ -215,6 +657,155 @@ def search_existing_record(record):
     rows = query(sql, params)
     return rows[0] if rows else None
 
+def search_existing_records(records: list[dict]) -> dict[tuple, int] | None:
+    """
+    Versión por lotes de search_existing_record: resuelve con UNA consulta
+    los registros activos de varias (id_jugadora, fecha_sesion, turno).
+
+    Devuelve {(id_jugadora, fecha_sesion, turno): id}, o None si la consulta
+    falla (el error ya se ha mostrado).
+    """
+    claves = {(str(r["id_jugadora"]), _as_date(r["fecha_sesion"]), r["turno"]) for r in records}
+    if not claves:
+        return {}
+
+    rol = st.session_state["auth"]["rol"].lower()
+    usuario_condition = (
+        "usuario = 'developer'"
+        if rol == "developer"
+        else "usuario != 'developer'"
+    )
+
+    jugadoras = sorted({c[0] for c in claves})
+    fechas = sorted({c[1] for c in claves})
+    turnos = sorted({c[2] for c in claves})
+
+    # Filtro por columnas (aprovecha los índices); la combinación exacta se comprueba aquí
+    sql = f"""
+        SELECT id, id_jugadora, fecha_sesion, turno FROM wellness
+        WHERE id_jugadora IN ({",".join(["%s"] * len(jugadoras))})
+          AND fecha_sesion IN ({",".join(["%s"] * len(fechas))})
+          AND turno IN ({",".join(["%s"] * len(turnos))})
+          AND estatus_id <= 2
+          AND {usuario_condition};
+    """
+
+    rows = query(sql, tuple(jugadoras + fechas + turnos))
+    if rows is None:
+        return None
+
+    existentes = {}
+    for row in rows:
+        clave = (str(row["id_jugadora"]), _as_date(row["fecha_sesion"]), row["turno"])
+        if clave in claves:
+            existentes.setdefault(clave, row["id"])
+    return existentes
+
+def upsert_records_db(records, modo: str = "checkin") -> tuple[bool, dict]:
+    """
+    Alta/actualización por lotes de registros de wellness (una sesión de
+    todo el plantel, una importación...).
+
+    - records: lista de dicts o DataFrame con las mismas claves que
+      upsert_record_db.
+    - modo "checkin": inserta los que no existen; los ya registrados se omiten.
+    - modo "checkout": actualiza los check-in existentes; los que no tienen
+      check-in previo se omiten.
+
+    Resuelve los existentes con una sola consulta y escribe todo con
+    executemany en una única transacción, junto con el recálculo de
+    wellness_diario de todos los días afectados del lote (dos sentencias,
+    sea cual sea su tamaño).
+
+    Retorna:
+        (ok, resumen) con resumen = {"insertados", "actualizados", "omitidos"}.
+    """
+    if isinstance(records, pd.DataFrame):
+        records = records.astype(object).where(records.notna(), None).to_dict("records")
+
+    if modo.lower() == "checkout":
+        return import_records_db([], records or [])
+    return import_records_db(records or [], [])
+
+def _dedup_batch(records: list[dict]) -> dict[tuple, dict]:
+    """Una sola fila por (jugadora, fecha, turno): gana la última del lote."""
+    lote = {}
+    for record in records:
+        clave = (str(record["id_jugadora"]), _as_date(record["fecha_sesion"]), record["turno"])
+        lote[clave] = record
+    return lote
+
+def import_records_db(checkins: list[dict], checkouts: list[dict]) -> tuple[bool, dict]:
+    """
+    Check-in y check-out de un mismo lote en UNA transacción (importación
+    masiva): una fila del fichero con las dos partes no puede quedar a medias.
+
+    - checkins: se insertan los que no existen; los ya registrados se omiten.
+    - checkouts: actualizan el check-in existente o el que se inserta en este
+      mismo lote; los que no tienen check-in se omiten.
+
+    Retorna (ok, resumen) como upsert_records_db.
+    """
+    lote_in, lote_out = _dedup_batch(checkins), _dedup_batch(checkouts)
+    resumen = {
+        "insertados": 0, "actualizados": 0,
+        "omitidos": len(checkins) - len(lote_in) + len(checkouts) - len(lote_out),
+    }
+    if not lote_in and not lote_out:
+        return True, resumen
+
+    usuario_actual = st.session_state["auth"]["name"].lower()
+
+    existentes = search_existing_records(list({**lote_in, **lote_out}.values()))
+    if existentes is None:
+        return False, resumen
+
+    inserts, updates, updates_nuevos, pares_dev, pares = [], [], [], set(), set()
+    developer = st.session_state["auth"]["rol"].lower() == "developer"
+
+    for clave, record in lote_in.items():
+        if existentes.get(clave):
+            resumen["omitidos"] += 1
+            continue
+        inserts.append(_insert_params(record))
+        es_dev = str(record.get("usuario", "")).lower() == "developer"
+        (pares_dev if es_dev else pares).add(clave[:2])
+
+    for clave, record in lote_out.items():
+        id_existente = existentes.get(clave)
+        if id_existente:
+            updates.append(_checkout_params(record, id_existente, usuario_actual))
+        elif clave in lote_in:
+            # Check-in insertado en esta transacción: aún no tiene id
+            updates_nuevos.append({
+                **_checkout_params(record, None, usuario_actual),
+                "id_jugadora": clave[0], "fecha_sesion": clave[1], "turno": clave[2],
+                "usuario": lote_in[clave].get("usuario"),
+            })
+        else:
+            resumen["omitidos"] += 1
+            continue
+        (pares_dev if developer else pares).add(clave[:2])
+
+    if not inserts and not updates and not updates_nuevos:
+        return True, resumen
+
+    statements = [(_SQL_INSERT, inserts), (_SQL_CHECKOUT, updates)]
+    if updates_nuevos:
+        statements.append((_SQL_CHECKOUT_NUEVO, updates_nuevos))
+    ok = _write_with_daily_loads(statements, sorted(pares_dev | pares))
+    if not ok:
+        return False, resumen
+
+    resumen["insertados"] = len(inserts)
+    resumen["actualizados"] = len(updates) + len(updates_nuevos)
+
+    for es_dev, conjunto in ((True, pares_dev), (False, pares)):
+        for id_jugadora, fecha_sesion in conjunto:
+            invalidate_records_cache(id_jugadora=id_jugadora, fecha_sesion=fecha_sesion, developer=es_dev)
+
+    return True, resumen
+
 def delete_record(ids: list[int], deleted_by: str) -> tuple[bool, str]:
     """
     Soft-delete: marca registros de wellness como eliminados (estatus_id = 3).
@@ -235,9 +826,21 @@ def delete_record(ids: list[int], deleted_by: str) -> tuple[bool, str]:
 
     params = tuple([deleted_by] + ids)
 
-    ok = execute(sql, params)
+    # Días afectados por el borrado → su resumen diario se recalcula en la
+    # misma transacción
+    pares = query(
+        f"SELECT DISTINCT id_jugadora, fecha_sesion FROM wellness WHERE id IN ({placeholders})",
+        tuple(ids),
+    )
+    if pares is None:
+        return False, "Error al eliminar los registros."
+
+    ok = _write_with_daily_loads(
+        [(sql, params)], [(p["id_jugadora"], p["fecha_sesion"]) for p in pares]
+    )
 
     if ok:
+        invalidate_records_cache(ids=ids)
         return True, f"Se eliminaron {len(ids)} registro(s) correctamente."
     else:
         return False, "Error al eliminar los registros."
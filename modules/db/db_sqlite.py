@@ -0,0 +1,356 @@
+import datetime
+import functools
+import json
+import random
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import mysql.connector
+import numpy as np
+import pandas as pd
+
+# ============================================================
+#  🔹 BACKEND SQLITE (pruebas de carga y latencia sin MySQL)
+# ============================================================
+# Sustituto en proceso del pool de mysql-connector: mismo esquema que usan
+# los módulos de modules/db y la misma interfaz que consumen db_connection
+# y db_client (get_connection, cursor(dictionary=True), executemany,
+# fetchmany, start_transaction...). Las sentencias MySQL se traducen al
+# vuelo y cada una puede llevar una latencia fija para simular la red.
+#
+# Se activa desde secrets.toml:
+#
+#   [connections.mysql]
+#   backend = "sqlite"
+#   sqlite_path = "tmp/wellness.db"   # fichero; se crea con el esquema
+#   latency_ms = 5                    # latencia añadida por sentencia
+#   seed = true                       # datos de ejemplo si está vacía
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS plantel (
+        id INTEGER PRIMARY KEY,
+        nombre TEXT,
+        codigo TEXT
+    );
+    CREATE TABLE IF NOT EXISTS futbolistas (
+        id INTEGER PRIMARY KEY,
+        identificacion TEXT UNIQUE,
+        nombre TEXT,
+        apellido TEXT,
+        competicion TEXT,
+        fecha_nacimiento DATE,
+        genero TEXT DEFAULT 'F',
+        id_estado INTEGER DEFAULT 1
+    );
+    CREATE TABLE IF NOT EXISTS informacion_futbolistas (
+        identificacion TEXT PRIMARY KEY,
+        posicion TEXT,
+        dorsal INTEGER,
+        nacionalidad TEXT,
+        altura REAL,
+        peso REAL,
+        foto_url TEXT,
+        foto_url_drive TEXT
+    );
+    CREATE TABLE IF NOT EXISTS wellness (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_jugadora TEXT NOT NULL,
+        fecha_sesion DATE NOT NULL,
+        tipo TEXT,
+        turno TEXT,
+        periodizacion_tactica TEXT,
+        id_tipo_carga INTEGER,
+        id_tipo_readaptacion INTEGER,
+        id_condicion INTEGER,
+        recuperacion INTEGER,
+        fatiga INTEGER,
+        sueno INTEGER,
+        stress INTEGER,
+        dolor INTEGER,
+        id_zona_segmento_dolor INTEGER,
+        zonas_anatomicas_dolor TEXT,
+        lateralidad_dolor TEXT,
+        minutos_sesion INTEGER,
+        rpe INTEGER,
+        ua REAL,
+        en_periodo INTEGER,
+        observacion TEXT,
+        usuario TEXT,
+        fecha_hora_registro TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+        estatus_id INTEGER DEFAULT 1,
+        modified_by TEXT,
+        updated_at TIMESTAMP,
+        deleted_at TIMESTAMP,
+        deleted_by TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_wellness_jugadora_fecha ON wellness (id_jugadora, fecha_sesion, turno);
+    CREATE TABLE IF NOT EXISTS ausencias (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_jugadora TEXT NOT NULL,
+        fecha_inicio DATE,
+        fecha_fin DATE,
+        motivo_id INTEGER,
+        turno TEXT,
+        observacion TEXT,
+        usuario TEXT
+    );
+    CREATE TABLE IF NOT EXISTS lesiones (
+        id_lesion INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_jugadora TEXT NOT NULL,
+        fecha_lesion DATE,
+        estado_lesion TEXT,
+        tipo_lesion_id INTEGER,
+        segmento_id INTEGER,
+        zona_cuerpo_id INTEGER,
+        zona_especifica_id INTEGER,
+        lateralidad TEXT,
+        es_recidiva INTEGER DEFAULT 0,
+        usuario TEXT,
+        deleted_at TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY,
+        email TEXT UNIQUE,
+        password_hash TEXT,
+        name TEXT,
+        lastname TEXT,
+        role_id INTEGER,
+        state_id INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS roles (id INTEGER PRIMARY KEY, name TEXT);
+    CREATE TABLE IF NOT EXISTS permissions (id INTEGER PRIMARY KEY, name TEXT);
+    CREATE TABLE IF NOT EXISTS role_permissions (role_id INTEGER, permission_id INTEGER);
+    CREATE TABLE IF NOT EXISTS state_user (id INTEGER PRIMARY KEY, name TEXT);
+"""
+
+# Catálogos {tabla → nombres}; todos con columnas (id, nombre)
+_CATALOGOS = {
+    "tipo_carga": ["Fuerza", "Resistencia", "Velocidad", "Táctico", "Partido"],
+    "estimulos_readaptacion": ["Movilidad", "Fuerza", "Campo"],
+    "tipo_condicion": ["Disponible", "Limitada", "Readaptación"],
+    "zonas_segmento": ["Tren superior", "Tronco", "Tren inferior"],
+    "zonas_anatomicas": ["Cuello", "Hombro", "Lumbar", "Cadera", "Isquiotibial", "Rodilla", "Tobillo"],
+    "segmentos_corporales": ["Cabeza", "Tronco", "Miembro superior", "Miembro inferior"],
+    "tipo_ausencia": ["Lesión", "Enfermedad", "Selección", "Permiso"],
+}
+
+# ============================================================
+#  🔹 TRADUCCIÓN MySQL → SQLite
+# ============================================================
+
+_TRADUCCIONES = [
+    (re.compile(r"%\((\w+)\)s"), r":\1"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bNOW\(\)|\bCURRENT_TIMESTAMP\b", re.I), "datetime('now', 'localtime')"),
+    (re.compile(r"\bCURDATE\(\)", re.I), "date('now', 'localtime')"),
+    (re.compile(r"\bGREATEST\(", re.I), "MAX("),
+    (re.compile(r"\bLEAST\(", re.I), "MIN("),
+    (re.compile(r"\bCAST\((.+?) AS JSON\)", re.I | re.S), r"\1"),
+    (re.compile(r"\bCONCAT\(([^()]*)\)", re.I), lambda m: "(" + " || ".join(a.strip() for a in m.group(1).split(",")) + ")"),
+    (re.compile(r"\bGROUP_CONCAT\((.+?) ORDER BY .+? SEPARATOR ('[^']*')\)", re.I | re.S), r"GROUP_CONCAT(\1, \2)"),
+    (re.compile(r"\bDATE_SUB\(([^,]+),\s*INTERVAL\s+(\S+)\s+DAY\)", re.I), r"date(\1, '-' || \2 || ' days')"),
+    (re.compile(r"\bON DUPLICATE KEY UPDATE\b", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.I), r"excluded.\1"),
+    (re.compile(r"%%"), "%"),
+]
+
+@functools.lru_cache(maxsize=256)
+def translate_sql(sql: str) -> str:
+    """Traduce los placeholders y funciones MySQL que usa la app a SQLite."""
+    for patron, reemplazo in _TRADUCCIONES:
+        sql = patron.sub(reemplazo, sql)
+    return sql
+
+# Fechas y tipos numpy/pandas como los acepta mysql-connector
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(pd.Timestamp, lambda d: d.isoformat(" "))
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.float64, float)
+sqlite3.register_adapter(np.bool_, bool)
+sqlite3.register_converter("DATE", lambda b: datetime.date.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.datetime.fromisoformat(b.decode()))
+
+# ============================================================
+#  🔹 CURSOR, CONEXIÓN Y POOL
+# ============================================================
+
+class _Cursor:
+    """Cursor con la interfaz de mysql-connector (dictionary=True → filas dict)."""
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool, latencia_s: float):
+        self._cursor = cursor
+        self._dictionary = dictionary
+        self._latencia_s = latencia_s
+
+    def _fila(self, fila):
+        if fila is None or not self._dictionary:
+            return fila
+        return {col[0]: valor for col, valor in zip(self._cursor.description, fila)}
+
+    def execute(self, sql: str, params=None):
+        if self._latencia_s:
+            time.sleep(self._latencia_s)
+        self._cursor.execute(translate_sql(sql), params if params is not None else ())
+
+    def executemany(self, sql: str, params):
+        if self._latencia_s:
+            time.sleep(self._latencia_s)
+        self._cursor.executemany(translate_sql(sql), params)
+
+    def fetchone(self):
+        return self._fila(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._fila(f) for f in self._cursor.fetchall()]
+
+    def fetchmany(self, size: int):
+        return [self._fila(f) for f in self._cursor.fetchmany(size)]
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+class _Connection:
+    """Conexión SQLite con los métodos de MySQLConnection que usa db_client."""
+
+    unread_result = False
+
+    def __init__(self, conn: sqlite3.Connection, latencia_s: float):
+        self._conn = conn
+        self._latencia_s = latencia_s
+
+    def cursor(self, dictionary: bool = False) -> _Cursor:
+        return _Cursor(self._conn.cursor(), dictionary, self._latencia_s)
+
+    def start_transaction(self):
+        # sqlite3 abre la transacción con la primera escritura
+        pass
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+class SQLitePool:
+    """
+    Pool compatible con MySQLConnectionPool sobre un fichero SQLite.
+    Cada checkout abre una conexión (barato en SQLite); la concurrencia real
+    la limita el semáforo de db_connection, igual que con MySQL.
+    """
+
+    def __init__(self, path, latencia_ms: float = 0, seed: bool = False):
+        self.path = str(path)
+        self.latencia_s = max(0.0, float(latencia_ms)) / 1000
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._conectar()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            for tabla in _CATALOGOS:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {tabla} (id INTEGER PRIMARY KEY, nombre TEXT)")
+            conn.commit()
+            if seed and conn.execute("SELECT COUNT(*) FROM futbolistas").fetchone()[0] == 0:
+                seed_demo_data(conn)
+        finally:
+            conn.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        # Los generadores de query_chunks pueden cerrarse desde otro hilo
+        return sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+
+    def get_connection(self) -> _Connection:
+        try:
+            return _Connection(self._conectar(), self.latencia_s)
+        except sqlite3.Error as e:
+            # Mismo tipo de error que el pool real (db_connection reintenta)
+            raise mysql.connector.errors.InterfaceError(str(e)) from e
+
+# ============================================================
+#  🔹 DATOS DE EJEMPLO
+# ============================================================
+
+def seed_demo_data(conn: sqlite3.Connection, jugadoras: int = 30, dias: int = 60, semilla: int = 0) -> None:
+    """
+    Rellena la BD con un plantel, catálogos, jugadoras y `dias` días de
+    check-in/check-out hasta hoy (más alguna ausencia), para que las páginas
+    tengan datos realistas sobre los que medir.
+    """
+    rng = random.Random(semilla)
+    hoy = datetime.date.today()
+
+    for tabla, nombres in _CATALOGOS.items():
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {tabla} (id, nombre) VALUES (?, ?)",
+            list(enumerate(nombres, start=1)),
+        )
+    conn.executemany(
+        "INSERT OR IGNORE INTO plantel (id, nombre, codigo) VALUES (?, ?, ?)",
+        [(1, "Primer Equipo", "1FF"), (2, "Filial", "2FF"), (3, "Juvenil", "JUV"), (4, "Cadete", "CAD")],
+    )
+
+    ids = [f"J{i:03d}" for i in range(1, jugadoras + 1)]
+    conn.executemany(
+        "INSERT OR IGNORE INTO futbolistas (identificacion, nombre, apellido, competicion, fecha_nacimiento) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (j, f"Jugadora{i}", f"Apellido{i}", "1FF" if i % 3 else "2FF", datetime.date(1995 + i % 10, 1 + i % 12, 1))
+            for i, j in enumerate(ids, start=1)
+        ],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO informacion_futbolistas (identificacion, posicion, dorsal) VALUES (?, ?, ?)",
+        [(j, rng.choice(["POR", "DEF", "MED", "DEL"]), i) for i, j in enumerate(ids, start=1)],
+    )
+
+    filas = []
+    for d in range(dias, 0, -1):
+        fecha = hoy - datetime.timedelta(days=d)
+        if fecha.weekday() == 6:
+            continue
+        registro = datetime.datetime.combine(fecha, datetime.time(9))
+        for j in ids:
+            minutos, rpe = rng.choice([60, 75, 90]), rng.randint(2, 9)
+            filas.append((
+                j, fecha, "checkOut", "Turno 1", rng.randint(1, 5), rng.randint(1, 5), rng.randint(1, 5),
+                rng.randint(1, 5), rng.randint(1, 5), json.dumps([]), minutos, rpe, minutos * rpe,
+                "staff", registro, 2,
+            ))
+    conn.executemany(
+        """INSERT INTO wellness (
+            id_jugadora, fecha_sesion, tipo, turno, recuperacion, fatiga, sueno, stress, dolor,
+            zonas_anatomicas_dolor, minutos_sesion, rpe, ua, usuario, fecha_hora_registro, estatus_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        filas,
+    )
+
+    conn.executemany(
+        "INSERT INTO ausencias (id_jugadora, fecha_inicio, fecha_fin, motivo_id, turno, usuario) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (j, hoy - datetime.timedelta(days=rng.randint(0, 10)), hoy + datetime.timedelta(days=rng.randint(0, 10)),
+             rng.randint(1, len(_CATALOGOS["tipo_ausencia"])), "Turno 1", "staff")
+            for j in rng.sample(ids, k=max(1, jugadoras // 10))
+        ],
+    )
+    conn.commit()
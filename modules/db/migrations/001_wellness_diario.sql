@@ -0,0 +1,48 @@
+-- ============================================================
+--  wellness_diario: resumen diario por jugadora (ver db_daily_loads.py)
+-- ============================================================
+-- Crea la tabla y la rellena con todo el histórico de wellness. Aplicar
+-- una vez al desplegar, antes de arrancar la app. Si no se aplica, la app
+-- crea la tabla y hace el relleno en la primera petición del proceso.
+
+CREATE TABLE IF NOT EXISTS wellness_diario (
+    id_jugadora VARCHAR(50) NOT NULL,
+    fecha_sesion DATE NOT NULL,
+    developer TINYINT NOT NULL DEFAULT 0,
+    registros INT NOT NULL DEFAULT 0,
+    sesiones INT NOT NULL DEFAULT 0,
+    ua_total DOUBLE NULL,
+    ua_cuadrados DOUBLE NULL,
+    minutos_total DOUBLE NULL,
+    rpe_medio DOUBLE NULL,
+    recuperacion DOUBLE NULL,
+    energia DOUBLE NULL,
+    sueno DOUBLE NULL,
+    stress DOUBLE NULL,
+    dolor DOUBLE NULL,
+    PRIMARY KEY (id_jugadora, fecha_sesion, developer)
+);
+
+INSERT INTO wellness_diario (
+    id_jugadora, fecha_sesion, developer, registros, sesiones,
+    ua_total, ua_cuadrados, minutos_total, rpe_medio,
+    recuperacion, energia, sueno, stress, dolor
+)
+SELECT
+    w.id_jugadora,
+    w.fecha_sesion,
+    CASE WHEN w.usuario = 'developer' THEN 1 ELSE 0 END AS developer,
+    COUNT(*),
+    COUNT(w.ua),
+    SUM(w.ua),
+    SUM(w.ua * w.ua),
+    SUM(w.minutos_sesion),
+    AVG(w.rpe),
+    AVG(w.recuperacion),
+    AVG(w.fatiga),
+    AVG(w.sueno),
+    AVG(w.stress),
+    AVG(w.dolor)
+FROM wellness w
+WHERE w.estatus_id <= 2
+GROUP BY w.id_jugadora, w.fecha_sesion, CASE WHEN w.usuario = 'developer' THEN 1 ELSE 0 END;
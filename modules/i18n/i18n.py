@@ -1,17 +1,57 @@
 import json
+import threading
+import time
 import streamlit as st
 from pathlib import Path
+from types import MappingProxyType
 
 _LANG_DIR = Path(__file__).parent / "lang"
 
-#@st.cache_resource
-def _load_lang(lang: str) -> dict:
-    """Carga el archivo de idioma (lang/en.json, lang/pt.json, etc.)."""
+# ============================================================
+#  🔹 CATÁLOGOS DE TRADUCCIÓN (una carga por proceso)
+# ============================================================
+# t() se llama cientos de veces por render: cada catálogo se lee una vez y
+# se guarda como dict inmutable. Solo se vuelve a mirar el mtime del
+# fichero cada _RECHEQUEO_S segundos; si cambió (edición en desarrollo),
+# se recarga.
+
+_RECHEQUEO_S = 5.0
+_VACIO = MappingProxyType({})
+
+_catalogos: dict[str, tuple] = {}   # lang → (mtime, revisado_en, catálogo)
+_lock = threading.Lock()
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+def load_lang(lang: str) -> MappingProxyType:
+    """
+    Catálogo del idioma (lang/en.json, lang/pt.json, etc.), cacheado por
+    proceso. Es el mismo objeto mientras no cambie el fichero, así que sirve
+    para invalidar lo que se derive de él (ver narratives).
+    """
+    ahora = time.monotonic()
+    entrada = _catalogos.get(lang)
+    if entrada is not None and ahora - entrada[1] < _RECHEQUEO_S:
+        return entrada[2]
+
     path = _LANG_DIR / f"{lang}.json"
-    if not path.exists():
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    mtime = _mtime(path)
+    with _lock:
+        entrada = _catalogos.get(lang)
+        if entrada is not None and entrada[0] == mtime:
+            _catalogos[lang] = (mtime, ahora, entrada[2])
+            return entrada[2]
+
+        catalogo = _VACIO
+        if mtime is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                catalogo = MappingProxyType(json.load(f))
+        _catalogos[lang] = (mtime, ahora, catalogo)
+        return catalogo
 
 def t(text: str) -> str:
     """
@@ -24,9 +64,8 @@ def t(text: str) -> str:
     if lang == "es":
         return text
 
-    data = _load_lang(lang)
     #st.text(f"Idioma seleccionado: {lang}")
-    return data.get(text, text)
+    return load_lang(lang).get(text, text)
 
 def language_selector(label: str = ":material/language: Idioma / Language", default: str = "es"):
     """Selector de idioma persistente en la barra lateral."""
@@ -0,0 +1,72 @@
+from typing import Callable
+
+import streamlit as st
+
+from modules.i18n.i18n import load_lang
+
+# ============================================================
+#  🔹 NARRATIVAS PRECOMPILADAS POR IDIOMA
+# ============================================================
+# Los resúmenes de texto (resumen técnico, interpretación, etc.) tienen
+# mucho texto fijo y pocos valores. Cada narrativa se registra con una
+# función de compilación que recibe el traductor del idioma y devuelve:
+#
+#   - plantilla: str con los textos ya traducidos y campos {valor}
+#   - etiquetas: {texto original → texto traducido (puede llevar {valor})}
+#   - textos: opcional, {texto original → traducción literal} (tablas, títulos)
+#
+# La compilación se hace una vez por idioma (y por versión del catálogo);
+# en cada render solo se formatean los valores. Como el idioma es un
+# parámetro, la misma narrativa sirve para exportaciones en otro idioma.
+
+_COMPILADORES: dict[str, Callable] = {}
+_compiladas: dict[tuple, tuple] = {}   # (nombre, lang) → (catálogo, compilada)
+
+def _escape(texto: str) -> str:
+    """Las traducciones no deben introducir campos de formato."""
+    return texto.replace("{", "{{").replace("}", "}}")
+
+def narrative(nombre: str):
+    """
+    Decorador que registra la función de compilación de una narrativa.
+    La función recibe tr(texto) → traducción ya escapada para str.format
+    (tr(texto, escape=False) para textos que no pasan por format).
+    """
+    def registrar(compilar: Callable) -> Callable:
+        _COMPILADORES[nombre] = compilar
+        return compilar
+    return registrar
+
+def compiled_narrative(nombre: str, lang: str | None = None) -> dict:
+    """Narrativa compilada {"plantilla", "etiquetas"} para el idioma (por defecto, el de la sesión)."""
+    lang = lang or st.session_state.get("lang", "es")
+    catalogo = load_lang(lang) if lang != "es" else None
+
+    clave = (nombre, lang)
+    entrada = _compiladas.get(clave)
+    if entrada is not None and entrada[0] is catalogo:
+        return entrada[1]
+
+    def tr(texto: str, escape: bool = True) -> str:
+        traducido = catalogo.get(texto, texto) if catalogo is not None else texto
+        return _escape(traducido) if escape else traducido
+
+    compilada = _COMPILADORES[nombre](tr)
+    compilada.setdefault("plantilla", "")
+    compilada.setdefault("etiquetas", {})
+    _compiladas[clave] = (catalogo, compilada)
+    return compilada
+
+def render_narrative(nombre: str, valores: dict | None = None, etiquetas: dict | None = None,
+                     lang: str | None = None) -> str:
+    """
+    Formatea la narrativa con los valores.
+
+    etiquetas: {campo → texto original de la etiqueta elegida}; se sustituye
+    por su traducción compilada (formateada también con los valores).
+    """
+    compilada = compiled_narrative(nombre, lang)
+    valores = dict(valores or {})
+    for campo, original in (etiquetas or {}).items():
+        valores[campo] = compilada["etiquetas"][original].format(**valores)
+    return compilada["plantilla"].format(**valores)
@@ -17,6 +17,11 @@ class RPEFilters:
 def _prepare_checkout_df(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame()
+    # Resumen diario (wellness_diario / build_daily_loads): una fila por día
+    if "ua_total" in df.columns and "sesiones" in df.columns:
+        out = df[df["sesiones"] > 0].rename(columns={"ua_total": "ua", "minutos_total": "minutos_sesion"})
+        out["ua"] = pd.to_numeric(out["ua"], errors="coerce")
+        return out.dropna(subset=["fecha_sesion", "ua"])
     out = df.copy()
     # Keep only checkOut with UA available
     if "tipo" in out.columns:
@@ -31,6 +36,57 @@ def _prepare_checkout_df(df: pd.DataFrame) -> pd.DataFrame:
         out["fecha_sesion"] = pd.to_datetime(out["fecha_sesion"], errors="coerce").dt.date
     return out.dropna(subset=["fecha_sesion", "ua"])
 
+# Columnas del resumen diario por jugadora (ver db_daily_loads)
+DAILY_LOAD_COLUMNS = [
+    "id_jugadora", "nombre_jugadora", "plantel", "fecha_sesion",
+    "registros", "sesiones", "ua_total", "ua_cuadrados", "minutos_total", "rpe_medio",
+    "recuperacion", "energia", "sueno", "stress", "dolor",
+]
+
+def build_daily_loads(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Construye en memoria el mismo resumen diario por jugadora que mantiene
+    la tabla wellness_diario. Se usa cuando la vista necesita filtros que el
+    resumen no conserva (p. ej. turno) o si la tabla no está disponible.
+    """
+    if df_raw is None or df_raw.empty:
+        return pd.DataFrame(columns=DAILY_LOAD_COLUMNS)
+
+    df = df_raw.copy()
+    for c in ["ua", "minutos_sesion", "rpe", "recuperacion", "energia", "sueno", "stress", "dolor"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce") if c in df.columns else np.nan
+    df["ua_cuadrados"] = df["ua"] ** 2
+    for c in ["nombre_jugadora", "plantel"]:
+        if c not in df.columns:
+            df[c] = None
+
+    out = (
+        df.groupby(["id_jugadora", "fecha_sesion"], as_index=False, dropna=False)
+        .agg(
+            nombre_jugadora=("nombre_jugadora", "first"),
+            plantel=("plantel", "first"),
+            registros=("id_jugadora", "size"),
+            sesiones=("ua", "count"),
+            n_minutos=("minutos_sesion", "count"),
+            ua_total=("ua", "sum"),
+            ua_cuadrados=("ua_cuadrados", "sum"),
+            minutos_total=("minutos_sesion", "sum"),
+            rpe_medio=("rpe", "mean"),
+            recuperacion=("recuperacion", "mean"),
+            energia=("energia", "mean"),
+            sueno=("sueno", "mean"),
+            stress=("stress", "mean"),
+            dolor=("dolor", "mean"),
+        )
+        .sort_values("fecha_sesion", ignore_index=True)
+    )
+
+    # Igual que SUM() en SQL: sin valores → NULL, no 0
+    out[["ua_total", "ua_cuadrados"]] = out[["ua_total", "ua_cuadrados"]].where(out["sesiones"] > 0)
+    out["minutos_total"] = out["minutos_total"].where(out["n_minutos"] > 0)
+
+    return out[DAILY_LOAD_COLUMNS]
+
 def _daily_loads(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calcula las cargas diarias sumando UA (RPE × minutos) y minutos de sesión
@@ -151,3 +207,148 @@ def compute_rpe_metrics(df_raw: pd.DataFrame, flt: RPEFilters) -> dict:
     res["acwr"] = float((fatiga_aguda / 7.0) / fatiga_cronica) if fatiga_cronica else None
     res["minutos_sesion"] = float(day_row["minutos_total"].iloc[0]) if not day_row.empty else 0.0
     return res
+
+# Columnas de la tabla (jugadora × día) de compute_rpe_metrics_batch
+BATCH_METRIC_COLUMNS = [
+    "ua_total_dia",
+    "minutos_sesion",
+    "carga_semana",
+    "carga_media_semana",
+    "monotonia_semana",
+    "variabilidad_semana",
+    "carga_mes",
+    "carga_media_mes",
+    "fatiga_aguda",
+    "fatiga_cronica",
+    "adaptacion",
+    "acwr",
+]
+
+def compute_rpe_metrics_batch(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula las mismas métricas que compute_rpe_metrics para TODAS las
+    jugadoras y TODOS los días con carga, en una sola pasada agrupada.
+
+    Cada fila (id_jugadora, fecha_sesion) equivale a llamar a
+    compute_rpe_metrics con los registros de esa jugadora y end=fecha_sesion:
+      - semana / mes: días con carga de la semana (lunes-domingo) o del mes
+        natural que contiene la fecha.
+      - fatiga aguda: suma de los últimos 7 días naturales.
+      - fatiga crónica: media diaria de los últimos 28 días naturales.
+    """
+    columnas = ["id_jugadora", "fecha_sesion"] + BATCH_METRIC_COLUMNS
+    df = _prepare_checkout_df(df_raw)
+    if df.empty or "id_jugadora" not in df.columns:
+        return pd.DataFrame(columns=columnas)
+
+    if "minutos_sesion" not in df.columns:
+        df["minutos_sesion"] = np.nan
+    df["minutos_sesion"] = pd.to_numeric(df["minutos_sesion"], errors="coerce")
+    df["fecha"] = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+    df = df.dropna(subset=["fecha"])
+
+    # --- cargas diarias por jugadora ---
+    daily = (
+        df.groupby(["id_jugadora", "fecha"], as_index=False)[["ua", "minutos_sesion"]]
+        .sum(min_count=1)
+        .rename(columns={"ua": "ua_total_dia"})
+        .sort_values(["id_jugadora", "fecha"], ignore_index=True)
+    )
+
+    # --- semana natural (lunes-domingo) ---
+    semana = daily["fecha"] - pd.to_timedelta(daily["fecha"].dt.weekday, unit="D")
+    g_semana = daily.groupby([daily["id_jugadora"], semana])["ua_total_dia"]
+    daily["carga_semana"] = g_semana.transform("sum")
+    daily["carga_media_semana"] = g_semana.transform("mean")
+    std_semana = g_semana.transform("std", ddof=0).where(g_semana.transform("size") > 1, 0.0)
+    daily["variabilidad_semana"] = std_semana
+    daily["monotonia_semana"] = (daily["carga_media_semana"] / std_semana).where(std_semana > 0)
+
+    # --- mes natural ---
+    mes = daily["fecha"].dt.to_period("M")
+    g_mes = daily.groupby([daily["id_jugadora"], mes])["ua_total_dia"]
+    daily["carga_mes"] = g_mes.transform("sum")
+    daily["carga_media_mes"] = g_mes.transform("mean")
+
+    # --- ventanas móviles por días naturales (no por filas) ---
+    rolling = daily.set_index("fecha").groupby("id_jugadora", sort=True)["ua_total_dia"]
+    daily["fatiga_aguda"] = rolling.rolling("7D").sum().to_numpy()
+    daily["fatiga_cronica"] = rolling.rolling("28D").mean().to_numpy()
+
+    daily["adaptacion"] = daily["fatiga_cronica"] - daily["fatiga_aguda"] / 7.0
+    daily["acwr"] = (daily["fatiga_aguda"] / 7.0 / daily["fatiga_cronica"]).where(daily["fatiga_cronica"] != 0)
+
+    daily["fecha_sesion"] = daily["fecha"].dt.date
+
+    out = daily[columnas]
+    if "nombre_jugadora" in df.columns:
+        nombres = df.drop_duplicates("id_jugadora").set_index("id_jugadora")["nombre_jugadora"]
+        out.insert(1, "nombre_jugadora", out["id_jugadora"].map(nombres))
+
+    return out
+
+def latest_rpe_metrics(metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """Última fila (día de referencia más reciente) de cada jugadora."""
+    if metrics_df.empty:
+        return metrics_df
+    return (
+        metrics_df.sort_values("fecha_sesion")
+        .groupby("id_jugadora", as_index=False)
+        .tail(1)
+        .reset_index(drop=True)
+    )
+
+# ============================================================
+# 📈 ACWR diario por días naturales (media móvil o EWMA)
+# ============================================================
+ACWR_METODOS = ("rolling", "ewma")
+ACWR_COLUMNS = ["fecha_sesion", "ua", "sesiones", "fatiga", "acute", "chronic", "acwr"]
+
+def compute_acwr_series(df_raw: pd.DataFrame, metodo: str = "rolling") -> pd.DataFrame:
+    """
+    Serie diaria de ACWR de una jugadora, remuestreada a días naturales.
+
+    Los registros se suman por día y los días sin sesión cuentan como carga 0,
+    así que varios turnos el mismo día o huecos en el calendario no deforman
+    las ventanas (antes eran rolling(7)/rolling(28) sobre filas).
+
+    metodo:
+      - "rolling": media de los últimos 7 días / media de los últimos 28 días.
+      - "ewma": medias exponenciales con α = 2/(N+1), N = 7 y 28 días.
+
+    La fatiga es la media diaria de 'energia' (NaN en días sin check-in).
+    """
+    if metodo not in ACWR_METODOS:
+        raise ValueError(f"Método de ACWR no soportado: {metodo}")
+    if df_raw is None or df_raw.empty or "ua" not in df_raw.columns:
+        return pd.DataFrame(columns=ACWR_COLUMNS)
+
+    df = pd.DataFrame({
+        "fecha": pd.to_datetime(df_raw["fecha_sesion"], errors="coerce").dt.normalize(),
+        "ua": pd.to_numeric(df_raw["ua"], errors="coerce"),
+        "fatiga": pd.to_numeric(df_raw["energia"], errors="coerce") if "energia" in df_raw.columns else np.nan,
+    }).dropna(subset=["fecha"])
+    if df.empty:
+        return pd.DataFrame(columns=ACWR_COLUMNS)
+
+    diario = df.groupby("fecha").agg(
+        ua=("ua", "sum"),
+        sesiones=("ua", "count"),
+        fatiga=("fatiga", "mean"),
+    )
+    calendario = pd.date_range(diario.index.min(), diario.index.max(), freq="D", name="fecha")
+    diario = diario.reindex(calendario)
+    diario[["ua", "sesiones"]] = diario[["ua", "sesiones"]].fillna(0)
+
+    if metodo == "rolling":
+        diario["acute"] = diario["ua"].rolling("7D", min_periods=3).mean()
+        diario["chronic"] = diario["ua"].rolling("28D", min_periods=7).mean()
+    else:
+        diario["acute"] = diario["ua"].ewm(alpha=2 / (7 + 1), adjust=False, min_periods=3).mean()
+        diario["chronic"] = diario["ua"].ewm(alpha=2 / (28 + 1), adjust=False, min_periods=7).mean()
+
+    diario["acwr"] = diario["acute"] / diario["chronic"].where(diario["chronic"] != 0)
+
+    out = diario.reset_index()
+    out["fecha_sesion"] = out["fecha"].dt.date
+    return out[ACWR_COLUMNS]
@@ -4,6 +4,7 @@ import pandas as pd
 import plotly.express as px
 from modules.app_config import styles
 from modules.i18n.i18n import t
+from .metrics import latest_rpe_metrics
 
 # ============================================================
 # 🧭 Función auxiliar de fecha
@@ -27,24 +28,42 @@ def _ensure_fecha(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _agregar_diario(df: pd.DataFrame, por) -> pd.DataFrame:
+    """
+    Reagrupa el resumen diario (metrics.build_daily_loads / wellness_diario)
+    por las claves indicadas, recomponiendo medias y desviaciones a partir
+    de las sumas por día en lugar de volver a los registros crudos.
+    """
+    df = df.assign(rpe_suma=df["rpe_medio"].fillna(0) * df["sesiones"])
+    g = df.groupby(por, as_index=False).agg(
+        carga_total=("ua_total", "sum"),
+        ua_cuadrados=("ua_cuadrados", "sum"),
+        rpe_suma=("rpe_suma", "sum"),
+        sesiones=("sesiones", "sum"),
+    )
+    n = g["sesiones"].where(g["sesiones"] > 0)
+    g["carga_media"] = g["carga_total"] / n
+    g["rpe_prom"] = g["rpe_suma"] / n
+
+    # Varianza muestral (ddof=1) desde Σx y Σx²; se recorta el ruido numérico
+    var = (g["ua_cuadrados"] - g["carga_total"] ** 2 / n) / (n - 1).where(n > 1)
+    var = var.where(var > 1e-9 * g["ua_cuadrados"].where(n > 1), 0.0).where(n > 1)
+    g["desv_std"] = var ** 0.5
+
+    return g.drop(columns=["ua_cuadrados", "rpe_suma"])
+
+
 # ============================================================
 # 📊 Carga semanal (UA)
 # ============================================================
-def plot_carga_semanal(df: pd.DataFrame):
-    """Evolución semanal de la carga total y media del grupo."""
-    df = _ensure_fecha(df)
-    if df.empty or df["ua"].isna().all():
+def plot_carga_semanal(diario: pd.DataFrame):
+    """Evolución semanal de la carga total y media del grupo (desde el resumen diario)."""
+    df = _ensure_fecha(diario)
+    if "ua_total" not in df.columns or df["ua_total"].isna().all():
         st.info("No hay datos de carga disponibles.")
         return
 
-    weekly = (
-        df.groupby(["anio", "semana", "rango_semana"], as_index=False)
-        .agg(
-            carga_total=("ua", "sum"),
-            carga_media=("ua", "mean"),
-            rpe_prom=("rpe", "mean"),
-        )
-    )
+    weekly = _agregar_diario(df, ["anio", "semana", "rango_semana"])
 
     fig = px.line(
         weekly,
@@ -86,14 +105,14 @@ def plot_carga_semanal(df: pd.DataFrame):
 # ============================================================
 # 📉 RPE promedio diario
 # ============================================================
-def plot_rpe_promedio(df: pd.DataFrame):
-    """Promedio de RPE diario del grupo."""
-    df = _ensure_fecha(df)
-    if "rpe" not in df.columns:
+def plot_rpe_promedio(diario: pd.DataFrame):
+    """Promedio de RPE diario del grupo (ponderado por sesiones de cada jugadora)."""
+    df = _ensure_fecha(diario)
+    if "rpe_medio" not in df.columns:
         st.warning("No se encontró la columna RPE.")
         return
 
-    daily = df.groupby("fecha_sesion", as_index=False)["rpe"].mean()
+    daily = _agregar_diario(df, "fecha_sesion").rename(columns={"rpe_prom": "rpe"})
 
     fig = px.bar(
         daily,
@@ -120,20 +139,15 @@ def plot_rpe_promedio(df: pd.DataFrame):
 # ============================================================
 # ⚙️ Monotonía y fatiga aguda
 # ============================================================
-def plot_monotonia_fatiga(df: pd.DataFrame):
+def plot_monotonia_fatiga(diario: pd.DataFrame):
     """Calcula y muestra el índice de monotonía y fatiga aguda por microciclo."""
-    df = _ensure_fecha(df)
-    if "ua" not in df.columns:
+    df = _ensure_fecha(diario)
+    if "ua_total" not in df.columns:
         st.warning("No se encontró la columna UA.")
         return
 
-    weekly = (
-        df.groupby(["anio", "semana"], as_index=False)["ua"]
-        .agg(["sum", "std", "mean"])
-        .reset_index()
-        .rename(columns={"sum": "carga_total", "std": "desv_std", "mean": "media"})
-    )
-    weekly["monotonia"] = weekly["media"] / weekly["desv_std"].replace(0, pd.NA)
+    weekly = _agregar_diario(df, ["anio", "semana"])
+    weekly["monotonia"] = weekly["carga_media"] / weekly["desv_std"].replace(0, pd.NA)
     weekly["fatiga_aguda"] = weekly["carga_total"] * weekly["monotonia"]
 
     fig = px.line(
@@ -159,15 +173,15 @@ def plot_monotonia_fatiga(df: pd.DataFrame):
 # ============================================================
 # 📈 Relación Carga Aguda : Crónica (ACWR)
 # ============================================================
-def plot_acwr(df: pd.DataFrame):
+def plot_acwr(diario: pd.DataFrame):
     """Calcula la relación ACWR y pinta zonas de referencia con colores del semáforo."""
-    df = _ensure_fecha(df)
-    if "ua" not in df.columns:
+    df = _ensure_fecha(diario)
+    if "ua_total" not in df.columns:
         st.warning("No se encontró la columna UA.")
         return
 
-    weekly = df.groupby(["anio", "semana"], as_index=False)["ua"].sum()
-    weekly.rename(columns={"ua": "carga"}, inplace=True)
+    weekly = df.groupby(["anio", "semana"], as_index=False)["ua_total"].sum()
+    weekly.rename(columns={"ua_total": "carga"}, inplace=True)
 
     # Carga aguda (semana actual) vs carga crónica (media de 3 previas)
     weekly["acwr"] = weekly["carga"] / weekly["carga"].rolling(4, min_periods=2).mean().shift(1)
@@ -203,19 +217,13 @@ def plot_acwr(df: pd.DataFrame):
     )
     st.plotly_chart(fig, use_container_width=False)
 
-def tabla_resumen(df_filtrado):
-    # df_filtrado["jugadora"] = (
-    #     df_filtrado["nombre"].fillna("") + " " + df_filtrado["apellido"].fillna("")
-    # ).str.strip()
-
+def tabla_resumen(diario: pd.DataFrame):
     resumen = (
-        df_filtrado.groupby(["nombre_jugadora"], as_index=False)
-        .agg(
-            carga_total=("ua", "sum"),
-            rpe_promedio=("rpe", "mean"),
-            sesiones=("ua", "count"),
-        )
+        _agregar_diario(diario, "nombre_jugadora")
+        .rename(columns={"rpe_prom": "rpe_promedio"})
+        [["nombre_jugadora", "carga_total", "rpe_promedio", "sesiones"]]
         .sort_values("carga_total", ascending=False)
+        .reset_index(drop=True)
     )
 
     resumen["carga_total"] = resumen["carga_total"].round(0)
@@ -232,4 +240,41 @@ def tabla_resumen(df_filtrado):
                 "sesiones": "Nº sesiones",
             }
         ),
-    )
\ No newline at end of file
+    )
+# ============================================================
+# 🚦 Índices de carga por jugadora (ACWR, fatiga, monotonía)
+# ============================================================
+def tabla_indices_carga(metricas_df: pd.DataFrame):
+    """
+    Muestra el último día de referencia de cada jugadora a partir de la tabla
+    (jugadora × día) de compute_rpe_metrics_batch.
+    """
+    if metricas_df is None or metricas_df.empty:
+        st.info(t("No hay datos de carga disponibles."))
+        return
+
+    ultimo = latest_rpe_metrics(metricas_df).sort_values("acwr", ascending=False, na_position="last")
+
+    def color_acwr(col):
+        return [
+            f"background-color:{styles.SEMAFORO['rojo']}; color:white; font-weight:bold;" if pd.notna(v) and v > 1.5 else
+            f"background-color:{styles.SEMAFORO['naranja']}; color:white; font-weight:bold;" if pd.notna(v) and v >= 1.3 else
+            f"background-color:{styles.SEMAFORO['verde_oscuro']}; color:white; font-weight:bold;" if pd.notna(v) and v >= 0.8 else
+            f"background-color:{styles.SEMAFORO['gris']}; color:black;" if pd.notna(v) else
+            ""
+            for v in col
+        ]
+
+    columnas = {
+        "nombre_jugadora": t("Jugadora"),
+        "fecha_sesion": t("Fecha"),
+        "carga_semana": t("Carga semana"),
+        "fatiga_aguda": t("Fatiga aguda (7d)"),
+        "fatiga_cronica": t("Fatiga crónica (28d)"),
+        "monotonia_semana": t("Monotonía semana"),
+        "acwr": t("ACWR"),
+    }
+    tabla = ultimo[[c for c in columnas if c in ultimo.columns]].rename(columns=columnas)
+
+    styled = tabla.style.apply(color_acwr, subset=[t("ACWR")]).format(precision=2, na_rep="-")
+    st.dataframe(styled, hide_index=True)
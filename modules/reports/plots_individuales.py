@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 import altair as alt
 from modules.i18n.i18n import t
 from modules.app_config.styles import get_color_wellness
+from .metrics import compute_acwr_series
 import pandas as pd
 import plotly.graph_objects as go
 import pandas as pd
@@ -60,19 +61,17 @@ def grafico_duracion_rpe(df: pd.DataFrame):
 
 
 # 3️⃣ ACWR -----------------------------------------------------------
-def grafico_acwr(df: pd.DataFrame):
+def grafico_acwr(df: pd.DataFrame, acwr_df: pd.DataFrame | None = None):
+    """acwr_df: serie diaria de compute_acwr_series; si no se pasa, se calcula."""
     #st.markdown("#### Evolución del índice ACWR (Relación Agudo:Crónico)")
 
     if "ua" not in df.columns:
         st.info(t("No hay datos de carga interna (UA) para calcular ACWR."))
         return
 
-    df = df.copy()
-    df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
-    df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
-    df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
-    df["acwr"] = df["acute7"] / df["chronic28"]
-    df = df.dropna(subset=["acwr"])
+    if acwr_df is None:
+        acwr_df = compute_acwr_series(df)
+    df = acwr_df.dropna(subset=["acwr"]).copy()
 
     if df.empty:
         st.info(t("No hay suficientes datos para calcular ACWR."))
@@ -143,10 +142,12 @@ def grafico_wellness(df: pd.DataFrame):
 
 
 # 5️⃣ Riesgo de lesión -----------------------------------------------
-def grafico_riesgo_lesion(df: pd.DataFrame):
+def grafico_riesgo_lesion(df: pd.DataFrame, acwr_df: pd.DataFrame | None = None):
     """
     Visualiza el riesgo de lesión combinando el índice ACWR (Agudo:Crónico)
     con la fatiga subjetiva, mostrando zonas de carga de fondo.
+
+    acwr_df: serie diaria de compute_acwr_series; si no se pasa, se calcula.
     """
 
     st.markdown(t("#### Evolución del riesgo de lesión (ACWR + Fatiga)"))
@@ -155,14 +156,10 @@ def grafico_riesgo_lesion(df: pd.DataFrame):
         st.info(t("No hay datos suficientes para calcular el riesgo."))
         return
 
-    df = df.copy()
-    df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
-    df["fatiga"] = pd.to_numeric(df.get("energia", np.nan), errors="coerce")
-
-    # Calcular cargas aguda y crónica
-    df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
-    df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
-    df["acwr"] = df["acute7"] / df["chronic28"]
+    # Cargas aguda y crónica por días naturales (fatiga = media diaria de energía)
+    if acwr_df is None:
+        acwr_df = compute_acwr_series(df)
+    df = acwr_df.copy()
 
     # --- Clasificación del riesgo ---
     def riesgo_calc(row):
@@ -265,9 +262,9 @@ def tabla_wellness_individual(df: pd.DataFrame):
     t_df["fecha_sesion"] = t_df["fecha_sesion"].dt.date
 
     #st.dataframe(t_df)
-    # Tipo de estímulo y readaptación
-    t_df["Tipo de estímulo"] = t_df.get("tipo_carga", "").fillna("").astype(str)
-    t_df["Tipo de readaptación"] = t_df.get("rehabilitación_readaptación", "").fillna("").astype(str)
+    # Tipo de estímulo y readaptación (category en la caché: fillna sobre object)
+    t_df["Tipo de estímulo"] = t_df.get("tipo_carga", "").astype(object).fillna("").astype(str)
+    t_df["Tipo de readaptación"] = t_df.get("rehabilitación_readaptación", "").astype(object).fillna("").astype(str)
 
     # Calcular Promedio Wellness
     t_df["Promedio Wellness"] = t_df[["recuperacion", "energia", "sueno", "stress", "dolor"]].mean(axis=1)
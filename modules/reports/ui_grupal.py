@@ -2,16 +2,25 @@
 import streamlit as st
 import pandas as pd
 from modules.i18n.i18n import t
-from .plots_grupales import (plot_carga_semanal, plot_rpe_promedio, tabla_resumen)
+from .metrics import compute_rpe_metrics_batch, build_daily_loads
+from .plots_grupales import (plot_carga_semanal, plot_rpe_promedio, tabla_resumen, tabla_indices_carga)
 
-def group_dashboard(df_filtrado: pd.DataFrame):
-    """Panel grupal con gráficos y tablas agregadas."""
+def group_dashboard(df_filtrado: pd.DataFrame, diario: pd.DataFrame | None = None):
+    """
+    Panel grupal con gráficos y tablas agregadas.
+
+    Los gráficos leen el resumen diario por jugadora (wellness_diario). Si no
+    se pasa, se construye en memoria a partir de df_filtrado.
+    """
 
     #st.subheader(":material/group: Resumen grupal de cargas", divider=True)
     if df_filtrado.empty:
         st.info(t("No hay datos disponibles para el periodo seleccionado."))
         st.stop()
 
+    if diario is None:
+        diario = build_daily_loads(df_filtrado)
+
     st.divider()
     tabs = st.tabs([
         t(":material/monitor_weight: Carga y esfuerzo"),
@@ -20,8 +29,10 @@ def group_dashboard(df_filtrado: pd.DataFrame):
     ])
 
     with tabs[0]:
-        plot_carga_semanal(df_filtrado)
+        plot_carga_semanal(diario)
     with tabs[1]: 
-        plot_rpe_promedio(df_filtrado)
+        plot_rpe_promedio(diario)
+        # Métricas de todas las jugadoras en una sola pasada
+        tabla_indices_carga(compute_rpe_metrics_batch(diario))
     with tabs[2]: 
-        tabla_resumen(df_filtrado)
+        tabla_resumen(diario)
@@ -3,9 +3,11 @@ import pandas as pd
 import numpy as np
 
 from modules.db.db_lesiones import get_wellness_pre_lesion
-from .metrics import compute_rpe_metrics, RPEFilters
-from modules.util.util import (get_photo, clean_image_url, calcular_edad)
+from .metrics import compute_rpe_metrics, compute_acwr_series, RPEFilters
+from modules.util.util import calcular_edad
+from modules.util.photo_cache import get_player_photo
 from modules.i18n.i18n import t
+from modules.i18n.narratives import narrative, render_narrative
 
 from .plots_individuales import (
     grafico_wellness_pre_lesion,
@@ -65,11 +67,10 @@ def player_block_dux(jugadora_seleccionada: dict, unavailable="N/A"):
 
     with col1:
         if pd.notna(url_drive) and url_drive and url_drive != "No Disponible":
-            direct_url = clean_image_url(url_drive)
-            #st.text(direct_url)
-            response = get_photo(direct_url)
-            if response and response.status_code == 200 and 'image' in response.headers.get("Content-Type", ""):
-                st.image(response.content, width=300)
+            # Miniatura cacheada (memoria/disco); None si la URL falla
+            foto = get_player_photo(url_drive)
+            if foto is not None:
+                st.image(foto, width=300)
             else:
                 st.image(f"assets/images/{profile_image}.png", width=300)
         else:
@@ -136,16 +137,56 @@ def metricas(df: pd.DataFrame, jug_sel, turno_sel, start, end) -> None:
     #st.dataframe(df)
     #tabla_wellness_individual(df)
 
-def _get_resumen_tecnico_carga(metrics: dict) -> str:
+_ROJO, _NARANJA, _VERDE, _GRIS, _AZUL = "#E53935", "#FB8C00", "#43A047", "#757575", "#607D8B"
+
+def _color_text(text, color):
+    return f"<b style='color:{color}'>{text}</b>"
+
+@narrative("resumen_tecnico_carga")
+def _compilar_resumen_carga(tr):
+    etiquetas = {
+        # carga semanal / fatiga aguda
+        "alta": _ROJO, "moderada": _NARANJA, "baja": _VERDE,
+        "elevada": _ROJO, "controlada": _NARANJA,
+        # ACWR
+        "sin datos suficientes": _GRIS,
+        "riesgo alto de sobrecarga": _ROJO,
+        "subcarga o falta de estímulo": _NARANJA,
+        "relación óptima entre carga aguda y crónica": _VERDE,
+        # monotonía
+        "sin datos de variabilidad": _GRIS,
+        "poca variabilidad entre sesiones": _ROJO,
+        "variabilidad moderada": _NARANJA,
+        "buena variabilidad semanal": _VERDE,
+        # adaptación
+        "no disponible": _GRIS,
+        "negativa (predomina la fatiga)": _ROJO,
+        "neutral": _NARANJA,
+        "positiva (asimilación adecuada del entrenamiento)": _VERDE,
+    }
+    return {
+        "plantilla": (
+            f"{tr(':material/description: **Resumen técnico:**')} <div style='text-align: justify;'> {tr('En el último día registrado se completaron')} "
+            f"{_color_text('{minutos_dia:.0f} minutos', _VERDE)} {tr('de sesión con una carga interna de')} "
+            f"{_color_text('{ua_total_dia:.0f} UA', _VERDE)}. "
+            f"{tr('La carga semanal actual es')} {{carga_estado}} "
+            f"({_color_text('{carga_semana:.0f} UA', _AZUL)}) {tr('y la carga mensual acumulada asciende a')} "
+            f"{_color_text('{carga_mes:.0f} UA', _AZUL)}. "
+            f"{tr('La fatiga aguda es')} {{estado_fatiga}}, {tr('mientras que la fatiga crónica se mantiene en')} "
+            f"{_color_text('{fatiga_cronica:.1f} UA', _AZUL)} {tr('de media')}, {tr('indicando una adaptación')} {{estado_adapt}}. "
+            f"{tr('El índice ACWR sugiere')} {{riesgo}}, {tr('y la monotonía semanal refleja')} {{variabilidad}}."
+            f"</div>"
+        ),
+        "etiquetas": {texto: _color_text(tr(texto), color) for texto, color in etiquetas.items()},
+    }
+
+def _get_resumen_tecnico_carga(metrics: dict, lang: str | None = None) -> str:
     """
     Genera un resumen técnico con interpretación y colores visuales
     (rojo = riesgo, naranja = medio, verde = óptimo).
     Devuelve un texto formateado en HTML para st.markdown().
     """
 
-    def color_text(text, color):
-        return f"<b style='color:{color}'>{text}</b>"
-
     # --- valores base ---
     carga_semana = metrics.get("carga_semana", 0) or 0
     carga_mes = metrics.get("carga_mes", 0) or 0
@@ -159,69 +200,82 @@ def _get_resumen_tecnico_carga(metrics: dict) -> str:
 
     # --- CARGA SEMANAL ---
     if carga_semana > 2500:
-        carga_estado = color_text(t("alta"), "#E53935")  # rojo
+        carga_estado = "alta"
     elif carga_semana >= 1500:
-        carga_estado = color_text(t("moderada"), "#FB8C00")  # naranja
+        carga_estado = "moderada"
     else:
-        carga_estado = color_text(t("baja"), "#43A047")  # verde
+        carga_estado = "baja"
 
     # --- FATIGA AGUDA ---
     if fatiga_aguda > 2000:
-        estado_fatiga = color_text(t("elevada"), "#E53935")
+        estado_fatiga = "elevada"
     elif fatiga_aguda >= 1000:
-        estado_fatiga = color_text(t("controlada"), "#FB8C00")
+        estado_fatiga = "controlada"
     else:
-        estado_fatiga = color_text(t("baja"), "#43A047")
+        estado_fatiga = "baja"
 
     # --- ACWR ---
     if acwr is None:
-        riesgo = color_text(t("sin datos suficientes"), "#757575")
+        riesgo = "sin datos suficientes"
     elif acwr > 1.5:
-        riesgo = color_text(t("riesgo alto de sobrecarga"), "#E53935")
+        riesgo = "riesgo alto de sobrecarga"
     elif acwr < 0.8:
-        riesgo = color_text(t("subcarga o falta de estímulo"), "#FB8C00")
+        riesgo = "subcarga o falta de estímulo"
     else:
-        riesgo = color_text(t("relación óptima entre carga aguda y crónica"), "#43A047")
+        riesgo = "relación óptima entre carga aguda y crónica"
 
     # --- MONOTONÍA ---
     if monotonia is None:
-        variabilidad = color_text(t("sin datos de variabilidad"), "#757575")
+        variabilidad = "sin datos de variabilidad"
     elif monotonia > 1.8:
-        variabilidad = color_text(t("poca variabilidad entre sesiones"), "#E53935")
+        variabilidad = "poca variabilidad entre sesiones"
     elif monotonia >= 1.5:
-        variabilidad = color_text(t("variabilidad moderada"), "#FB8C00")
+        variabilidad = "variabilidad moderada"
     else:
-        variabilidad = color_text(t("buena variabilidad semanal"), "#43A047")
+        variabilidad = "buena variabilidad semanal"
 
     # --- ADAPTACIÓN ---
     if adaptacion is None:
-        estado_adapt = color_text(t("no disponible"), "#757575")
+        estado_adapt = "no disponible"
     elif adaptacion < 0:
-        estado_adapt = color_text(t("negativa (predomina la fatiga)"), "#E53935")
+        estado_adapt = "negativa (predomina la fatiga)"
     elif adaptacion == 0:
-        estado_adapt = color_text(t("neutral"), "#FB8C00")
+        estado_adapt = "neutral"
     else:
-        estado_adapt = color_text(t("positiva (asimilación adecuada del entrenamiento)"), "#43A047")
-
-    # --- construir resumen con colores ---
-    resumen = (f"{t(':material/description: **Resumen técnico:**')} <div style='text-align: justify;'> {t('En el último día registrado se completaron')} " 
-    f"{color_text(f'{minutos_dia:.0f} minutos', '#43A047')} {t('de sesión con una carga interna de')} " f"{color_text(f'{ua_total_dia:.0f} UA', '#43A047')}. "
-    f"{t('La carga semanal actual es')} {carga_estado} " 
-    f"({color_text(f'{carga_semana:.0f} UA', '#607D8B')}) {t('y la carga mensual acumulada asciende a')} " 
-    f"{color_text(f'{carga_mes:.0f} UA', '#607D8B')}. " 
-    f"{t('La fatiga aguda es')} {estado_fatiga}, {t('mientras que la fatiga crónica se mantiene en')} " 
-    f"{color_text(f'{fatiga_cronica:.1f} UA', '#607D8B')} {t('de media')}, {t('indicando una adaptación')} {estado_adapt}. " 
-    f"{t('El índice ACWR sugiere')} {riesgo}, {t('y la monotonía semanal refleja')} {variabilidad}." 
-    f"</div>" )
-
-    return resumen
-
+        estado_adapt = "positiva (asimilación adecuada del entrenamiento)"
+
+    # --- plantilla compilada por idioma: solo se formatean los valores ---
+    return render_narrative(
+        "resumen_tecnico_carga",
+        valores={
+            "minutos_dia": minutos_dia, "ua_total_dia": ua_total_dia,
+            "carga_semana": carga_semana, "carga_mes": carga_mes,
+            "fatiga_cronica": fatiga_cronica,
+        },
+        etiquetas={
+            "carga_estado": carga_estado, "estado_fatiga": estado_fatiga,
+            "riesgo": riesgo, "variabilidad": variabilidad, "estado_adapt": estado_adapt,
+        },
+        lang=lang,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def acwr_jugadora(df_player: pd.DataFrame, metodo: str = "rolling") -> pd.DataFrame:
+    """
+    Serie diaria de ACWR de la jugadora (compute_acwr_series) memoizada por
+    registros de la jugadora/rango de fechas y método. La página la calcula
+    una vez y la comparten el semáforo y los gráficos.
+    """
+    return compute_acwr_series(df_player, metodo)
 
-def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
+def calcular_semaforo_riesgo(df: pd.DataFrame, acwr_df: pd.DataFrame | None = None) -> tuple[str, str, float, float]:
     """
     Calcula el semáforo de riesgo basándose en ACWR (carga aguda/crónica)
     y la percepción de fatiga (1–5).
 
+    acwr_df: serie diaria de compute_acwr_series; si no se pasa, se calcula.
+
     Retorna:
         icono (str): 🟢🟠🔴⚪️
         descripcion (str): texto interpretativo
@@ -232,21 +286,14 @@ def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
     if "ua" not in df.columns:
         return "⚪️", "Sin datos de carga (UA).", np.nan, np.nan
 
-    # Convertir UA a numérico
-    df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
-    df = df.dropna(subset=["ua"])
-
-    df = df.copy()
-    
-    # Calcular carga aguda (últimos 7 días) y crónica (últimos 28 días)
-    df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
-    df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
-    df["acwr"] = df["acute7"] / df["chronic28"]
-    df = df.dropna(subset=["acwr"])
+    # Carga aguda (7 días) y crónica (28 días) por días naturales
+    if acwr_df is None:
+        acwr_df = compute_acwr_series(df)
+    df = acwr_df.dropna(subset=["acwr"])
 
     # Últimos valores
     last_acwr = df["acwr"].iloc[-1] if not df.empty else np.nan
-    last_fatiga = df["fatiga"].iloc[-1] if "fatiga" in df.columns else np.nan
+    last_fatiga = df["fatiga"].iloc[-1] if not df.empty else np.nan
 
     # Lógica de riesgo
     if pd.isna(last_acwr) and pd.isna(last_fatiga):
@@ -260,7 +307,7 @@ def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
     else:
         return "⚪️", t("Carga muy baja; posible desadaptación o falta de estímulo."), last_acwr, last_fatiga
 
-def graficos_individuales(df: pd.DataFrame):
+def graficos_individuales(df: pd.DataFrame, acwr_df: pd.DataFrame | None = None):
     """Gráficos individuales para análisis de carga, bienestar y riesgo."""
 
     if df is None or df.empty:
@@ -285,7 +332,7 @@ def graficos_individuales(df: pd.DataFrame):
         st.divider()
         grafico_wellness(df_player)
     with tabs[1]: 
-        grafico_acwr(df_player)
+        grafico_acwr(df_player, acwr_df)
     with tabs[2]: 
         grafico_rpe_ua(df_player)
     with tabs[3]: 
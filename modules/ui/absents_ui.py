@@ -4,6 +4,8 @@ import datetime
 import time
 from modules.db.db_absences import delete_absences, insert_absence
 from modules.i18n.i18n import t
+from modules.util.absence_index import absent_players
+from modules.util.records_util import build_check_index, ids_con_registro
 
 def get_checkins(records_df, fecha):
     """Devuelve array de id_jugadora con CHECK-IN en la fecha y turno indicados."""
@@ -19,11 +21,19 @@ def get_checkouts(records_df, fecha):
         (records_df["fecha_sesion"] == fecha)
     ]["id_jugadora"].unique()
 
-def filtrar_jugadoras_ausentes(jug_df, ausencias_df):
+def filtrar_jugadoras_ausentes(jug_df, ausencias_df, indice_ausencias=None, fecha=None):
+    """
+    Quita las jugadoras ausentes. Con indice_ausencias (get_absence_index_db)
+    y fecha se usan las ausencias de ese día, aunque sea un día pasado; si
+    no, las de ausencias_df (las activas hoy).
+    """
 
     # Jugadoras del plantel seleccionado
     #jugadoras_plantel = jug_df[jug_df["plantel"] == codigo_plantel]
 
+    if indice_ausencias is not None and fecha is not None:
+        return jug_df[~jug_df["id_jugadora"].isin(absent_players(indice_ausencias, fecha))]
+
     # Si no hay ausencias → retornar todas las jugadoras del plantel
     if ausencias_df is None or ausencias_df.empty or "id_jugadora" not in ausencias_df.columns:
         return jug_df
@@ -38,13 +48,15 @@ def filtrar_jugadoras_ausentes(jug_df, ausencias_df):
 
     return disponibles
 
-def filtrar_jugadoras_disponibles(jug_df, ausencias_df, wellness_df):
+def filtrar_jugadoras_disponibles(jug_df, ausencias_df, wellness_df, check_index=None):
 
     hoy = datetime.date.today()
 
-    # Listas de jugadoras que han registrado algo hoy
-    checkins = get_checkins(wellness_df, hoy)
-    checkouts = get_checkouts(wellness_df, hoy)
+    # Listas de jugadoras que han registrado algo hoy (índice por sesión)
+    if check_index is None:
+        check_index = build_check_index(wellness_df)
+    checkins = ids_con_registro(check_index, hoy, "checkin")
+    checkouts = ids_con_registro(check_index, hoy, "checkout")
 
     jugadoras_con_registro = set(checkins) | set(checkouts)   # unión de ambas
     #st.text(f"Jugadoras con registro hoy: {hoy}")
@@ -76,7 +88,7 @@ def filtrar_jugadoras_disponibles(jug_df, ausencias_df, wellness_df):
     return disponibles_sin_registro_hoy
 
 @st.fragment
-def checkout_inputs(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df):
+def checkout_inputs(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df, check_index=None):
 
     # --- Fila principal de filtros ---
     col1, col2, col3 = st.columns([1.5, 1.5, 1])
@@ -97,7 +109,7 @@ def checkout_inputs(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df
 
             codigo_comp = competicion["codigo"]
 
-            jugadoras_disponibles_df = filtrar_jugadoras_disponibles(jug_df, ausencias_df, wellness_df)
+            jugadoras_disponibles_df = filtrar_jugadoras_disponibles(jug_df, ausencias_df, wellness_df, check_index)
             
             
             jug_df_filtrado = jugadoras_disponibles_df[jugadoras_disponibles_df["plantel"] == codigo_comp]
@@ -189,8 +201,8 @@ def checkout_inputs(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df
             time.sleep(4)
             st.rerun()
 
-def absents_form(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df):
-    checkout_inputs(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df)
+def absents_form(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df, check_index=None):
+    checkout_inputs(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df, check_index)
 
 def absents_summary(records):
     #st.markdown(":material/event_busy: Ausencias registradas")
@@ -0,0 +1,81 @@
+import pandas as pd
+import streamlit as st
+
+from modules.db.db_records import import_records_db
+from modules.i18n.i18n import t
+from modules.util.records_import import CHUNK_SIZE, READ_ERRORS, build_player_index, prepare_chunk, read_chunks
+
+# ===============================
+# 🔸 Importación masiva (admin)
+# ===============================
+def import_records_ui(jug_df: pd.DataFrame):
+    """
+    Carga de registros históricos o externos desde CSV/XLSX. El fichero se
+    procesa por bloques: cada bloque se valida y se escribe en una sola
+    transacción antes de leer el siguiente. Si el fichero no se puede leer
+    (formato corrupto, codificación), el error se muestra junto a los de
+    validación y se conserva lo importado hasta ese bloque.
+    """
+    st.markdown(t("**Importar registros de wellness y RPE**"))
+    st.caption(t(
+        "Columnas: id_jugadora o jugadora, fecha_sesion, turno, tipo (opcional), "
+        "recuperacion, fatiga, sueno, stress, dolor, minutos_sesion, rpe."
+    ))
+
+    archivo = st.file_uploader(t("Fichero CSV o Excel"), type=["csv", "xlsx"])
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        chunksize = st.number_input(t("Filas por bloque"), min_value=100, max_value=10000, value=CHUNK_SIZE, step=100)
+    with col2:
+        solo_validar = st.checkbox(t("Solo validar (no guardar)"))
+
+    if archivo is None or not st.button(t(":material/upload: Importar"), type="primary"):
+        return
+
+    jugadoras = build_player_index(jug_df)
+    usuario = st.session_state["auth"]["name"].lower()
+
+    total = {"filas": 0, "insertados": 0, "actualizados": 0, "omitidos": 0}
+    errores = []
+    progreso = st.progress(0.0, text=t("Importando..."))
+
+    try:
+        fila_inicial = 2  # fila 1 = cabecera
+        for bloque, fraccion in read_chunks(archivo, archivo.name, int(chunksize)):
+            checkins, checkouts, errores_bloque = prepare_chunk(bloque, jugadoras, usuario, fila_inicial)
+            fila_inicial += len(bloque)
+            total["filas"] += len(bloque)
+            errores.extend(errores_bloque)
+
+            if not solo_validar:
+                # Check-in y check-out del bloque en la misma transacción
+                ok, resumen = import_records_db(checkins, checkouts)
+                if not ok:
+                    st.error(t("Error al guardar el bloque; se detiene la importación."))
+                    progreso.empty()
+                    return
+                for clave in ("insertados", "actualizados", "omitidos"):
+                    total[clave] += resumen[clave]
+
+            progreso.progress(fraccion, text=f"{t('Importando...')} {total['filas']} {t('filas')}")
+    except READ_ERRORS as e:
+        errores.append({"fila": fila_inicial, "error": f"{t('No se pudo leer el fichero')}: {e}"})
+        progreso.progress(1.0, text=t("Importación interrumpida"))
+    else:
+        progreso.progress(1.0, text=t("Importación finalizada"))
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric(t("Filas leídas"), total["filas"])
+    c2.metric(t("Insertados"), total["insertados"])
+    c3.metric(t("Actualizados"), total["actualizados"])
+    c4.metric(t("Con errores"), len(errores))
+
+    if errores:
+        errores_df = pd.DataFrame(errores)
+        st.dataframe(errores_df.head(500), hide_index=True)
+        st.download_button(
+            label=t(":material/download: Descargar errores en CSV"),
+            data=errores_df.to_csv(index=False).encode("utf-8"),
+            file_name="errores_importacion.csv",
+            mime="text/csv",
+        )
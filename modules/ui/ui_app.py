@@ -5,6 +5,7 @@ from datetime import date, timedelta
 from modules.app_config.styles import WELLNESS_COLOR_NORMAL, WELLNESS_COLOR_INVERTIDO, get_color_wellness
 from modules.util.util import ordenar_df
 from modules.i18n.i18n import t
+from modules.i18n.narratives import compiled_narrative, narrative, render_narrative
 
 W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
 
@@ -249,106 +250,161 @@ delta_ua, chart_ua, alertas_count, total_jugadoras, alertas_pct, chart_alertas,
 #         f"indicando **fatiga, sobrecarga o molestias significativas** que aumentan el riesgo de lesión o bajo rendimiento."
 #     )
 
-def mostrar_resumen_tecnico(wellness_prom: float, rpe_prom: float, ua_total: float,
-                            alertas_count: int, total_jugadoras: int):
-    """
-    Muestra en pantalla el resumen técnico del grupo, con interpretación automática
-    del estado de bienestar, esfuerzo percibido y riesgo de alerta.
-    """
+@narrative("resumen_tecnico_grupo")
+def _compilar_resumen_tecnico(tr):
+    etiquetas = [
+        "óptimo", "moderado", "en fatiga",
+        "sin datos", "bajo", "alto",
+        "sin jugadoras en zona roja", "1 jugadora en seguimiento",
+    ]
+    return {
+        "plantilla": (
+            f":material/description: **{tr('Resumen técnico')}:** "
+            f"{tr('El grupo muestra un estado de bienestar')} **{{estado_bienestar}}** "
+            f"({{wellness_prom}}/25) "
+            f"{tr('con un esfuerzo percibido')} **{{nivel_rpe}}** (RPE {{rpe_prom}}). "
+            f"{tr('La carga interna total es de')} **{{ua_total}} UA** "
+            f"{tr('y actualmente hay')} **{{estado_alertas}}**, "
+            f"{tr('debido a que el promedio de bienestar x 5 es menor a 15 puntos')} "
+            f"{tr('(escala 25)')}, "
+            f"{tr('indicando fatiga, sobrecarga o molestias significativas que aumentan el riesgo de lesión o bajo rendimiento')}."
+        ),
+        "etiquetas": {
+            **{e: tr(e) for e in etiquetas},
+            "jugadoras en zona roja": f"{{alertas_count}} {tr('jugadoras en zona roja')}",
+        },
+    }
+
+def resumen_tecnico_texto(wellness_prom: float, rpe_prom: float, ua_total: float,
+                          alertas_count: int, total_jugadoras: int, lang: str | None = None) -> str:
+    """Texto del resumen técnico del grupo (markdown), en el idioma indicado o el de la sesión."""
 
     # 🟢 Estado de bienestar (escala 25)
     estado_bienestar = (
-        t("óptimo") if wellness_prom > 20 else
-        t("moderado") if wellness_prom >= 15 else
-        t("en fatiga")
+        "óptimo" if wellness_prom > 20 else
+        "moderado" if wellness_prom >= 15 else
+        "en fatiga"
     )
 
     # 🟡 Nivel de esfuerzo percibido (RPE)
     if pd.isna(rpe_prom) or rpe_prom == 0:
-        nivel_rpe = t("sin datos")
+        nivel_rpe = "sin datos"
     elif rpe_prom < 5:
-        nivel_rpe = t("bajo")
+        nivel_rpe = "bajo"
     elif rpe_prom <= 7:
-        nivel_rpe = t("moderado")
+        nivel_rpe = "moderado"
     else:
-        nivel_rpe = t("alto")
+        nivel_rpe = "alto"
 
     # 🔴 Estado de alertas
     if alertas_count == 0:
-        estado_alertas = t("sin jugadoras en zona roja")
+        estado_alertas = "sin jugadoras en zona roja"
     elif alertas_count == 1:
-        estado_alertas = t("1 jugadora en seguimiento")
+        estado_alertas = "1 jugadora en seguimiento"
     else:
-        estado_alertas = f"{alertas_count} {t('jugadoras en zona roja')}"
+        estado_alertas = "jugadoras en zona roja"
 
-    # 🧾 Resumen técnico mostrado en Streamlit
-    st.markdown(
-        f":material/description: **{t('Resumen técnico')}:** "
-        f"{t('El grupo muestra un estado de bienestar')} **{estado_bienestar}** "
-        f"({wellness_prom}/25) "
-        f"{t('con un esfuerzo percibido')} **{nivel_rpe}** (RPE {rpe_prom}). "
-        f"{t('La carga interna total es de')} **{ua_total} UA** "
-        f"{t('y actualmente hay')} **{estado_alertas}**, "
-        f"{t('debido a que el promedio de bienestar x 5 es menor a 15 puntos')} "
-        f"{t('(escala 25)')}, "
-        f"{t('indicando fatiga, sobrecarga o molestias significativas que aumentan el riesgo de lesión o bajo rendimiento')}."
+    return render_narrative(
+        "resumen_tecnico_grupo",
+        valores={
+            "wellness_prom": wellness_prom, "rpe_prom": rpe_prom,
+            "ua_total": ua_total, "alertas_count": alertas_count,
+        },
+        etiquetas={
+            "estado_bienestar": estado_bienestar,
+            "nivel_rpe": nivel_rpe,
+            "estado_alertas": estado_alertas,
+        },
+        lang=lang,
     )
 
+def mostrar_resumen_tecnico(wellness_prom: float, rpe_prom: float, ua_total: float,
+                            alertas_count: int, total_jugadoras: int):
+    """
+    Muestra en pantalla el resumen técnico del grupo, con interpretación automática
+    del estado de bienestar, esfuerzo percibido y riesgo de alerta.
+    """
+    # 🧾 Resumen técnico mostrado en Streamlit
+    st.markdown(resumen_tecnico_texto(wellness_prom, rpe_prom, ua_total, alertas_count, total_jugadoras))
+
+
+_TEXTOS_INTERPRETACION = [
+    "Métrica", "Valor", "Interpretación",
+    "Índice de Bienestar Promedio", "RPE Promedio", "Carga Total (UA)", "Jugadoras en Zona Roja",
+    "🟢 Óptimo (>20): El grupo mantiene un estado físico y mental adecuado. ",
+    "🟡 Moderado (15-19): Existen signos leves de fatiga o estrés. ",
+    "🔴 Alerta (<15): El grupo muestra fatiga o malestar significativo. ",
+    "🟢 Controlado (<6): El esfuerzo percibido está dentro de los rangos esperados. ",
+    "🟡 Medio (6-7): Carga elevada, pero dentro de niveles aceptables. ",
+    "🔴 Alto (>7): Percepción de esfuerzo muy alta. ",
+    "🟢 Estable: La carga total se mantiene dentro de los márgenes planificados. ",
+    "🟡 Variación moderada (10-20%): Ajustes leves de carga detectados. ",
+    "🔴 Variación fuerte (>20%): Aumento o descenso brusco de la carga. ",
+    "🟢 Grupo estable: Ninguna jugadora muestra indicadores de riesgo. ",
+    "🟡 Seguimiento leve (<15%): Algunas jugadoras presentan fatiga o molestias leves. ",
+    "🔴 Riesgo elevado (>15%): Varios casos de fatiga o dolor detectados. ",
+    "Interpretación de las métricas",
+    "🟢 / 🔴 Los colores en los gráficos muestran *variaciones* respecto al periodo anterior "
+    "(🔺 sube, 🔻 baja). Los colores en la interpretación reflejan *niveles fisiológicos* "
+    "según umbrales deportivos.",
+]
+
+@narrative("interpretacion_metricas")
+def _compilar_interpretacion(tr):
+    # Sin plantilla: textos de tabla y encabezados ya traducidos
+    return {"textos": {texto: tr(texto, escape=False) for texto in _TEXTOS_INTERPRETACION}}
 
 def show_interpretation(wellness_prom, rpe_prom, ua_total, alertas_count, alertas_pct, delta_ua, total_jugadoras):
     # --- INTERPRETACIÓN VISUAL Y BRIEFING ---
+    e = compiled_narrative("interpretacion_metricas")["textos"]
 
     # === Generar tabla interpretativa ===
     interpretacion_data = [
         {
-            t("Métrica"): t("Índice de Bienestar Promedio"),
-            t("Valor"): f"{wellness_prom if not pd.isna(wellness_prom) else 0}/25",
-            t("Interpretación"): (
-                t("🟢 Óptimo (>20): El grupo mantiene un estado físico y mental adecuado. ") if wellness_prom > 20 else
-                t("🟡 Moderado (15-19): Existen signos leves de fatiga o estrés. ") if 15 <= wellness_prom <= 19 else
-                t("🔴 Alerta (<15): El grupo muestra fatiga o malestar significativo. ")
+            e["Métrica"]: e["Índice de Bienestar Promedio"],
+            e["Valor"]: f"{wellness_prom if not pd.isna(wellness_prom) else 0}/25",
+            e["Interpretación"]: (
+                e["🟢 Óptimo (>20): El grupo mantiene un estado físico y mental adecuado. "] if wellness_prom > 20 else
+                e["🟡 Moderado (15-19): Existen signos leves de fatiga o estrés. "] if 15 <= wellness_prom <= 19 else
+                e["🔴 Alerta (<15): El grupo muestra fatiga o malestar significativo. "]
             )
         },
         {
-            t("Métrica"): t("RPE Promedio"),
-            t("Valor"): f"{rpe_prom if not pd.isna(rpe_prom) else 0}",
-            t("Interpretación"): (
-                t("🟢 Controlado (<6): El esfuerzo percibido está dentro de los rangos esperados. ") if rpe_prom < 6 else
-                t("🟡 Medio (6-7): Carga elevada, pero dentro de niveles aceptables. ") if 6 <= rpe_prom <= 7 else
-                t("🔴 Alto (>7): Percepción de esfuerzo muy alta. ")
+            e["Métrica"]: e["RPE Promedio"],
+            e["Valor"]: f"{rpe_prom if not pd.isna(rpe_prom) else 0}",
+            e["Interpretación"]: (
+                e["🟢 Controlado (<6): El esfuerzo percibido está dentro de los rangos esperados. "] if rpe_prom < 6 else
+                e["🟡 Medio (6-7): Carga elevada, pero dentro de niveles aceptables. "] if 6 <= rpe_prom <= 7 else
+                e["🔴 Alto (>7): Percepción de esfuerzo muy alta. "]
             )
         },
         {
-            t("Métrica"): t("Carga Total (UA)"),
-            t("Valor"): f"{ua_total}",
-            t("Interpretación"): (
-                t("🟢 Estable: La carga total se mantiene dentro de los márgenes planificados. ") if abs(delta_ua) < 10 else
-                t("🟡 Variación moderada (10-20%): Ajustes leves de carga detectados. ") if 10 <= abs(delta_ua) <= 20 else
-                t("🔴 Variación fuerte (>20%): Aumento o descenso brusco de la carga. ")
+            e["Métrica"]: e["Carga Total (UA)"],
+            e["Valor"]: f"{ua_total}",
+            e["Interpretación"]: (
+                e["🟢 Estable: La carga total se mantiene dentro de los márgenes planificados. "] if abs(delta_ua) < 10 else
+                e["🟡 Variación moderada (10-20%): Ajustes leves de carga detectados. "] if 10 <= abs(delta_ua) <= 20 else
+                e["🔴 Variación fuerte (>20%): Aumento o descenso brusco de la carga. "]
             )
         },
         {
-            t("Métrica"): t("Jugadoras en Zona Roja"),
-            t("Valor"): f"{alertas_count}/{total_jugadoras} ({alertas_pct}%)",
-            t("Interpretación"): (
-                t("🟢 Grupo estable: Ninguna jugadora muestra indicadores de riesgo. ") if alertas_pct == 0 else
-                t("🟡 Seguimiento leve (<15%): Algunas jugadoras presentan fatiga o molestias leves. ") if alertas_pct <= 15 else
-                t("🔴 Riesgo elevado (>15%): Varios casos de fatiga o dolor detectados. ")
+            e["Métrica"]: e["Jugadoras en Zona Roja"],
+            e["Valor"]: f"{alertas_count}/{total_jugadoras} ({alertas_pct}%)",
+            e["Interpretación"]: (
+                e["🟢 Grupo estable: Ninguna jugadora muestra indicadores de riesgo. "] if alertas_pct == 0 else
+                e["🟡 Seguimiento leve (<15%): Algunas jugadoras presentan fatiga o molestias leves. "] if alertas_pct <= 15 else
+                e["🔴 Riesgo elevado (>15%): Varios casos de fatiga o dolor detectados. "]
             )
         }
     ]
 
-    with st.expander(t("Interpretación de las métricas")):
+    with st.expander(e["Interpretación de las métricas"]):
         df_interpretacion = pd.DataFrame(interpretacion_data)
-        df_interpretacion[t("Interpretación")] = df_interpretacion[t("Interpretación")].str.replace("\n", "<br>")
+        df_interpretacion[e["Interpretación"]] = df_interpretacion[e["Interpretación"]].str.replace("\n", "<br>")
         #st.markdown("**Interpretación de las métricas**")
         st.dataframe(df_interpretacion, hide_index=True)
 
-        st.caption(
-        t("🟢 / 🔴 Los colores en los gráficos muestran *variaciones* respecto al periodo anterior "
-        "(🔺 sube, 🔻 baja). Los colores en la interpretación reflejan *niveles fisiológicos* "
-        "según umbrales deportivos.")
-    )
+        st.caption(e[_TEXTOS_INTERPRETACION[-1]])
 
 
 # ============================================================
@@ -545,74 +601,75 @@ def generar_resumen_periodo(df: pd.DataFrame):
     #st.caption(t(":material/info: **Criterio de riesgo en la tabla:** una jugadora se considera *en riesgo* si el **promedio de bienestar (1-5x5) < 15 puntos** o si la variable **Dolor > 3**. Este criterio combina el **riesgo global** (fatiga / bienestar bajo) y el **riesgo localizado** (molestias o dolor elevado)."))
 
 
-def _filtrar_pendientes(df_periodo: pd.DataFrame, df_jugadoras: pd.DataFrame, tipo: str) -> pd.DataFrame:
+def compute_check_status(
+    df_registros: pd.DataFrame,
+    df_jugadoras: pd.DataFrame,
+    claves: list[str] | None = None,
+) -> pd.DataFrame:
     """
-    Devuelve las jugadoras que no han realizado un tipo de registro específico
-    (checkin o checkout) en el periodo seleccionado.
-
-    Lógica:
-        - Si una jugadora tiene checkout → se asume que también hizo checkin.
-        - Si tiene checkin pero no checkout → pendiente de checkout.
-        - Si no tiene ninguno → pendiente en ambos lados.
+    Estado de check-in / check-out de cada jugadora en una sola pasada.
 
     Parámetros:
-        df_periodo (pd.DataFrame): DataFrame de registros.
-        df_jugadoras (pd.DataFrame): Lista completa de jugadoras.
-        tipo (str): 'checkin' o 'checkout'.
+        df_registros: registros de wellness (columnas id_jugadora, tipo y las claves).
+        df_jugadoras: jugadoras a evaluar; puede incluir todos los planteles.
+        claves: columnas por las que separar el estado, p. ej.
+            ["fecha_sesion", "turno"]. Se evalúa cada jugadora en cada
+            combinación presente en los registros. Sin claves → todo el periodo.
 
     Retorna:
-        pd.DataFrame: Jugadoras pendientes, con columnas filtradas y ordenadas.
+        DataFrame con una fila por jugadora (y combinación de claves) y las
+        columnas de df_jugadoras más:
+            checkin, checkout       → tiene registro de ese tipo
+            pendiente_checkin       → sin ningún registro
+            pendiente_checkout      → sin check-out (un check-out implica check-in)
     """
-    tipo = tipo.lower().strip()
-
-    # --- Normalizar columna tipo ---
-    df_periodo = df_periodo.copy()
-    df_periodo["tipo"] = df_periodo["tipo"].astype(str).str.lower()
-
-    # --- IDs según tipo ---
-    ids_checkin = df_periodo[df_periodo["tipo"] == "checkin"]["id_jugadora"].unique()
-    ids_checkout = df_periodo[df_periodo["tipo"] == "checkout"]["id_jugadora"].unique()
-
-    # --- Lógica principal ---
-    if tipo == "checkin":
-        # Pendiente de checkin → jugadoras sin ningún registro
-        pendientes_ids = [jid for jid in df_jugadoras["id_jugadora"].unique()
-                          if jid not in ids_checkin and jid not in ids_checkout]
-    else:  # tipo == "checkout"
-        # Pendiente de checkout → jugadoras con checkin pero sin checkout
-        pendientes_ids = [jid for jid in df_jugadoras["id_jugadora"].unique()
-                          if jid in ids_checkin and jid not in ids_checkout
-                          or (jid not in ids_checkin and jid not in ids_checkout)]
-
-    # --- Filtrar jugadoras ---
-    pendientes = df_jugadoras[df_jugadoras["id_jugadora"].isin(pendientes_ids)].copy()
-
-    # --- Ordenar ---
-    pendientes = ordenar_df(pendientes, "nombre_jugadora")
-
-    # --- Seleccionar columnas finales ---
-    columnas_finales = ["id_jugadora", "nombre_jugadora", "posicion", "plantel"]
-    pendientes = pendientes[[c for c in columnas_finales if c in pendientes.columns]]
+    claves = list(claves or [])
+    jugadoras = df_jugadoras.drop_duplicates("id_jugadora")
+
+    if df_registros is None or df_registros.empty:
+        estado = jugadoras.assign(checkin=False, checkout=False)
+        if claves:
+            estado = estado.iloc[0:0].assign(**{c: pd.Series(dtype=object) for c in claves})
+    else:
+        tipo = df_registros["tipo"].astype(str).str.lower()
+        flags = (
+            pd.DataFrame({
+                "id_jugadora": df_registros["id_jugadora"].to_numpy(),
+                **{c: df_registros[c].to_numpy() for c in claves},
+                "checkin": (tipo == "checkin").to_numpy(),
+                "checkout": (tipo == "checkout").to_numpy(),
+            })
+            .groupby(["id_jugadora"] + claves, sort=False)[["checkin", "checkout"]]
+            .any()
+            .reset_index()
+        )
+
+        # Cada jugadora × cada combinación de claves observada
+        base = jugadoras
+        if claves:
+            base = jugadoras.merge(flags[claves].drop_duplicates(), how="cross")
+        estado = base.merge(flags, on=["id_jugadora"] + claves, how="left")
+        estado[["checkin", "checkout"]] = estado[["checkin", "checkout"]].fillna(False).astype(bool)
 
-    return pendientes
+    estado["pendiente_checkin"] = ~estado["checkin"] & ~estado["checkout"]
+    estado["pendiente_checkout"] = ~estado["checkout"]
+    return estado.reset_index(drop=True)
 
 def get_pendientes_check(df_periodo: pd.DataFrame, df_jugadoras: pd.DataFrame):
     """
     Devuelve dos DataFrames:
-    - Jugadoras sin check-in
-    - Jugadoras sin check-out
+    - Jugadoras sin check-in (sin ningún registro en el periodo)
+    - Jugadoras sin check-out (si tiene check-out se asume que hizo check-in)
     """
     if "id_jugadora" not in df_periodo.columns or "id_jugadora" not in df_jugadoras.columns:
         return pd.DataFrame(), pd.DataFrame()
 
-    #st.dataframe(df_periodo)
+    estado = compute_check_status(df_periodo, df_jugadoras)
 
-    df_periodo = df_periodo.copy()
-    # --- Normalizar columna tipo ---
-    df_periodo["tipo"] = df_periodo["tipo"].astype(str).str.lower()
+    columnas_finales = ["id_jugadora", "nombre_jugadora", "posicion", "plantel"]
+    columnas = [c for c in columnas_finales if c in estado.columns]
 
-    # --- Obtener pendientes con la función auxiliar ---
-    pendientes_in = _filtrar_pendientes(df_periodo, df_jugadoras, "checkin")
-    pendientes_out = _filtrar_pendientes(df_periodo, df_jugadoras, "checkout")
+    pendientes_in = ordenar_df(estado[estado["pendiente_checkin"]], "nombre_jugadora")[columnas]
+    pendientes_out = ordenar_df(estado[estado["pendiente_checkout"]], "nombre_jugadora")[columnas]
 
     return pendientes_in, pendientes_out
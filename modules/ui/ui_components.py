@@ -2,18 +2,30 @@ import pandas as pd
 import streamlit as st
 import datetime
 import json
+from typing import Callable
 from modules.util.key_builder import KeyBuilder
-from modules.util.records_util import resolver_jugadora_final
+from modules.auth_system.auth_config import get_secret
+from modules.util.absence_index import absences_between
+from modules.util.photo_cache import prefetch_photos
+from modules.util.records_util import build_check_index, expand_compact_records, ids_con_registro, resolver_jugadora_final
 from modules.util.util import get_date_range_input
 from modules.i18n.i18n import t
 from modules.schema import OPCIONES_TURNO
 
+# Precarga de fotos del plantel; se desactiva con [photos] prefetch = false
+PRECARGA_FOTOS = bool(get_secret("photos", "prefetch", True))
+
 from modules.util.key_builder import KeyBuilder
 
-def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd.DataFrame = None, modo: str = "registro") -> pd.DataFrame:
+def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd.DataFrame | Callable = None, modo: str = "registro", precargar_fotos: bool = False) -> pd.DataFrame:
     """
     Muestra los filtros principales (Competición, Jugadora, Turno, Tipo/Fechas)
     y retorna el DataFrame de registros filtrado según las selecciones.
+    records_df puede ser una función de carga (p. ej. get_records_db): se
+    llama con start, end, plantel e id_jugadora de la selección, así la
+    ventana y el plantel se filtran en la consulta y no en memoria.
+    Con precargar_fotos=True calienta en segundo plano las fotos del plantel
+    (solo la página que las muestra debe activarlo).
     """
 
     kb = KeyBuilder()
@@ -40,6 +52,10 @@ def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd
             codigo_comp = competicion["codigo"]
             jug_df_filtrado = jug_df[jug_df["plantel"] == codigo_comp]
 
+            # Calentar en segundo plano las fotos del plantel (informe individual)
+            if precargar_fotos and PRECARGA_FOTOS and "foto_url" in jug_df_filtrado.columns:
+                prefetch_photos(jug_df_filtrado["foto_url"].dropna().tolist())
+
             # Nombres estables (strings)
             jugadora_nombres = (
                 jug_df_filtrado["nombre_jugadora"]
@@ -120,6 +136,12 @@ def selection_header(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd
 
     if modo == "registro":
         return jugadora_opt, tipo, turno
+
+    if callable(records_df):
+        records_df = records_df(
+            start=start, end=end, plantel=competicion["codigo"],
+            id_jugadora=jugadora_opt["id_jugadora"] if jugadora_opt else None,
+        )
     
     # ==================================================
     # 🧮 FILTRADO DEL DATAFRAME
@@ -145,6 +167,7 @@ def filtrar_registros(
     tipo: str | None = None,
     start=None,
     end=None,
+    indice_ausencias: dict | None = None,
 ) -> pd.DataFrame:
     """
     Filtra el DataFrame de registros según los criterios seleccionados.
@@ -157,6 +180,8 @@ def filtrar_registros(
         tipo: string del tipo de registro (solo si modo="registros").
         start: fecha inicio (solo si modo="reporte").
         end: fecha fin (solo si modo="reporte").
+        indice_ausencias: índice de get_absence_index_db (solo si modo="ausencias");
+            el solapamiento se resuelve con él en lugar de recorrer las filas.
 
     Retorna:
         DataFrame filtrado.
@@ -165,7 +190,7 @@ def filtrar_registros(
     df_filtrado = records_df.copy()
 
     if df_filtrado.empty:
-        return df_filtrado
+        return expand_compact_records(df_filtrado)
 
     # -------------------------
     # Filtrar por jugadora
@@ -194,20 +219,23 @@ def filtrar_registros(
     # -------------------------
     elif (modo == "reporte" or modo == "reporte_grupal") and start and end:
 
-        # Normalizar tipos de fecha
-        if pd.api.types.is_datetime64_any_dtype(df_filtrado["fecha_sesion"]):
-            df_filtrado["fecha_sesion"] = df_filtrado["fecha_sesion"].dt.date
-
         # Normalizar start y end si vienen como Timestamp
         if hasattr(start, "to_pydatetime"):
             start = start.date()
         if hasattr(end, "to_pydatetime"):
             end = end.date()
 
-        df_filtrado = df_filtrado[
-            (df_filtrado["fecha_sesion"] >= start)
-            & (df_filtrado["fecha_sesion"] <= end)
-        ]
+        # Con fecha_sesion datetime64 (caché de registros) se compara en
+        # datetime64; las filas del rango vuelven a date al final
+        if pd.api.types.is_datetime64_any_dtype(df_filtrado["fecha_sesion"]):
+            df_filtrado = df_filtrado[
+                df_filtrado["fecha_sesion"].between(pd.Timestamp(start), pd.Timestamp(end))
+            ]
+        else:
+            df_filtrado = df_filtrado[
+                (df_filtrado["fecha_sesion"] >= start)
+                & (df_filtrado["fecha_sesion"] <= end)
+            ]
 
     # ===========================================================
     # MODO: AUSENCIAS (usa fecha_inicio y fecha_fin)
@@ -215,6 +243,10 @@ def filtrar_registros(
     # ===========================================================
     elif modo == "ausencias" and start and end:
 
+        if indice_ausencias is not None and "id" in df_filtrado.columns:
+            ids = absences_between(indice_ausencias, start, end)
+            return df_filtrado[df_filtrado["id"].isin(ids)]
+
         # Comprobar columnas esperadas
         if not {"fecha_inicio", "fecha_fin"}.issubset(df_filtrado.columns):
             return df_filtrado
@@ -237,7 +269,7 @@ def filtrar_registros(
             & (df_filtrado["fecha_fin"] >= start)
         ]
 
-    return df_filtrado
+    return expand_compact_records(df_filtrado)
 
 def get_checkins(records_df, turno: str, fecha):
     """Devuelve array de id_jugadora con CHECK-IN en la fecha y turno indicados."""
@@ -270,7 +302,12 @@ import datetime
 import pandas as pd
 import streamlit as st
 
-def selection_header_registro(jug_df: pd.DataFrame, comp_df: pd.DataFrame, records_df: pd.DataFrame = None):
+def selection_header_registro(
+    jug_df: pd.DataFrame,
+    comp_df: pd.DataFrame,
+    records_df: pd.DataFrame = None,
+    check_index: dict | None = None,
+):
     session_id = st.session_state["client_session_id"]
 
     col_tipo, col_turno, col_plantel, col_jugadora = st.columns([1.6, 1, 2, 2])
@@ -323,20 +360,19 @@ def selection_header_registro(jug_df: pd.DataFrame, comp_df: pd.DataFrame, recor
     with col_jugadora:
         jug_df_filtrado = jug_df[jug_df["plantel"] == codigo_comp].copy()
 
-        if records_df is not None and not records_df.empty:
-            df = records_df.copy()
-            df["tipo"] = df["tipo"].astype(str).str.lower()
-            df["turno"] = df["turno"].astype(str).str.lower()
+        if check_index is None and records_df is not None and not records_df.empty:
+            check_index = build_check_index(records_df)
 
+        if check_index:
             hoy = datetime.date.today()
-            checkins = get_checkins(df, turno, hoy)
-            checkouts = get_checkouts(df, turno, hoy)
+            checkins = ids_con_registro(check_index, hoy, "checkin", turno)
+            checkouts = ids_con_registro(check_index, hoy, "checkout", turno)
 
             if tipo.lower() == "check-in":
-                excluir = set(checkins).union(set(checkouts))
+                excluir = checkins | checkouts
                 jug_df_filtrado = jug_df_filtrado[~jug_df_filtrado["id_jugadora"].isin(excluir)]
             else:
-                mostrar = set(checkins) - set(checkouts)
+                mostrar = checkins - checkouts
                 jug_df_filtrado = jug_df_filtrado[jug_df_filtrado["id_jugadora"].isin(mostrar)]
 
         if jug_df_filtrado.empty:
@@ -0,0 +1,111 @@
+import datetime
+from bisect import bisect_right
+
+import pandas as pd
+
+# ============================================================
+#  🔹 ÍNDICE DE INTERVALOS DE AUSENCIAS
+# ============================================================
+# Las ausencias son intervalos cerrados [fecha_inicio, fecha_fin]. Se parten
+# en segmentos elementales entre fronteras consecutivas (inicio y fin + 1
+# día); cada segmento guarda las ausencias activas en él. Una consulta por
+# día es una búsqueda binaria y una por rango recorre solo los segmentos del
+# rango. Además se guardan, por jugadora, sus intervalos fusionados y
+# ordenados para responder "¿está ausente el día D?".
+
+_UN_DIA = datetime.timedelta(days=1)
+
+def _as_date(valor) -> datetime.date | None:
+    if valor is None or (not isinstance(valor, datetime.date) and pd.isna(valor)):
+        return None
+    if isinstance(valor, datetime.datetime):
+        return valor.date()
+    if isinstance(valor, datetime.date):
+        return valor
+    fecha = pd.to_datetime(valor, errors="coerce")
+    return None if pd.isna(fecha) else fecha.date()
+
+def _merge_intervals(intervalos: list[tuple]) -> tuple[list, list]:
+    """Fusiona intervalos solapados o contiguos → (inicios, fines) ordenados."""
+    inicios, fines = [], []
+    for inicio, fin in sorted(intervalos):
+        if fines and inicio <= fines[-1] + _UN_DIA:
+            fines[-1] = max(fines[-1], fin)
+        else:
+            inicios.append(inicio)
+            fines.append(fin)
+    return inicios, fines
+
+def build_absence_index(ausencias_df: pd.DataFrame) -> dict:
+    """
+    Construye el índice a partir del DataFrame de load_active_absences_db
+    (columnas id, id_jugadora, fecha_inicio, fecha_fin). Las filas sin
+    fechas válidas o con fin < inicio se ignoran.
+    """
+    indice = {"puntos": [], "activas": [], "jugadora": {}, "por_jugadora": {}}
+    if ausencias_df is None or ausencias_df.empty:
+        return indice
+
+    eventos = {}
+    intervalos = {}
+    for id_ausencia, id_jugadora, inicio, fin in zip(
+        ausencias_df["id"], ausencias_df["id_jugadora"],
+        ausencias_df["fecha_inicio"], ausencias_df["fecha_fin"],
+    ):
+        inicio, fin = _as_date(inicio), _as_date(fin)
+        if inicio is None or fin is None or fin < inicio:
+            continue
+        indice["jugadora"][id_ausencia] = id_jugadora
+        intervalos.setdefault(id_jugadora, []).append((inicio, fin))
+        eventos.setdefault(inicio, []).append((id_ausencia, True))
+        eventos.setdefault(fin + _UN_DIA, []).append((id_ausencia, False))
+
+    # Barrido: el conjunto activo cambia solo en las fronteras
+    activas = set()
+    for punto in sorted(eventos):
+        for id_ausencia, entra in eventos[punto]:
+            if entra:
+                activas.add(id_ausencia)
+            else:
+                activas.discard(id_ausencia)
+        indice["puntos"].append(punto)
+        indice["activas"].append(frozenset(activas))
+
+    indice["por_jugadora"] = {jug: _merge_intervals(iv) for jug, iv in intervalos.items()}
+    return indice
+
+def absences_between(indice: dict, start, end=None) -> frozenset:
+    """ids de las ausencias que solapan [start, end] (un solo día si end es None)."""
+    start = _as_date(start)
+    end = _as_date(end) if end is not None else start
+    puntos = indice["puntos"]
+    if start is None or end is None or end < start or not puntos:
+        return frozenset()
+
+    desde = bisect_right(puntos, start) - 1
+    hasta = bisect_right(puntos, end) - 1
+    if hasta < 0:
+        return frozenset()
+    desde = max(desde, 0)
+    if desde == hasta:
+        return indice["activas"][desde]
+
+    ids = set()
+    for activas in indice["activas"][desde:hasta + 1]:
+        ids |= activas
+    return frozenset(ids)
+
+def absent_players(indice: dict, start, end=None) -> set:
+    """Jugadoras con alguna ausencia en el día start (o en el rango [start, end])."""
+    jugadora = indice["jugadora"]
+    return {jugadora[id_ausencia] for id_ausencia in absences_between(indice, start, end)}
+
+def is_absent(indice: dict, id_jugadora, fecha) -> bool:
+    """True si la jugadora está ausente el día indicado."""
+    intervalos = indice["por_jugadora"].get(id_jugadora)
+    fecha = _as_date(fecha)
+    if not intervalos or fecha is None:
+        return False
+    inicios, fines = intervalos
+    i = bisect_right(inicios, fecha) - 1
+    return i >= 0 and fecha <= fines[i]
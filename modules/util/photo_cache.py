@@ -0,0 +1,260 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+import streamlit as st
+
+from modules.util.profiler import count
+from modules.util.util import clean_image_url
+
+try:
+    from PIL import Image
+except ImportError:  # Sin Pillow se guarda la imagen original, sin miniatura
+    Image = None
+
+# ============================================================
+#  🔹 CACHÉ DE FOTOS DE JUGADORAS (memoria + disco)
+# ============================================================
+# Clave: URL limpia (clean_image_url). Flujo de get_player_photo:
+#   memoria (LRU acotada en bytes) → disco (miniaturas ya redimensionadas)
+#   → descarga con timeout corto. Las URLs que fallan se recuerdan un rato
+#   (caché negativa) para no reintentar en cada rerun.
+
+_TIMEOUT_S = 3
+_MAX_MEMORIA = 32 * 1024 * 1024
+_TTL_DISCO_S = 7 * 24 * 3600
+_TTL_FALLO_S = 10 * 60
+_MAX_FALLOS = 1024
+_LADO_MINIATURA = 600  # se muestra a 300 px: 2x para pantallas densas
+_PRECARGA_WORKERS = 4
+
+_DIR_DISCO = Path(os.environ.get("WELLNESS_PHOTO_CACHE", Path(tempfile.gettempdir()) / "wellness_fotos"))
+
+@st.cache_resource(show_spinner=False)
+def _photo_store() -> dict:
+    """Estado compartido por todas las sesiones del proceso."""
+    return {
+        "lock": threading.Lock(),
+        "memoria": OrderedDict(),   # url → bytes de la miniatura
+        "bytes": 0,
+        "fallos": {},               # url → instante hasta el que no se reintenta (en orden de caducidad)
+        "descargas": {},            # url → lock (una sola descarga por URL)
+        "programadas": set(),       # urls en cola de precarga
+        "pool": ThreadPoolExecutor(max_workers=_PRECARGA_WORKERS, thread_name_prefix="fotos"),
+        "stats": {"memoria": 0, "disco": 0, "descargas": 0, "fallos": 0, "negativos": 0, "precargas": 0},
+    }
+
+def _ruta_disco(url: str) -> Path:
+    return _DIR_DISCO / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".img")
+
+def _guardar_memoria(store: dict, url: str, datos: bytes) -> None:
+    with store["lock"]:
+        memoria = store["memoria"]
+        previo = memoria.pop(url, None)
+        if previo is not None:
+            store["bytes"] -= len(previo)
+        memoria[url] = datos
+        store["bytes"] += len(datos)
+        while store["bytes"] > _MAX_MEMORIA and len(memoria) > 1:
+            _, expulsada = memoria.popitem(last=False)
+            store["bytes"] -= len(expulsada)
+
+def _marcar_fallo(store: dict, url: str) -> None:
+    """Caché negativa acotada: con el lock tomado, purga las entradas caducadas y las más antiguas."""
+    fallos = store["fallos"]
+    ahora = time.time()
+    fallos.pop(url, None)  # reinsertar al final: el dict queda ordenado por caducidad
+    fallos[url] = ahora + _TTL_FALLO_S
+    while fallos:
+        primera = next(iter(fallos))
+        if fallos[primera] > ahora and len(fallos) <= _MAX_FALLOS:
+            break
+        del fallos[primera]
+
+def _leer_memoria(store: dict, url: str) -> bytes | None:
+    with store["lock"]:
+        datos = store["memoria"].get(url)
+        if datos is not None:
+            store["memoria"].move_to_end(url)
+            store["stats"]["memoria"] += 1
+        return datos
+
+def _leer_disco(url: str) -> bytes | None:
+    ruta = _ruta_disco(url)
+    try:
+        if time.time() - ruta.stat().st_mtime > _TTL_DISCO_S:
+            return None
+        return ruta.read_bytes()
+    except OSError:
+        return None
+
+def _escribir_disco(url: str, datos: bytes) -> None:
+    """Escritura atómica (fichero temporal + rename); si falla, solo queda en memoria."""
+    try:
+        _DIR_DISCO.mkdir(parents=True, exist_ok=True)
+        ruta = _ruta_disco(url)
+        tmp = ruta.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(datos)
+        os.replace(tmp, ruta)
+    except OSError:
+        pass
+
+def make_thumbnail(datos: bytes, lado: int = _LADO_MINIATURA) -> bytes:
+    """Redimensiona manteniendo proporción (PNG si hay transparencia, JPEG si no)."""
+    if Image is None:
+        return datos
+
+    with Image.open(io.BytesIO(datos)) as img:
+        img.thumbnail((lado, lado))
+        salida = io.BytesIO()
+        if img.mode in ("RGBA", "LA", "P"):
+            img.save(salida, format="PNG", optimize=True)
+        else:
+            img.convert("RGB").save(salida, format="JPEG", quality=85, optimize=True)
+    return salida.getvalue()
+
+def _descargar(url: str) -> bytes | None:
+    try:
+        response = requests.get(url, timeout=_TIMEOUT_S)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+
+    if "image" not in response.headers.get("Content-Type", ""):
+        return None
+    try:
+        return make_thumbnail(response.content)
+    except (OSError, ValueError):
+        # Pillow no reconoce el formato
+        return None
+
+def get_player_photo(url: str) -> bytes | None:
+    """
+    Miniatura de la foto de una jugadora, o None si no hay foto disponible.
+
+    Nunca bloquea más de _TIMEOUT_S: las fotos ya vistas salen de memoria o
+    disco y las URLs que fallaron no se reintentan durante _TTL_FALLO_S.
+    """
+    url = clean_image_url(url)
+    if not url:
+        return None
+    return _obtener(_photo_store(), url)
+
+def _obtener(store: dict, url: str) -> bytes | None:
+    datos = _leer_memoria(store, url)
+    if datos is not None:
+        count("fotos_hit")
+        return datos
+
+    with store["lock"]:
+        if store["fallos"].get(url, 0) > time.time():
+            store["stats"]["negativos"] += 1
+            return None
+        lock_url = store["descargas"].setdefault(url, threading.Lock())
+
+    # Una sola descarga por URL: el resto espera y reutiliza el resultado
+    try:
+        with lock_url:
+            return _cargar(store, url)
+    finally:
+        with store["lock"]:
+            store["descargas"].pop(url, None)
+
+def _cargar(store: dict, url: str) -> bytes | None:
+    """Memoria → disco → descarga, con el lock de la URL ya tomado."""
+    datos = _leer_memoria(store, url)
+    if datos is not None:
+        return datos
+    with store["lock"]:
+        # Otro hilo pudo fallar con esta URL mientras esperábamos
+        if store["fallos"].get(url, 0) > time.time():
+            return None
+
+    datos = _leer_disco(url)
+    if datos is not None:
+        count("fotos_hit")
+        with store["lock"]:
+            store["stats"]["disco"] += 1
+    else:
+        count("fotos_miss")
+        datos = _descargar(url)
+        with store["lock"]:
+            store["stats"]["descargas"] += 1
+            if datos is None:
+                store["stats"]["fallos"] += 1
+                _marcar_fallo(store, url)
+        if datos is None:
+            return None
+        _escribir_disco(url, datos)
+
+    _guardar_memoria(store, url, datos)
+    return datos
+
+# ============================================================
+#  🔹 PRECARGA EN SEGUNDO PLANO
+# ============================================================
+
+def _precargar(store: dict, url: str) -> None:
+    try:
+        _obtener(store, url)
+    finally:
+        with store["lock"]:
+            store["programadas"].discard(url)
+
+def prefetch_photos(urls) -> int:
+    """
+    Encola en segundo plano la descarga de las fotos indicadas (p. ej. las
+    de un plantel) para que luego get_player_photo las sirva desde caché.
+    No bloquea: omite las que ya están en memoria, en cola o marcadas como
+    fallidas. Devuelve cuántas se han encolado.
+    """
+    store = _photo_store()
+    ahora = time.time()
+    nuevas = []
+    with store["lock"]:
+        for url in urls:
+            url = clean_image_url(url) if isinstance(url, str) else ""
+            if (
+                not url.startswith("http")
+                or url in store["memoria"]
+                or url in store["programadas"]
+                or store["fallos"].get(url, 0) > ahora
+            ):
+                continue
+            store["programadas"].add(url)
+            nuevas.append(url)
+        store["stats"]["precargas"] += len(nuevas)
+
+    for url in nuevas:
+        store["pool"].submit(_precargar, store, url)
+    return len(nuevas)
+
+def get_photo_cache_stats() -> dict:
+    """Aciertos por nivel, descargas y ocupación de la caché en memoria."""
+    store = _photo_store()
+    with store["lock"]:
+        return {
+            **store["stats"],
+            "en_memoria": len(store["memoria"]),
+            "en_cola": len(store["programadas"]),
+            "bytes_memoria": store["bytes"],
+            "urls_fallidas": sum(1 for hasta in store["fallos"].values() if hasta > time.time()),
+        }
+
+def clear_photo_cache(disco: bool = False) -> None:
+    """Vacía la caché en memoria y la negativa (y las miniaturas en disco si disco=True)."""
+    store = _photo_store()
+    with store["lock"]:
+        store["memoria"].clear()
+        store["bytes"] = 0
+        store["fallos"].clear()
+    if disco and _DIR_DISCO.exists():
+        for ruta in _DIR_DISCO.glob("*.img"):
+            ruta.unlink(missing_ok=True)
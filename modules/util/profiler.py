@@ -0,0 +1,222 @@
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# ============================================================
+#  🔹 PERFILADO POR RERUN (solo developer)
+# ============================================================
+# Con el modo activado desde la página developer, cada rerun guarda:
+#
+#   - secciones: bloques `with section("..."):` de la página, con su tiempo
+#     (las anidadas se muestran sangradas dentro de su padre)
+#   - contadores por sección: consultas SQL y su duración (db_query_stats),
+#     aciertos/fallos de la caché de registros y de la de fotos
+#   - opcional: un volcado cProfile del hilo del script en _DIR_PERFILES
+#
+# init_config abre el perfil de cada rerun y render_profile lo muestra al
+# final de la página; las páginas lo llaman también antes de cada st.stop().
+# Si un rerun se corta sin llegar (excepción, st.rerun), el perfil queda en
+# el historial de la página developer como incompleto. Desactivado, el
+# coste es una búsqueda en session_state por sección.
+
+_CLAVE_ACTIVO = "perfilado"
+_CLAVE_CPROFILE = "perfilado_cprofile"
+_CLAVE_RUN = "_perfil_run"
+_CLAVE_HISTORIAL = "perfiles"
+_MAX_HISTORIAL = 20
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+_DIR_PERFILES = Path(os.environ.get("WELLNESS_PROFILE_DIR", Path(tempfile.gettempdir()) / "wellness_perfiles"))
+
+# Los contadores llegan también de los hilos de load_page_data
+_lock = threading.Lock()
+
+def profiling_enabled() -> bool:
+    """True si la sesión es developer y tiene el modo perfilado activo."""
+    try:
+        return bool(st.session_state.get(_CLAVE_ACTIVO)) and st.session_state["auth"]["rol"].lower() == "developer"
+    except (KeyError, AttributeError):
+        return False
+
+def set_profiling(activo: bool, cprofile: bool = False) -> None:
+    st.session_state[_CLAVE_ACTIVO] = bool(activo)
+    st.session_state[_CLAVE_CPROFILE] = bool(activo and cprofile)
+
+def call_site(excluir: str | None = None) -> tuple[str, str]:
+    """
+    Devuelve (origen, página) de la llamada en curso: la primera función del
+    proyecto fuera del directorio `excluir` y el script de página
+    (pages/*.py o app.py) que está en la pila.
+    """
+    origen, pagina = "-", "-"
+    frame = sys._getframe(1)
+    while frame is not None:
+        fichero = os.path.abspath(frame.f_code.co_filename)
+        if fichero.startswith(_ROOT):
+            rel = os.path.relpath(fichero, _ROOT)
+            if origen == "-" and not (excluir and fichero.startswith(excluir)):
+                origen = f"{rel}:{frame.f_code.co_name}"
+            if rel.startswith("pages" + os.sep) or rel == "app.py":
+                pagina = rel
+        frame = frame.f_back
+    return origen, pagina
+
+def _run_activo() -> dict | None:
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(_CLAVE_RUN)
+
+def start_profile() -> None:
+    """
+    Abre el perfil del rerun (lo llama init_config). También cierra el del
+    rerun anterior si no llegó a render_profile, para que su cProfile no
+    siga activo en el hilo del script.
+    """
+    anterior = st.session_state.get(_CLAVE_RUN)
+    if anterior is not None:
+        _cerrar(anterior, completo=False)
+
+    if not profiling_enabled():
+        return
+
+    raiz = {"nombre": "total", "nivel": -1, "segundos": 0.0, "contadores": {}}
+    run = {
+        "pagina": call_site()[1],
+        "momento": datetime.datetime.now().strftime("%H:%M:%S"),
+        "inicio": time.perf_counter(),
+        "secciones": [],
+        "pila": [raiz],
+        "raiz": raiz,
+        "cprofile": None,
+    }
+    if st.session_state.get(_CLAVE_CPROFILE):
+        run["cprofile"] = cProfile.Profile()
+        run["cprofile"].enable()
+    st.session_state[_CLAVE_RUN] = run
+
+@contextmanager
+def section(nombre: str):
+    """Mide un bloque de la página; sin perfil activo no hace nada."""
+    run = _run_activo()
+    if run is None:
+        yield
+        return
+
+    seccion = {"nombre": nombre, "nivel": len(run["pila"]) - 1, "segundos": 0.0, "contadores": {}}
+    with _lock:
+        run["secciones"].append(seccion)
+        run["pila"].append(seccion)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        seccion["segundos"] = time.perf_counter() - inicio
+        with _lock:
+            if run["pila"] and run["pila"][-1] is seccion:
+                run["pila"].pop()
+
+def count(evento: str, n: float = 1) -> None:
+    """Suma n al contador `evento` de la sección abierta del rerun en curso."""
+    run = _run_activo()
+    if run is None:
+        return
+    with _lock:
+        contadores = run["pila"][-1]["contadores"]
+        contadores[evento] = contadores.get(evento, 0) + n
+
+# ============================================================
+#  🔹 CIERRE Y DESGLOSE
+# ============================================================
+
+def _cerrar(run: dict, completo: bool) -> dict:
+    """Detiene el cProfile, lo vuelca a disco y pasa el resumen al historial."""
+    st.session_state[_CLAVE_RUN] = None
+    total = time.perf_counter() - run["inicio"]
+
+    ruta, top = None, None
+    perfil = run.get("cprofile")
+    if perfil is not None:
+        perfil.disable()
+        try:
+            _DIR_PERFILES.mkdir(parents=True, exist_ok=True)
+            nombre = f"{Path(run['pagina']).stem}_{datetime.datetime.now():%Y%m%d_%H%M%S}.prof"
+            ruta = _DIR_PERFILES / nombre
+            perfil.dump_stats(ruta)
+        except OSError:
+            ruta = None
+        salida = io.StringIO()
+        pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(25)
+        top = salida.getvalue()
+
+    contadores = {}
+    for seccion in [run["raiz"], *run["secciones"]]:
+        for evento, n in seccion["contadores"].items():
+            contadores[evento] = contadores.get(evento, 0) + n
+
+    resumen = {
+        "pagina": run["pagina"],
+        "momento": run["momento"],
+        "total_ms": round(total * 1000, 1),
+        "secciones": len(run["secciones"]),
+        "consultas": int(contadores.get("consultas", 0)),
+        "sql_ms": round(contadores.get("sql_s", 0) * 1000, 1),
+        "completo": completo,
+        "cprofile": str(ruta) if ruta else "",
+    }
+    historial = st.session_state.setdefault(_CLAVE_HISTORIAL, [])
+    historial.append(resumen)
+    del historial[:-_MAX_HISTORIAL]
+
+    return {"total": total, "ruta": ruta, "top": top, "resumen": resumen}
+
+def _tabla(run: dict, total: float) -> pd.DataFrame:
+    filas = []
+    for seccion in [*run["secciones"], {**run["raiz"], "nombre": "(fuera de secciones)", "nivel": 0}]:
+        c = seccion["contadores"]
+        filas.append({
+            "sección": "\u2003" * seccion["nivel"] + seccion["nombre"],  # sangría visible en la tabla
+            "ms": round(seccion["segundos"] * 1000, 1),
+            "% rerun": round(seccion["segundos"] / total * 100, 1) if total else 0.0,
+            "consultas": int(c.get("consultas", 0)),
+            "sql ms": round(c.get("sql_s", 0) * 1000, 1),
+            "registros hit/miss": f"{int(c.get('registros_hit', 0))}/{int(c.get('registros_miss', 0))}",
+            "fotos hit/miss": f"{int(c.get('fotos_hit', 0))}/{int(c.get('fotos_miss', 0))}",
+        })
+    # El tiempo fuera de secciones es el resto del rerun
+    medido = sum(s["segundos"] for s in run["secciones"] if s["nivel"] == 0)
+    filas[-1]["ms"] = round(max(total - medido, 0) * 1000, 1)
+    filas[-1]["% rerun"] = round(max(total - medido, 0) / total * 100, 1) if total else 0.0
+    return pd.DataFrame(filas)
+
+def render_profile() -> None:
+    """Desglose plegable del rerun al final de la página (si el perfil está activo)."""
+    run = _run_activo()
+    if run is None:
+        return
+
+    cierre = _cerrar(run, completo=True)
+    total = cierre["total"]
+
+    with st.expander(f":material/speed: Perfil del rerun · {total * 1000:.0f} ms · "
+                     f"{cierre['resumen']['consultas']} consultas", expanded=False):
+        st.dataframe(_tabla(run, total), hide_index=True)
+        if cierre["ruta"] is not None:
+            st.caption(f"cProfile: `{cierre['ruta']}` (snakeviz / pstats)")
+        if cierre["top"]:
+            st.code(cierre["top"], language="text")
+
+def profile_history() -> pd.DataFrame:
+    """Últimos perfiles de la sesión (más recientes primero)."""
+    return pd.DataFrame(st.session_state.get(_CLAVE_HISTORIAL, [])[::-1])
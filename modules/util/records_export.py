@@ -0,0 +1,106 @@
+import json
+import tempfile
+from typing import Callable, Iterable
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Dependencia opcional: solo hace falta para Parquet
+    pa = pq = None
+
+# ============================================================
+#  🔹 EXPORTACIÓN POR BLOQUES (CSV, JSON, PARQUET)
+# ============================================================
+# Los botones de descarga reciben un callable: el fichero solo se genera
+# cuando alguien pulsa el botón y se escribe bloque a bloque en un fichero
+# temporal (en memoria hasta _MAX_MEMORIA, después en disco). Así la
+# consulta y la conversión no cargan todo el histórico a la vez, pero
+# Streamlit lee el resultado completo a bytes en su almacén de ficheros:
+# la descarga ocupa en memoria el tamaño del fichero exportado.
+
+_MAX_MEMORIA = 8 * 1024 * 1024
+
+# Tipos fijos para Parquet: todos los bloques deben compartir esquema,
+# aunque en alguno una columna venga entera a NULL.
+_COLS_NUMERICAS = [
+    "id", "recuperacion", "energia", "sueno", "stress", "dolor",
+    "minutos_sesion", "rpe", "ua", "en_periodo",
+]
+_COLS_FECHA = ["fecha_sesion", "fecha_hora_registro"]
+
+PARQUET_DISPONIBLE = pq is not None
+
+def _spooled():
+    return tempfile.SpooledTemporaryFile(max_size=_MAX_MEMORIA, mode="w+b")
+
+def write_csv(chunks: Iterable[pd.DataFrame]):
+    """CSV con cabecera solo en el primer bloque."""
+    out = _spooled()
+    cabecera = True
+    for df in chunks:
+        out.write(df.to_csv(index=False, header=cabecera).encode("utf-8"))
+        cabecera = False
+    out.seek(0)
+    return out
+
+def write_json(chunks: Iterable[pd.DataFrame]):
+    """Array JSON de registros, concatenando los bloques sin cargarlos juntos."""
+    out = _spooled()
+    out.write(b"[")
+    primero = True
+    for df in chunks:
+        if df.empty:
+            continue
+        cuerpo = df.to_json(orient="records", force_ascii=False, date_format="iso")[1:-1]
+        out.write((("" if primero else ",\n") + cuerpo).encode("utf-8"))
+        primero = False
+    out.write(b"]")
+    out.seek(0)
+    return out
+
+def _parquet_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for col in df.columns:
+        if col in _COLS_NUMERICAS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        elif col in _COLS_FECHA:
+            df[col] = pd.to_datetime(df[col], errors="coerce").astype("datetime64[us]")
+        else:
+            df[col] = df[col].map(
+                lambda v: None if v is None or (not isinstance(v, list) and pd.isna(v))
+                else json.dumps(v, ensure_ascii=False) if isinstance(v, list)
+                else str(v)
+            ).astype("string")
+    return df
+
+def write_parquet(chunks: Iterable[pd.DataFrame]):
+    """Parquet con un row group por bloque (requiere pyarrow)."""
+    if pq is None:
+        raise ImportError("Para exportar a Parquet instala pyarrow (pip install pyarrow).")
+
+    out = _spooled()
+    writer = None
+    try:
+        for df in chunks:
+            tabla = pa.Table.from_pandas(_parquet_frame(df), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, tabla.schema)
+            writer.write_table(tabla.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pq.write_table(pa.table({}), out)
+    out.seek(0)
+    return out
+
+def lazy_export(writer: Callable, chunks_factory: Callable[[], Iterable[pd.DataFrame]]) -> Callable:
+    """
+    Callable sin argumentos para st.download_button(data=...), que acepta
+    callables desde Streamlit 1.52: la consulta y la escritura solo se
+    ejecutan al pulsar el botón. No acota la memoria de la descarga (ver
+    la cabecera del módulo).
+    """
+    return lambda: writer(chunks_factory())
@@ -0,0 +1,230 @@
+import csv
+import datetime
+import unicodedata
+import zipfile
+from typing import Iterator
+
+import pandas as pd
+
+from modules.schema import new_base_record
+from modules.ui.check_in_ui import validate_checkin
+from modules.ui.check_out_ui import validate_checkout
+
+try:
+    import openpyxl
+except ImportError:  # Dependencia opcional: solo hace falta para .xlsx
+    openpyxl = None
+
+# ============================================================
+#  🔹 IMPORTACIÓN MASIVA DE WELLNESS / RPE (CSV, XLSX)
+# ============================================================
+# Flujo: lectura por bloques → normalización de columnas → jugadora por id
+# o nombre → validación (mismas reglas que los formularios) → UA → lotes
+# para db_records.upsert_records_db.
+
+CHUNK_SIZE = 1000
+
+# Errores al leer el fichero: CSV mal formado, sin delimitador reconocible o
+# en otra codificación; xlsx corrupto; openpyxl sin instalar
+READ_ERRORS = (ImportError, ValueError, UnicodeDecodeError, csv.Error, zipfile.BadZipFile, pd.errors.ParserError)
+
+# Alias admitidos en la cabecera del fichero → columna interna
+_ALIAS_COLUMNAS = {
+    "identificacion": "id_jugadora",
+    "id": "id_jugadora",
+    "jugadora": "nombre_jugadora",
+    "nombre": "nombre_jugadora",
+    "fecha": "fecha_sesion",
+    "energia": "fatiga",
+    "estres": "stress",
+    "minutos": "minutos_sesion",
+    "zona_segmento": "id_zona_segmento_dolor",
+    "lateralidad_dolor": "lateralidad",
+}
+
+_CHECKIN_FIELDS = ["recuperacion", "fatiga", "sueno", "stress", "dolor"]
+_CHECKOUT_FIELDS = ["minutos_sesion", "rpe"]
+_OPCIONALES = [
+    "periodizacion_tactica", "id_tipo_carga", "id_tipo_readaptacion", "id_tipo_condicion",
+    "id_zona_segmento_dolor", "lateralidad", "en_periodo", "observacion",
+]
+
+def _normalize_text(valor) -> str:
+    """Mayúsculas, sin tildes y con espacios compactados (para casar nombres)."""
+    texto = unicodedata.normalize("NFKD", str(valor)).encode("ascii", "ignore").decode()
+    return " ".join(texto.upper().split())
+
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    columnas = {}
+    for col in df.columns:
+        nombre = _normalize_text(col).lower().replace(" ", "_")
+        columnas[col] = _ALIAS_COLUMNAS.get(nombre, nombre)
+    return df.rename(columns=columnas)
+
+# ============================================================
+#  🔹 LECTURA POR BLOQUES
+# ============================================================
+
+def read_chunks(file, filename: str, chunksize: int = CHUNK_SIZE) -> Iterator[tuple[pd.DataFrame, float]]:
+    """
+    Lee un CSV o XLSX por bloques sin cargarlo entero en memoria.
+    Devuelve (bloque, fracción leída 0-1) para informar del progreso.
+    """
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        yield from _read_xlsx_chunks(file, chunksize)
+        return
+
+    total = getattr(file, "size", None)
+    lector = pd.read_csv(file, chunksize=chunksize, sep=None, engine="python", dtype=str)
+    leidas = 0
+    for bloque in lector:
+        leidas += len(bloque)
+        if total:
+            fraccion = min(file.tell() / total, 1.0)
+        else:
+            fraccion = 0.0
+        yield _normalize_columns(bloque), fraccion
+
+def _read_xlsx_chunks(file, chunksize: int) -> Iterator[tuple[pd.DataFrame, float]]:
+    if openpyxl is None:
+        raise ImportError("Para importar ficheros .xlsx instala openpyxl (pip install openpyxl).")
+
+    libro = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        hoja = libro.active
+        filas = hoja.iter_rows(values_only=True)
+        cabecera = [str(c) if c is not None else "" for c in next(filas, [])]
+        total = max((hoja.max_row or 1) - 1, 1)
+
+        bloque, leidas = [], 0
+        for fila in filas:
+            if all(v is None for v in fila):
+                continue
+            bloque.append(fila)
+            if len(bloque) == chunksize:
+                leidas += len(bloque)
+                yield _normalize_columns(pd.DataFrame(bloque, columns=cabecera)), min(leidas / total, 1.0)
+                bloque = []
+        if bloque:
+            yield _normalize_columns(pd.DataFrame(bloque, columns=cabecera)), 1.0
+    finally:
+        libro.close()
+
+# ============================================================
+#  🔹 PREPARACIÓN Y VALIDACIÓN DE UN BLOQUE
+# ============================================================
+
+def build_player_index(jug_df: pd.DataFrame) -> dict[str, str]:
+    """Índice {id o nombre normalizado → id_jugadora} a partir de load_players_db."""
+    indice = {}
+    if jug_df is None or jug_df.empty:
+        return indice
+    for id_jugadora, nombre in zip(jug_df["id_jugadora"].astype(str), jug_df["nombre_jugadora"]):
+        indice[_normalize_text(id_jugadora)] = id_jugadora
+        indice[_normalize_text(nombre)] = id_jugadora
+    return indice
+
+def _parse_turno(valor) -> str | None:
+    texto = _normalize_text(valor)
+    numero = texto.replace("TURNO", "").strip()
+    return f"Turno {numero}" if numero in {"1", "2", "3"} else None
+
+def _parse_fecha(valor) -> datetime.date | None:
+    fecha = pd.to_datetime(valor, errors="coerce", dayfirst=isinstance(valor, str) and "/" in valor)
+    return None if pd.isna(fecha) else fecha.date()
+
+def _to_number(valor):
+    """Número o None (vacíos, NaN y textos no numéricos)."""
+    numero = pd.to_numeric(pd.Series([valor]), errors="coerce").iloc[0]
+    if pd.isna(numero):
+        return None
+    return int(numero) if float(numero).is_integer() else float(numero)
+
+def _has_values(fila: dict, campos: list[str]) -> bool:
+    return any(_to_number(fila.get(c)) is not None for c in campos)
+
+def prepare_chunk(
+    bloque: pd.DataFrame,
+    jugadoras: dict[str, str],
+    usuario: str,
+    primera_fila: int = 2,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """
+    Convierte un bloque del fichero en registros listos para upsert_records_db.
+
+    Cada fila puede traer check-in (wellness 1-5), check-out (minutos y RPE)
+    o ambos; si trae 'tipo' solo se usa esa parte. La UA se calcula como
+    RPE × minutos, igual que el formulario.
+
+    Retorna (checkins, checkouts, errores) con errores = [{"fila", "error"}].
+    """
+    checkins, checkouts, errores = [], [], []
+    filas = bloque.astype(object).where(bloque.notna(), None).to_dict("records")
+
+    for n, fila in enumerate(filas, start=primera_fila):
+        clave = fila.get("id_jugadora") or fila.get("nombre_jugadora")
+        id_jugadora = jugadoras.get(_normalize_text(clave)) if clave is not None else None
+        if id_jugadora is None:
+            errores.append({"fila": n, "error": f"Jugadora no encontrada: {clave}"})
+            continue
+
+        fecha = _parse_fecha(fila.get("fecha_sesion"))
+        if fecha is None:
+            errores.append({"fila": n, "error": f"Fecha no válida: {fila.get('fecha_sesion')}"})
+            continue
+
+        turno = _parse_turno(fila.get("turno"))
+        if turno is None:
+            errores.append({"fila": n, "error": f"Turno no válido: {fila.get('turno')}"})
+            continue
+
+        tipo = _normalize_text(fila.get("tipo") or "").replace("-", "").replace(" ", "")
+        quiere_checkin = tipo == "CHECKIN" or (not tipo and _has_values(fila, _CHECKIN_FIELDS))
+        quiere_checkout = tipo == "CHECKOUT" or (not tipo and _has_values(fila, _CHECKOUT_FIELDS))
+        if not (quiere_checkin or quiere_checkout):
+            errores.append({"fila": n, "error": "Sin datos de check-in ni de check-out."})
+            continue
+
+        record = new_base_record(id_jugadora=id_jugadora, username=usuario, tipo="checkin")
+        record.update({
+            "fecha_sesion": fecha,
+            "turno": turno,
+            "periodizacion_tactica": None,
+            "id_tipo_carga": None,
+            "id_tipo_condicion": None,
+            "id_tipo_readaptacion": None,
+            "zonas_anatomicas_dolor": None,
+            "observacion": None,
+        })
+        for campo in _OPCIONALES:
+            if fila.get(campo) is not None:
+                record[campo] = fila[campo]
+        if record["id_zona_segmento_dolor"] is not None:
+            record["id_zona_segmento_dolor"] = _to_number(record["id_zona_segmento_dolor"])
+        record["en_periodo"] = _normalize_text(record["en_periodo"]) in {"1", "TRUE", "SI", "S", "YES"}
+        for campo in _CHECKIN_FIELDS + _CHECKOUT_FIELDS:
+            record[campo] = _to_number(fila.get(campo))
+
+        try:
+            if quiere_checkin:
+                ok, msg = validate_checkin(record)
+                if not ok:
+                    errores.append({"fila": n, "error": msg})
+                    continue
+            if quiere_checkout:
+                minutos, rpe = record["minutos_sesion"], record["rpe"]
+                record["ua"] = int(rpe * minutos) if minutos and rpe and minutos > 0 and rpe > 0 else None
+                ok, msg = validate_checkout(record)
+                if not ok:
+                    errores.append({"fila": n, "error": msg})
+                    continue
+        except (TypeError, ValueError) as e:
+            errores.append({"fila": n, "error": f"Valor no válido: {e}"})
+            continue
+
+        if quiere_checkin:
+            checkins.append(record)
+        if quiere_checkout:
+            checkouts.append(record)
+
+    return checkins, checkouts, errores
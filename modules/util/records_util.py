@@ -1,4 +1,5 @@
 import streamlit as st
+import pandas as pd
 
 # def resolver_jugadora_final(jugadora_header, jug_df_filtrado, jug_df, tipo):
 
@@ -103,3 +104,87 @@ def resolver_jugadora_final(jugadora_header, jug_df_filtrado, jug_df, tipo, ctx_
         st.stop()
 
     return rows.iloc[0].to_dict()
+
+# ============================================================
+#  🔹 ÍNDICE DE CUMPLIMIENTO POR SESIÓN (fecha, turno, tipo)
+# ============================================================
+# {(fecha_sesion, turno, tipo) → frozenset(id_jugadora)} con turno y tipo en
+# minúsculas. Se construye una vez por carga de registros y después solo se
+# amplía con las filas nuevas; los conjuntos son inmutables para que otras
+# sesiones puedan leerlos mientras se actualizan.
+
+def _check_key(fecha, turno, tipo) -> tuple:
+    return (fecha, str(turno).lower(), str(tipo).lower())
+
+def build_check_index(records_df) -> dict[tuple, frozenset]:
+    """Índice de jugadoras con registro por (fecha_sesion, turno, tipo)."""
+    if records_df is None or records_df.empty:
+        return {}
+    return update_check_index({}, records_df)
+
+def update_check_index(indice: dict, records_df) -> dict:
+    """
+    Devuelve un índice nuevo con las filas de records_df añadidas. Solo se
+    copian los conjuntos de las claves afectadas.
+    """
+    if records_df is None or records_df.empty:
+        return indice
+
+    # Las claves son date aunque la caché guarde fecha_sesion como datetime64
+    fechas = records_df["fecha_sesion"]
+    if pd.api.types.is_datetime64_any_dtype(fechas):
+        fechas = fechas.dt.date
+
+    nuevos = {}
+    for fecha, turno, tipo, id_jugadora in zip(
+        fechas, records_df["turno"], records_df["tipo"], records_df["id_jugadora"]
+    ):
+        nuevos.setdefault(_check_key(fecha, turno, tipo), set()).add(id_jugadora)
+
+    indice = dict(indice)
+    for clave, ids in nuevos.items():
+        indice[clave] = indice.get(clave, frozenset()) | ids
+    return indice
+
+def ids_con_registro(indice: dict, fecha, tipo: str, turno: str | None = None) -> frozenset:
+    """Jugadoras con registro del tipo indicado en la fecha (y turno, si se indica)."""
+    if turno is not None:
+        return indice.get(_check_key(fecha, turno, tipo), frozenset())
+
+    tipo = str(tipo).lower()
+    ids = set()
+    for (f, _turno, t), jugadoras in indice.items():
+        if f == fecha and t == tipo:
+            ids |= jugadoras
+    return frozenset(ids)
+
+# ============================================================
+#  🔹 TIPOS DE CÁLCULO DE LOS REGISTROS
+# ============================================================
+# La caché de registros guarda el texto repetido como category, las escalas
+# como Int8 (nulos pd.NA) y fecha_sesion como datetime64 (ver
+# db_records._compact_records). Los informes agrupan por jugadora, calculan
+# con NaN y comparan con fechas date, así que las filas ya filtradas vuelven
+# a los tipos de siempre. Las category conservan todas las categorías de la
+# caché y con pandas 2.x groupby (observed=False) emitiría una fila por cada
+# una, también por las jugadoras que no están en el subconjunto.
+
+def expand_compact_records(records_df):
+    """
+    category → texto, escalas Int8 → float64 y fecha_sesion datetime64 → date.
+    Modifica records_df: se llama sobre copias.
+    """
+    if records_df is None:
+        return records_df
+
+    for col in records_df.columns:
+        dtype = records_df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            records_df[col] = records_df[col].astype(dtype.categories.dtype)
+        elif isinstance(dtype, pd.Int8Dtype):
+            records_df[col] = records_df[col].astype("float64")
+
+    if "fecha_sesion" in records_df.columns and pd.api.types.is_datetime64_any_dtype(records_df["fecha_sesion"]):
+        records_df["fecha_sesion"] = records_df["fecha_sesion"].dt.date
+
+    return records_df
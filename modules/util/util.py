@@ -12,6 +12,8 @@ from datetime import date, timedelta
 import re
 import base64
 
+from modules.util.records_util import expand_compact_records
+
 def normalize_text(s):
     """Limpia texto eliminando tildes, espacios invisibles y normalizando Unicode."""
     if not isinstance(s, str):
@@ -44,7 +46,7 @@ def right_caption(text: str):
 
 def data_format(df: pd.DataFrame):
     # 1. Filtrar garantizando copia
-    df = df[df["plantel"] == "1FF"].copy()
+    df = expand_compact_records(df[df["plantel"] == "1FF"].copy())
 
     # 2. Conversión segura a datetime
     df["fecha_sesion"] = pd.to_datetime(df["fecha_sesion"], errors="coerce")
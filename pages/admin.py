@@ -1,15 +1,21 @@
+from functools import partial
+
 import streamlit as st
 import modules.app_config.config as config
 config.init_config()
 
-from modules.db.db_absences import load_active_absences_db
+from modules.db.db_absences import get_absence_index_db, load_active_absences_db
 from modules.db.db_catalogs import load_catalog_list_db
 from modules.ui.ui_components import selection_header, filtrar_registros
 from modules.i18n.i18n import t
 from modules.ui.absents_ui import absents_summary
+from modules.ui.import_ui import import_records_ui
 from modules.db.db_competitions import load_competitions_db
 from modules.db.db_players import load_players_db
-from modules.db.db_records import delete_record, get_records_db
+from modules.db.db_prefetch import load_page_data
+from modules.db.db_records import delete_record, get_records_db, get_records_page_db, records_export_query, iter_records_chunks
+from modules.util.profiler import render_profile, section
+from modules.util.records_export import PARQUET_DISPONIBLE, lazy_export, write_csv, write_json, write_parquet
 
 if st.session_state["auth"]["rol"].lower() not in ["admin", "developer"]:
     st.switch_page("app.py")
@@ -17,12 +23,18 @@ if st.session_state["auth"]["rol"].lower() not in ["admin", "developer"]:
 st.header(t("Administrador de :red[registros]"), divider="red")
 
 # Load reference data
-jug_df = load_players_db()
-comp_df = load_competitions_db()
-wellness_df = get_records_db()
-tipo_ausencia_df = load_catalog_list_db("tipo_ausencia", as_df=True)
-ausencias_df = load_active_absences_db(activas=False)
-#st.dataframe(wellness_df)
+with section("Carga de datos"):
+    datos = load_page_data({
+        "jug_df": load_players_db,
+        "comp_df": load_competitions_db,
+        "tipo_ausencia_df": partial(load_catalog_list_db, "tipo_ausencia", as_df=True),
+        "ausencias_df": partial(load_active_absences_db, activas=False),
+        "indice_ausencias": get_absence_index_db,
+    })
+    jug_df = datos["jug_df"]
+    comp_df = datos["comp_df"]
+    tipo_ausencia_df = datos["tipo_ausencia_df"]
+    ausencias_df = datos["ausencias_df"]
 
 @st.dialog(t("Eliminar registros filtrados"), width="small")
 def dialog_eliminar_todos_filtrados(ids_todos):
@@ -57,6 +69,7 @@ def dialog_eliminar_todos_filtrados(ids_todos):
                 if exito:
                     st.session_state["reload_flag"] = True
                     st.session_state["admin_delete_all"] = True
+                    st.session_state["admin_sel_reset"] = True
                 else:
                     st.session_state["save_error"] = mensaje
 
@@ -87,43 +100,106 @@ def dialog_eliminar():
             if exito:
                 # Marcar para recarga
                 st.session_state["reload_flag"] = True
+                st.session_state["admin_sel_reset"] = True
 
             st.rerun()
 
 
-records, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, wellness_df, modo="reporte")
+def cargar_registros(start, end, plantel, id_jugadora):
+    """Ventana y jugadora en la consulta; sin plantel: la tabla y el borrado masivo no filtran por plantel."""
+    return get_records_db(start=start, end=end, id_jugadora=id_jugadora)
+
+with section("selection_header"):
+    records, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, cargar_registros, modo="reporte")
 
 if records.empty:
     st.error(t("No se encontraron registros"))
+    render_profile()
     st.stop()
 
-tab1, tab2 = st.tabs([ "Wellness :material/check_in_out:", "Ausencias :material/event_busy:"])
+tab1, tab2, tab3 = st.tabs([ "Wellness :material/check_in_out:", "Ausencias :material/event_busy:", "Importar :material/upload:"])
 
 with tab1:
 
-    disabled = records.columns.tolist()
+    # ===============================
+    # 🔸 Tabla paginada (keyset) con selección por id
+    # ===============================
+    filtros_grid = (
+        start, end, jugadora["id_jugadora"] if jugadora else None, turno,
+    )
+    if st.session_state.get("admin_grid_filtros") != filtros_grid:
+        # Filtros nuevos → volver a la primera página
+        st.session_state["admin_grid_filtros"] = filtros_grid
+        st.session_state["admin_grid_cursores"] = [None]
+    st.session_state.setdefault("admin_sel_ids", set())
+    st.session_state.setdefault("admin_grid_gen", 0)
+    if st.session_state.pop("admin_sel_reset", False):
+        # Tras borrar: selección vacía y editor nuevo (sin ediciones previas)
+        st.session_state["admin_sel_ids"] = set()
+        st.session_state["admin_grid_gen"] += 1
+
+    cursores = st.session_state["admin_grid_cursores"]
+    seleccion = st.session_state["admin_sel_ids"]
+
+    col_tam, _ = st.columns([1, 5])
+    with col_tam:
+        page_size = st.selectbox(t("Filas por página"), [25, 50, 100, 200], index=1)
+
+    with section("get_records_page_db"):
+        page_df, siguiente = get_records_page_db(
+            start=start, end=end,
+            id_jugadora=filtros_grid[2], turno=turno,
+            after=cursores[-1], page_size=page_size,
+        )
+    if page_df is None:
+        render_profile()
+        st.stop()
 
     columna = t("seleccionar")
-
-    # --- Agregar columna de selección si no existe ---
-    if columna not in records.columns:
-        records.insert(0, columna, False)
-
-    #records_vista = records.drop("id", axis=1)
-
-    df_edited = st.data_editor(records, 
-            column_config={
-                columna: st.column_config.CheckboxColumn(columna, default=False)},   
-            num_rows="fixed", hide_index=True, disabled=disabled)
-
-    ids_seleccionados = df_edited.loc[df_edited[columna], "id"].tolist()
+    vista = page_df.copy()
+    if not vista.empty:
+        vista.insert(0, columna, vista["id"].isin(seleccion))
+
+    with section("Tabla de registros"):
+        df_edited = st.data_editor(vista,
+                column_config={
+                    columna: st.column_config.CheckboxColumn(columna, default=False)},
+                num_rows="fixed", hide_index=True,
+                disabled=page_df.columns.tolist(),
+                key=f"admin_grid_{st.session_state['admin_grid_gen']}_{hash((filtros_grid, cursores[-1], page_size))}")
+
+    # Sincronizar la selección de esta página con el conjunto global
+    if not df_edited.empty:
+        marcados = df_edited[columna].astype(bool)
+        seleccion.difference_update(df_edited.loc[~marcados, "id"].tolist())
+        seleccion.update(df_edited.loc[marcados, "id"].tolist())
+
+    ids_seleccionados = sorted(seleccion)
+
+    col_prev, col_pag, col_next, _ = st.columns([1, 1.2, 1, 4])
+    with col_prev:
+        if st.button(t(":material/chevron_left: Anterior"), disabled=len(cursores) == 1):
+            cursores.pop()
+            st.rerun()
+    with col_pag:
+        st.caption(f"{t('Página')} {len(cursores)} · {len(ids_seleccionados)} {t('seleccionados')}")
+    with col_next:
+        if st.button(t("Siguiente :material/chevron_right:"), disabled=siguiente is None):
+            cursores.append(siguiente)
+            st.rerun()
 
     if st.session_state["auth"]["rol"].lower() in ["developer"]:
         st.write(t("Registros seleccionados:"), ids_seleccionados)
 
     #st.dataframe(records, hide_index=True)
     # save_if_modified(records, df_edited)
-    csv_data = records.to_csv(index=False).encode("utf-8")
+    # Exportaciones bajo demanda: solo se consulta y escribe al pulsar el botón
+    export_sql, export_params = records_export_query(
+        start=start, end=end,
+        id_jugadora=jugadora["id_jugadora"] if jugadora else None,
+        turno=turno,
+    )
+    exportar_chunks = partial(iter_records_chunks, export_sql, export_params)
 
     exito, mensaje = False, ""
     
@@ -132,7 +208,7 @@ with tab1:
         st.success(mensaje)
         st.session_state["reload_flag"] = False
 
-    col1, col2, col3, col4, _ = st.columns([1.6, 1.8, 2, 1, 1])
+    col1, col2, col3, col4, col5 = st.columns([1.6, 1.8, 2, 2, 1])
     with col1:
         # --- Botón principal para abrir el diálogo ---
         if st.button(t(":material/delete: Eliminar seleccionados"), disabled=len(ids_seleccionados) == 0):
@@ -140,26 +216,35 @@ with tab1:
     with col2:
         st.download_button(
                 label=t(":material/download: Descargar registros en CSV"),
-                data=csv_data, file_name="registros_wellness.csv", mime="text/csv")
+                data=lazy_export(write_csv, exportar_chunks),
+                file_name="registros_wellness.csv", mime="text/csv", on_click="ignore")
+    with col3:
+        if PARQUET_DISPONIBLE:
+            st.download_button(
+                    label=t(":material/download: Descargar registros en Parquet"),
+                    data=lazy_export(write_parquet, exportar_chunks),
+                    file_name="registros_wellness.parquet", mime="application/vnd.apache.parquet",
+                    on_click="ignore")
 
     if st.session_state["auth"]["rol"].lower() in ["developer"]:
-        with col3:
-                # Convertir a JSON (texto legible, sin índices)
-                json_data = records.to_json(orient="records", force_ascii=False, indent=2)
-                json_bytes = json_data.encode("utf-8")
-
-                # Botón de descarga
+        with col4:
+                # Botón de descarga (JSON generado por bloques al pulsar)
                 st.download_button(
                     label=t(":material/download: Descargar registros en JSON"),
-                    data=json_bytes, file_name="registros_wellness.json", mime="application/json"
+                    data=lazy_export(write_json, exportar_chunks),
+                    file_name="registros_wellness.json", mime="application/json",
+                    on_click="ignore"
                 )
-        with col4:
+        with col5:
             if st.button(
                 t(":material/delete_forever: Eliminar Todos los registros"),
                 disabled=records.empty):
                 dialog_eliminar_todos_filtrados(records["id"].tolist())
 
-with tab2:
+with tab3, section("import_records_ui"):
+    import_records_ui(jug_df)
+
+with tab2, section("Ausencias"):
 
     ausencias_df_filtrado = filtrar_registros(
         ausencias_df,
@@ -169,10 +254,13 @@ with tab2:
         tipo=tipo,
         start=start,
         end=end,
+        indice_ausencias=datos["indice_ausencias"],
     )
 
+    # Último bloque de la página: sin st.stop() para llegar a render_profile
     if ausencias_df_filtrado.empty:
         st.error(t("No se encontraron registros"))
-        st.stop()
-        
-    absents_summary(ausencias_df_filtrado)
+    else:
+        absents_summary(ausencias_df_filtrado)
+
+render_profile()
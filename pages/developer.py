@@ -1,5 +1,6 @@
 
 import streamlit as st
+import pandas as pd
 import bcrypt
 
 # ============================
@@ -7,12 +8,17 @@ import bcrypt
 # ============================
 
 from modules.i18n.i18n import t
-from modules.auth_system.auth_core import init_app_state, validate_login
+from modules.db.db_records import clear_records_cache
+from modules.db.db_daily_loads import rebuild_daily_loads
+from modules.db.db_connection import get_pool_stats, reset_pool_stats
+from modules.db.db_query_stats import (
+    top_queries, slow_queries, reset_query_stats,
+    get_slow_query_threshold, set_slow_query_threshold,
+)
+from modules.util.profiler import profile_history, profiling_enabled, render_profile, set_profiling
 import modules.app_config.config as config
 
 config.init_config()
-init_app_state()
-is_valid = validate_login()
 
 # Acceso solo para admin / developer
 if st.session_state["auth"]["rol"].lower() not in ["developer"]:
@@ -51,6 +57,7 @@ def verify_password(password: str, hashed: str) -> bool:
 tabs = st.tabs([
         t(":material/user_attributes: Usuarios"),
         t(":material/description: Utilidades"),
+        t(":material/database: Base de datos"),
     ])
 
 
@@ -75,4 +82,92 @@ with tabs[0]:
 with tabs[1]:
     if st.button("Reiniciar caché"):
         st.cache_data.clear()
-        st.success("Caché limpiada correctamente")
\ No newline at end of file
+        clear_records_cache()
+        st.success("Caché limpiada correctamente")
+
+    if st.button("Reconstruir resumen diario"):
+        if rebuild_daily_loads():
+            st.success("Resumen diario (wellness_diario) reconstruido")
+        else:
+            st.error("No se pudo reconstruir el resumen diario (wellness_diario).")
+
+    st.divider()
+    st.text("⏱️ Modo perfilado")
+    st.caption("Tiempo por sección, consultas SQL y aciertos de caché de cada rerun, al final de la página.")
+    # Se guarda fuera del widget: el estado de los widgets se pierde al cambiar de página
+    perfilado = st.toggle("Perfilar las páginas", value=profiling_enabled())
+    cprofile = st.toggle(
+        "Guardar cProfile en disco", value=bool(st.session_state.get("perfilado_cprofile")),
+        disabled=not perfilado,
+    )
+    set_profiling(perfilado, cprofile)
+
+    historial = profile_history()
+    if not historial.empty:
+        st.markdown("**Últimos reruns perfilados**")
+        st.dataframe(historial, hide_index=True)
+
+with tabs[2]:
+    st.text("🔌 Pool de conexiones MySQL")
+    stats = get_pool_stats()
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("En uso", f"{stats['en_uso']} / {stats['pool_size']}", help=f"Máximo simultáneo: {stats['max_en_uso']}")
+    c2.metric("Checkouts", stats["checkouts"], help=f"Con espera en cola: {stats['esperas']}")
+    c3.metric("Espera media", f"{stats['espera_media_s'] * 1000:.1f} ms", help=f"Máxima: {stats['espera_max_s'] * 1000:.0f} ms")
+    c4.metric("Fallos", stats["fallos"], help=f"Timeouts ({stats['pool_timeout']:.0f} s): {stats['timeouts']} · Reintentos: {stats['reintentos']}")
+
+    if stats["timeouts"]:
+        st.warning("Hubo peticiones sin conexión libre: considera subir pool_size en secrets.toml.")
+
+    if st.button("Reiniciar contadores"):
+        reset_pool_stats()
+        st.rerun()
+
+    st.divider()
+    st.text("⏱️ Consultas SQL (agrupadas por huella)")
+
+    c1, c2, c3 = st.columns([1, 1, 1])
+    umbral_ms = c1.number_input(
+        "Umbral consulta lenta (ms)", min_value=10, step=50,
+        value=int(get_slow_query_threshold() * 1000),
+    )
+    set_slow_query_threshold(umbral_ms / 1000)
+    orden = c2.selectbox("Ordenar por", ["total_s", "max_s", "llamadas", "filas", "bytes"])
+    top_n = c3.number_input("Top N", min_value=5, max_value=100, value=15, step=5)
+
+    top_df = top_queries(int(top_n), orden)
+    if top_df.empty:
+        st.info("Aún no se han registrado consultas.")
+    else:
+        st.dataframe(
+            top_df,
+            hide_index=True,
+            column_config={
+                "total_s": st.column_config.NumberColumn("Total (s)", format="%.2f"),
+                "media_ms": st.column_config.NumberColumn("Media (ms)", format="%.1f"),
+                "max_s": st.column_config.NumberColumn("Máx (s)", format="%.2f"),
+                "bytes": st.column_config.NumberColumn("Bytes (aprox.)", format="%d"),
+            },
+        )
+
+    lentas_df = slow_queries()
+    if not lentas_df.empty:
+        st.markdown(f"**Consultas por encima de {umbral_ms} ms**")
+        st.dataframe(lentas_df, hide_index=True)
+
+    if st.button("Reiniciar estadísticas de consultas"):
+        reset_query_stats()
+        st.rerun()
+
+    tiempos = st.session_state.get("page_data_tiempos")
+    if tiempos:
+        st.divider()
+        st.text("🚀 Última carga paralela de página (load_page_data)")
+        st.caption(f"Suma secuencial: {sum(tiempos.values()):.2f} s · Más lenta: {max(tiempos.values()):.2f} s")
+        st.dataframe(
+            pd.DataFrame({"carga": list(tiempos), "segundos": list(tiempos.values())}),
+            hide_index=True,
+        )
+
+render_profile()
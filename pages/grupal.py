@@ -9,19 +9,38 @@ config.init_config()
 from modules.ui.ui_components import selection_header
 from modules.reports.ui_grupal import group_dashboard
 from modules.db.db_records import get_records_db
+from modules.db.db_daily_loads import load_daily_loads_db
 from modules.db.db_players import load_players_db
 from modules.db.db_competitions import load_competitions_db
+from modules.db.db_prefetch import load_page_data
+from modules.util.profiler import render_profile, section
 
 st.header(t("Análisis :red[grupal]"), divider="red")
 
 # Load reference data
-jug_df = load_players_db()
-comp_df = load_competitions_db()
-wellness_df = get_records_db()
+with section("Carga de datos"):
+    datos = load_page_data({
+        "jug_df": load_players_db,
+        "comp_df": load_competitions_db,
+    })
+jug_df, comp_df = datos["jug_df"], datos["comp_df"]
 
-#st.dataframe(wellness_df, hide_index=True)    
-
-df, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, wellness_df, modo="reporte_grupal")
+# Los registros se cargan dentro de selection_header con la ventana y el plantel elegidos
+with section("selection_header"):
+    df, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, get_records_db, modo="reporte_grupal")
 
 #st.dataframe(df, hide_index=True)
-group_dashboard(df)
+
+# El resumen diario no distingue turnos: solo se usa con "Todos"
+diario = None
+if turno == "Todos" and not df.empty:
+    with section("Resumen diario"):
+        diario = load_daily_loads_db(start=start, end=end)
+        if diario is not None:
+            diario = diario[diario["id_jugadora"].isin(df["id_jugadora"].unique())]
+
+with section("group_dashboard"):
+    group_dashboard(df, diario)
+
+render_profile()
+
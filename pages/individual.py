@@ -4,34 +4,58 @@ import modules.app_config.config as config
 
 from modules.i18n.i18n import t
 from modules.ui.ui_components import selection_header
-from modules.reports.ui_individual import metricas, graficos_individuales, calcular_semaforo_riesgo, player_block_dux
+from modules.reports.ui_individual import metricas, graficos_individuales, calcular_semaforo_riesgo, player_block_dux, acwr_jugadora
 from modules.db.db_records import get_records_db
 from modules.db.db_players import load_players_db
 from modules.db.db_competitions import load_competitions_db
+from modules.db.db_prefetch import load_page_data
+from modules.util.profiler import render_profile, section
 
 config.init_config()
 st.header(t("Análisis :red[individual]"), divider="red")
 
 # Load reference data
-jug_df = load_players_db()
-comp_df = load_competitions_db()
-df = get_records_db()
+with section("Carga de datos"):
+    datos = load_page_data({
+        "jug_df": load_players_db,
+        "comp_df": load_competitions_db,
+    })
+jug_df, comp_df = datos["jug_df"], datos["comp_df"]
 
-df_filtrado, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, df, modo="reporte")
+# Los registros se cargan dentro de selection_header con la ventana y el plantel elegidos
+with section("selection_header"):
+    df_filtrado, jugadora, tipo, turno, start, end = selection_header(jug_df, comp_df, get_records_db, modo="reporte", precargar_fotos=True)
 
 if not jugadora:
     st.info(t("Selecciona una jugadora para continuar."))
+    render_profile()
     st.stop()
 
     #st.subheader("RPE / Cargas")
 if df_filtrado is None or df_filtrado.empty:
     st.info(t("No hay registros aún (se requieren Check-out con UA calculado)."))
+    render_profile()
     st.stop()
 
-player_block_dux(jugadora)
-metricas(df_filtrado, jugadora, turno, start, end)
+with section("Ficha de la jugadora"):
+    player_block_dux(jugadora)
+with section("metricas"):
+    metricas(df_filtrado, jugadora, turno, start, end)
 
-icon, desc, acwr, fatiga = calcular_semaforo_riesgo(df_filtrado)
+# ACWR diario: se calcula una vez y lo reutilizan el semáforo y los gráficos
+metodo_acwr = st.radio(
+    t("Método ACWR"),
+    options=["rolling", "ewma"],
+    format_func=lambda m: t("Media móvil") if m == "rolling" else t("EWMA"),
+    horizontal=True,
+)
+with section("ACWR y semáforo de riesgo"):
+    acwr_df = acwr_jugadora(df_filtrado.sort_values("fecha_sesion"), metodo_acwr)
+
+    icon, desc, acwr, fatiga = calcular_semaforo_riesgo(df_filtrado, acwr_df)
 
 st.markdown(f"{t('**Riesgo actual:**')} {icon} {desc}")
-graficos_individuales(df_filtrado)
\ No newline at end of file
+with section("graficos_individuales"):
+    graficos_individuales(df_filtrado, acwr_df)
+
+render_profile()
@@ -1,48 +1,66 @@
 
+import datetime
+from functools import partial
+
 import streamlit as st
 
 from modules.app_config import config
 from modules.db.db_absences import load_active_absences_db
 from modules.db.db_competitions import load_competitions_db
 from modules.db.db_players import load_players_db
+from modules.db.db_prefetch import load_page_data
+from modules.util.profiler import render_profile, section
 from modules.util.records_util import resolver_jugadora_final
 config.init_config()
 
-from modules.auth_system.auth_core import init_app_state, validate_login
 from modules.i18n.i18n import t
-from modules.db.db_records import get_records_db
+from modules.db.db_records import get_check_index_db, get_records_db
 from modules.db.db_catalogs import load_catalog_list_db
 from modules.ui.absents_ui import absents_form, filtrar_jugadoras_ausentes
 
 from modules.ui.ui_components import selection_header_registro
 from modules.ui.wellness_ui import wellness_form
 
-# Authentication gate
-init_app_state()
-is_valid = validate_login()
+# Autenticación: config.init_config() ya validó la sesión
 
 ##:red[:material/check_in_out:]
 st.header(t("Registro"), divider="red")
 
 # Load reference data
-wellness_df = get_records_db()
-jug_df = load_players_db()
-comp_df = load_competitions_db()
+# El registro solo necesita los check-in/check-out del día
+hoy = datetime.date.today()
+with section("Carga de datos"):
+    datos = load_page_data({
+        "wellness_df": partial(get_records_db, start=hoy, end=hoy),
+        "jug_df": load_players_db,
+        "comp_df": load_competitions_db,
+        "tipo_ausencia_df": partial(load_catalog_list_db, "tipo_ausencia", as_df=True),
+        "ausencias_df": load_active_absences_db,
+    })
+    wellness_df = datos["wellness_df"]
+    # Misma entrada de caché que wellness_df: no vuelve a consultar
+    check_index = get_check_index_db(start=hoy, end=hoy)
+    jug_df = datos["jug_df"]
+    comp_df = datos["comp_df"]
 
-tipo_ausencia_df = load_catalog_list_db("tipo_ausencia", as_df=True)
-ausencias_df = load_active_absences_db()
+    tipo_ausencia_df = datos["tipo_ausencia_df"]
+    ausencias_df = datos["ausencias_df"]
 
-jug_df = filtrar_jugadoras_ausentes(jug_df, ausencias_df)
+    jug_df = filtrar_jugadoras_ausentes(jug_df, ausencias_df)
 
 tab1, tab2 = st.tabs([ "Wellness :material/check_in_out:", "Ausencias :material/event_busy:"])
 
 with tab1:
-    jugadora, tipo, turno, jug_df_filtrado = selection_header_registro(jug_df, comp_df, wellness_df)
+    with section("selection_header_registro"):
+        jugadora, tipo, turno, jug_df_filtrado = selection_header_registro(jug_df, comp_df, wellness_df, check_index)
     
     if st.session_state.get("submitted"):
         st.session_state["submitted"] = False
  
-    wellness_form(jugadora, tipo, turno)
+    with section("wellness_form"):
+        wellness_form(jugadora, tipo, turno)
     
-with tab2:
-     absents_form(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df)
+with tab2, section("absents_form"):
+     absents_form(comp_df, jug_df, tipo_ausencia_df, ausencias_df, wellness_df, check_index)
+
+render_profile()
\ No newline at end of file
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 # Mock Streamlit.session_state
@@ -125,3 +127,41 @@ def test_validate_access_success(monkeypatch):
     assert auth["rol"] == "Coach"
     assert auth["token"] == "FAKE_TOKEN"
     assert auth["session_id"] == "12345"
+
+
+def test_get_current_user_cachea_la_validacion(monkeypatch):
+    """
+    El JWT solo se verifica al cambiar el token o cerca de expirar;
+    una sesión revocada deja de validar aunque esté en caché.
+    """
+
+    st.session_state.clear()
+    auth_core.init_app_state()
+
+    decodificados = []
+    exp = {"T1": time.time() + 3600, "T2": time.time() + 30}
+
+    def fake_decode(token):
+        decodificados.append(token)
+        return {"user": "a@test.com", "rol": "Coach", "sid": f"sid-{token}", "exp": exp[token]}
+
+    logouts = []
+    monkeypatch.setattr(auth_core, "decode_jwt", fake_decode)
+    monkeypatch.setattr(auth_core, "logout", lambda: logouts.append(1))
+
+    st.session_state["auth"]["token"] = "T1"
+    for _ in range(50):
+        assert auth_core.validate_login()
+    assert decodificados == ["T1"]
+
+    # Token nuevo y a menos de _REVALIDAR_ANTES_S de expirar: se verifica siempre
+    st.session_state["auth"]["token"] = "T2"
+    auth_core.validate_login()
+    auth_core.validate_login()
+    assert decodificados == ["T1", "T2", "T2"]
+
+    st.session_state["auth"]["token"] = "T1"
+    auth_core.validate_login()
+    auth_core.revoke_session("sid-T1")
+    assert not auth_core.validate_login()
+    assert logouts == [1]
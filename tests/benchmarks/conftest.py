@@ -0,0 +1,183 @@
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# ============================================================
+#  🔹 BENCHMARKS DE MÉTRICAS E INFORMES
+# ============================================================
+# Se ejecutan solo con WELLNESS_BENCH=1 (son lentos a propósito):
+#
+#   WELLNESS_BENCH=1 python -m pytest tests/benchmarks -q
+#
+# Cada benchmark se compara con baselines.json; falla si el mejor de
+# varios intentos tarda más de WELLNESS_BENCH_TOLERANCE (2.0 por defecto)
+# veces la referencia más un margen fijo de MARGEN_S (las medidas de pocos
+# milisegundos son ruidosas). Para
+# regenerar las referencias en la máquina de CI:
+#
+#   WELLNESS_BENCH=1 WELLNESS_BENCH_UPDATE=1 python -m pytest tests/benchmarks -q
+
+ACTIVO = os.environ.get("WELLNESS_BENCH") == "1"
+ACTUALIZAR = os.environ.get("WELLNESS_BENCH_UPDATE") == "1"
+TOLERANCIA = float(os.environ.get("WELLNESS_BENCH_TOLERANCE", "2.0"))
+MARGEN_S = 0.005
+BASELINES = Path(__file__).parent / "baselines.json"
+
+# Tamaño de la temporada sintética (jugadoras × temporadas)
+JUGADORAS = int(os.environ.get("WELLNESS_BENCH_PLAYERS", "30"))
+TEMPORADAS = int(os.environ.get("WELLNESS_BENCH_SEASONS", "2"))
+
+_medidas: dict[str, float] = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if ACTIVO:
+        return
+    saltar = pytest.mark.skip(reason="benchmarks desactivados (WELLNESS_BENCH=1 para ejecutarlos)")
+    for item in items:
+        if "benchmarks" in str(item.fspath):
+            item.add_marker(saltar)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not (ACTIVO and ACTUALIZAR and _medidas):
+        return
+    referencias = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    referencias.update({k: round(v, 5) for k, v in sorted(_medidas.items())})
+    BASELINES.write_text(json.dumps(referencias, indent=2, sort_keys=True) + "\n")
+
+
+# ============================================================
+#  🔹 GENERADOR DE TEMPORADAS SINTÉTICAS
+# ============================================================
+
+def generate_season(jugadoras: int = JUGADORAS, temporadas: int = TEMPORADAS, semilla: int = 42):
+    """
+    Registros con la forma de get_records_db: N jugadoras × M temporadas
+    (agosto-mayo), 1-3 turnos por día de entrenamiento, check-in y, en la
+    mayoría de sesiones, check-out con minutos/RPE/UA. Los días de ausencia
+    o lesión no generan registros.
+
+    Devuelve (registros_df, jugadoras_df, ausencias_df).
+    """
+    rng = np.random.default_rng(semilla)
+    ids = [f"J{i:03d}" for i in range(jugadoras)]
+    jug_df = pd.DataFrame({
+        "id_jugadora": ids,
+        "nombre_jugadora": [f"JUGADORA {i:03d}" for i in range(jugadoras)],
+        "posicion": rng.choice(["POR", "DEF", "MC", "DEL"], jugadoras),
+        "plantel": "1FF",
+    })
+
+    dias = pd.concat([
+        pd.Series(pd.date_range(f"{2023 + t}-08-01", f"{2024 + t}-05-31", freq="D"))
+        for t in range(temporadas)
+    ])
+    dias = dias[dias.dt.dayofweek != 6].dt.date.to_numpy()   # domingo libre
+    turnos_dia = rng.choice([1, 2, 3], size=len(dias), p=[0.6, 0.3, 0.1])
+
+    # Ausencias (motivos varios) y lesiones: intervalos por jugadora
+    ausencias = []
+    for j in ids:
+        for _ in range(rng.integers(1, 6)):
+            inicio = dias[rng.integers(0, len(dias))]
+            dur = int(rng.integers(1, 5)) if rng.random() < 0.7 else int(rng.integers(7, 40))
+            ausencias.append({
+                "id": len(ausencias) + 1,
+                "id_jugadora": j,
+                "fecha_inicio": inicio,
+                "fecha_fin": inicio + datetime.timedelta(days=dur),
+                "motivo_nombre": "Lesión" if dur >= 7 else "Permiso",
+                "plantel": "1FF",
+            })
+    ausencias_df = pd.DataFrame(ausencias)
+
+    # Sesiones: (día, turno) × jugadora
+    sesion_dia = np.repeat(np.arange(len(dias)), turnos_dia)
+    sesion_turno = np.concatenate([np.arange(1, n + 1) for n in turnos_dia])
+    n_ses, n_jug = len(sesion_dia), len(ids)
+    fecha = np.repeat(dias[sesion_dia], n_jug)
+    turno = np.repeat(sesion_turno, n_jug)
+    jugadora = np.tile(np.array(ids, dtype=object), n_ses)
+
+    df = pd.DataFrame({"id_jugadora": jugadora, "fecha_sesion": fecha, "turno_n": turno})
+    df = df.merge(ausencias_df[["id_jugadora", "fecha_inicio", "fecha_fin"]], on="id_jugadora", how="left")
+    ausente = (df["fecha_sesion"] >= df["fecha_inicio"]) & (df["fecha_sesion"] <= df["fecha_fin"])
+    claves = ["id_jugadora", "fecha_sesion", "turno_n"]
+    ausentes = df.loc[ausente, claves].drop_duplicates()
+    df = df[claves].drop_duplicates().merge(ausentes, on=claves, how="left", indicator=True)
+    df = df[df["_merge"] == "left_only"].drop(columns="_merge").reset_index(drop=True)
+
+    n = len(df)
+    checkout = rng.random(n) < 0.9
+    minutos = np.where(checkout, rng.choice([45, 60, 75, 90, 105], n), np.nan)
+    rpe = np.where(checkout, rng.integers(2, 10, n), np.nan)
+    df = df.assign(
+        id=np.arange(1, n + 1),
+        nombre_jugadora=df["id_jugadora"].str.replace("J", "JUGADORA ", regex=False),
+        plantel="1FF",
+        tipo=np.where(checkout, "checkOut", "checkIn"),
+        turno="Turno " + df["turno_n"].astype(str),
+        recuperacion=rng.integers(1, 6, n),
+        energia=rng.integers(1, 6, n),
+        sueno=rng.integers(1, 6, n),
+        stress=rng.integers(1, 6, n),
+        dolor=rng.choice([1, 1, 1, 2, 3, 4, 5], n),
+        minutos_sesion=minutos,
+        rpe=rpe,
+        ua=minutos * rpe,
+        zonas_anatomicas_dolor=[[] for _ in range(n)],
+        usuario="staff",
+    ).drop(columns="turno_n")
+    df["fecha_hora_registro"] = pd.to_datetime(df["fecha_sesion"]) + pd.to_timedelta(
+        7 + df["turno"].str[-1].astype(int) * 3, unit="h"
+    )
+    df = df.sort_values("fecha_hora_registro", ascending=False, ignore_index=True)
+
+    return df, jug_df, ausencias_df
+
+
+@pytest.fixture(scope="session")
+def season():
+    return generate_season()
+
+
+# ============================================================
+#  🔹 MEDICIÓN Y COMPARACIÓN CON LA REFERENCIA
+# ============================================================
+
+@pytest.fixture
+def bench(request):
+    """
+    bench(func, *args, repeticiones=10, **kwargs) → resultado de func.
+    Mide el mejor de varias ejecuciones y lo compara con la referencia.
+    """
+    referencias = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    nombre = request.node.name
+
+    def medir(func, *args, repeticiones: int = 10, **kwargs):
+        resultado = func(*args, **kwargs)   # calentamiento
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            func(*args, **kwargs)
+            tiempos.append(time.perf_counter() - inicio)
+        mejor = min(tiempos)
+        _medidas[nombre] = mejor
+
+        referencia = referencias.get(nombre)
+        print(f"\n{nombre}: {mejor * 1000:.1f} ms (referencia: "
+              f"{'-' if referencia is None else f'{referencia * 1000:.1f} ms'})")
+        if referencia is not None and not ACTUALIZAR:
+            assert mejor <= referencia * TOLERANCIA + MARGEN_S, (
+                f"{nombre}: {mejor * 1000:.1f} ms > {TOLERANCIA}× referencia ({referencia * 1000:.1f} ms)"
+            )
+        return resultado
+
+    return medir
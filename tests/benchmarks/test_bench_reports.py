@@ -0,0 +1,134 @@
+import datetime
+
+import pandas as pd
+
+import modules.ui.ui_app as ui_app
+from modules.db.db_records import _compact_records
+from modules.reports.metrics import (
+    RPEFilters,
+    build_daily_loads,
+    compute_acwr_series,
+    compute_rpe_metrics,
+    compute_rpe_metrics_batch,
+)
+from modules.reports.plots_grupales import _agregar_diario
+from modules.ui.ui_components import filtrar_registros
+from modules.util.absence_index import absent_players, build_absence_index
+
+
+class _StreamlitMudo:
+    """Sustituye a st en generar_resumen_periodo: solo se mide el cálculo."""
+
+    def __getattr__(self, nombre):
+        return lambda *a, **k: None
+
+
+def _ultimo_mes(df):
+    fin = df["fecha_sesion"].max()
+    return df[df["fecha_sesion"] >= fin - datetime.timedelta(days=30)]
+
+
+# ============================================================
+#  🔹 MÉTRICAS RPE / ACWR
+# ============================================================
+
+def test_bench_compute_rpe_metrics(season, bench):
+    df, jug_df, _ = season
+    jugadora = jug_df["id_jugadora"].iloc[0]
+    flt = RPEFilters(jugadores=[jugadora])
+    metrics = bench(compute_rpe_metrics, df[df["id_jugadora"] == jugadora], flt)
+    assert metrics["carga_semana"] is not None
+
+
+def test_bench_compute_rpe_metrics_batch(season, bench):
+    df, jug_df, _ = season
+    out = bench(compute_rpe_metrics_batch, df, repeticiones=3)
+    assert set(out["id_jugadora"]) <= set(jug_df["id_jugadora"])
+
+
+def test_bench_compute_acwr_series(season, bench):
+    df, jug_df, _ = season
+    df_jug = df[df["id_jugadora"] == jug_df["id_jugadora"].iloc[0]]
+    out = bench(compute_acwr_series, df_jug, "ewma")
+    assert not out.empty
+
+
+# ============================================================
+#  🔹 RESUMEN DEL PERIODO Y PENDIENTES (portada)
+# ============================================================
+
+def test_bench_compute_player_wellness_means(season, bench):
+    df, _, _ = season
+    out = bench(ui_app.compute_player_wellness_means, df[df["tipo"] == "checkIn"])
+    assert "en_riesgo" in out.columns
+
+
+def test_bench_generar_resumen_periodo(season, bench, monkeypatch):
+    df, _, _ = season
+    monkeypatch.setattr(ui_app, "st", _StreamlitMudo())
+    bench(ui_app.generar_resumen_periodo, _ultimo_mes(df), repeticiones=3)
+
+
+def test_bench_compute_check_status(season, bench):
+    df, jug_df, _ = season
+    estado = bench(ui_app.compute_check_status, df, jug_df, claves=["fecha_sesion", "turno"], repeticiones=3)
+    assert estado["pendiente_checkout"].any()
+
+
+# ============================================================
+#  🔹 FILTROS Y AUSENCIAS
+# ============================================================
+
+def test_bench_filtrar_registros(season, bench):
+    df, jug_df, _ = season
+    fin = df["fecha_sesion"].max()
+    out = bench(
+        filtrar_registros, df,
+        jugadora_opt={"id_jugadora": jug_df["id_jugadora"].iloc[3]},
+        turno="Turno 1", modo="reporte",
+        start=fin - datetime.timedelta(days=15), end=fin,
+    )
+    assert (out["turno"] == "Turno 1").all()
+
+
+def test_bench_filtrar_registros_compacto(season, bench):
+    """Mismo filtro sobre los tipos compactos de la caché de registros."""
+    df, jug_df, _ = season
+    compacto = _compact_records(df.copy())
+    fin = df["fecha_sesion"].max()
+    out = bench(
+        filtrar_registros, compacto,
+        jugadora_opt={"id_jugadora": jug_df["id_jugadora"].iloc[3]},
+        turno="Turno 1", modo="reporte",
+        start=fin - datetime.timedelta(days=15), end=fin,
+    )
+    assert (out["turno"] == "Turno 1").all()
+    assert isinstance(out["fecha_sesion"].iloc[0], datetime.date)
+
+
+def test_bench_absence_index(season, bench):
+    _, _, ausencias_df = season
+    dias = pd.date_range("2023-08-01", periods=300, freq="D").date
+
+    def ausentes_por_dia():
+        indice = build_absence_index(ausencias_df)
+        return sum(len(absent_players(indice, d)) for d in dias)
+
+    assert bench(ausentes_por_dia) > 0
+
+
+# ============================================================
+#  🔹 PREPARACIÓN DE DATOS DE GRÁFICOS GRUPALES
+# ============================================================
+
+def test_bench_build_daily_loads(season, bench):
+    df, _, _ = season
+    diario = bench(build_daily_loads, df, repeticiones=3)
+    assert diario["sesiones"].sum() == df["ua"].notna().sum()
+
+
+def test_bench_agregar_diario(season, bench):
+    df, _, _ = season
+    diario = build_daily_loads(df)
+    out = bench(_agregar_diario, diario, "fecha_sesion")
+    assert not out.empty
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import mysql.connector
+
+import modules.db.db_connection as db_connection
+
+
+class MockStreamlit:
+    errores = []
+
+    @classmethod
+    def error(cls, msg):
+        cls.errores.append(msg)
+
+
+db_connection.st = MockStreamlit()
+
+
+class FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self):
+        return "cursor"
+
+    def close(self):
+        self.pool.libres += 1
+
+
+class FakePool:
+    """Pool que falla como mysql-connector si se pide más de lo que tiene."""
+
+    def __init__(self, size, fallos=0):
+        self.libres = size
+        self.fallos = fallos
+
+    def get_connection(self):
+        if self.fallos:
+            self.fallos -= 1
+            raise mysql.connector.errors.InterfaceError("reconexión fallida")
+        if self.libres == 0:
+            raise mysql.connector.errors.PoolError("pool exhausted")
+        self.libres -= 1
+        return FakeConn(self)
+
+
+def _usar_estado(monkeypatch, pool, size, timeout=0.5, retries=1):
+    estado = db_connection._pool_state(pool, size, timeout, retries)
+    monkeypatch.setattr(db_connection, "init_connection", lambda: estado)
+    monkeypatch.setattr(db_connection, "_RETRY_DELAY", 0)
+    return estado
+
+
+def test_espera_en_cola_hasta_que_se_libera(monkeypatch):
+    _usar_estado(monkeypatch, FakePool(1), size=1, timeout=2)
+
+    primera = db_connection.get_connection()
+    assert primera.cursor() == "cursor"  # delega en la conexión real
+
+    threading.Timer(0.1, primera.close).start()
+    segunda = db_connection.get_connection()
+    assert segunda is not None
+    segunda.close()
+    segunda.close()  # cerrar dos veces no libera dos huecos
+
+    stats = db_connection.get_pool_stats()
+    assert stats["checkouts"] == 2
+    assert stats["esperas"] == 1
+    assert stats["espera_max_s"] >= 0.05
+    assert stats["en_uso"] == 0
+
+
+def test_timeout_y_reintento(monkeypatch):
+    MockStreamlit.errores.clear()
+    _usar_estado(monkeypatch, FakePool(1, fallos=1), size=1, timeout=0.05)
+
+    conn = db_connection.get_connection()  # primer intento falla, el reintento funciona
+    assert conn is not None
+
+    inicio = time.perf_counter()
+    assert db_connection.get_connection() is None
+    assert time.perf_counter() - inicio >= 0.05
+    conn.close()
+
+    stats = db_connection.get_pool_stats()
+    assert stats["fallos"] == 1
+    assert stats["reintentos"] == 1
+    assert stats["timeouts"] == 1
+    assert len(MockStreamlit.errores) == 1
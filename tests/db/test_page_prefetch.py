@@ -0,0 +1,34 @@
+import time
+from functools import partial
+
+import pytest
+
+from modules.db.db_prefetch import load_page_data
+
+
+def _lenta(valor, segundos=0.2):
+    time.sleep(segundos)
+    return valor
+
+
+def test_cargas_en_paralelo_mantienen_nombres():
+    inicio = time.perf_counter()
+    datos = load_page_data({
+        "jug_df": partial(_lenta, "jugadoras"),
+        "comp_df": partial(_lenta, "planteles"),
+        "df": partial(_lenta, "registros"),
+    })
+    duracion = time.perf_counter() - inicio
+
+    assert datos == {"jug_df": "jugadoras", "comp_df": "planteles", "df": "registros"}
+    assert list(datos) == ["jug_df", "comp_df", "df"]
+    # En serie serían 0.6 s
+    assert duracion < 0.45
+
+
+def test_error_de_una_carga_se_propaga():
+    def falla():
+        raise RuntimeError("sin conexión")
+
+    with pytest.raises(RuntimeError, match="sin conexión"):
+        load_page_data({"ok": partial(_lenta, 1, 0), "mal": falla})
@@ -0,0 +1,64 @@
+import modules.db.db_query_stats as db_query_stats
+from modules.db.db_query_stats import fingerprint
+
+
+def test_fingerprint_normaliza_literales_y_parametros():
+    a = fingerprint("SELECT * FROM wellness WHERE id IN (1, 2, 3) AND usuario = 'ana' -- x\n;")
+    b = fingerprint("select  *  FROM wellness WHERE id IN (%s,%s) AND usuario = %(usuario)s")
+    assert a == "SELECT * FROM wellness WHERE id IN (?+) AND usuario = ?"
+    assert a.lower() == b.lower()
+    # Listas de un solo elemento y de pares (fila) también se colapsan
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (%s)") == fingerprint("SELECT 1 FROM t WHERE id IN (%s, %s)")
+    assert fingerprint("DELETE FROM t WHERE (a, b) IN ((%s, %s))") == "DELETE FROM t WHERE (a, b) IN ((?+)+)"
+    assert fingerprint("DELETE FROM t WHERE (a, b) IN ((%s, %s), (%s, %s))") == "DELETE FROM t WHERE (a, b) IN ((?+)+)"
+
+
+def test_agregado_por_huella_y_consultas_lentas():
+    db_query_stats.reset_query_stats()
+    db_query_stats.set_slow_query_threshold(0.1)
+
+    db_query_stats.record_query("SELECT * FROM t WHERE id = 1", 0.01, [{"id": 1, "x": "abc"}])
+    db_query_stats.record_query("SELECT * FROM t WHERE id = 2", 0.30, [{"id": 2, "x": "abc"}, {"id": 3, "x": "d"}])
+    db_query_stats.record_query("DELETE FROM t WHERE id = 2", 0.02, filas=1)
+
+    top = db_query_stats.top_queries(orden="total_s")
+    assert top["sql"].tolist() == ["SELECT * FROM t WHERE id = ?", "DELETE FROM t WHERE id = ?"]
+    fila = top.iloc[0]
+    assert fila["llamadas"] == 2
+    assert fila["filas"] == 3
+    assert fila["lentas"] == 1
+    assert fila["bytes"] > 0
+    assert fila["origen"].startswith("tests/db/test_query_stats.py")
+
+    lentas = db_query_stats.slow_queries()
+    assert len(lentas) == 1
+    assert lentas.iloc[0]["duracion_ms"] == 300.0
+
+
+def test_la_espera_por_conexion_no_cuenta_como_tiempo_de_consulta(monkeypatch):
+    import time
+
+    import modules.db.db_client as db_client
+
+    class Cursor:
+        rowcount = 1
+        def execute(self, sql, params=None): pass
+        def fetchall(self): return [{"id": 1}]
+        def close(self): pass
+
+    class Conn:
+        def cursor(self, dictionary=False): return Cursor()
+        def commit(self): pass
+        def close(self): pass
+
+    def pool_agotado():
+        time.sleep(0.2)
+        return Conn()
+
+    duraciones = []
+    monkeypatch.setattr(db_client, "get_connection", pool_agotado)
+    monkeypatch.setattr(db_client, "record_query", lambda sql, duracion, *a, **k: duraciones.append(duracion))
+
+    assert db_client.query("SELECT id FROM t") == [{"id": 1}]
+    assert db_client.execute("UPDATE t SET x = 1")
+    assert len(duraciones) == 2 and max(duraciones) < 0.1
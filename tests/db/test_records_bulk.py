@@ -0,0 +1,73 @@
+import datetime
+
+import pandas as pd
+
+import modules.db.db_records as db_records
+
+# Mock Streamlit.session_state
+class MockStreamlit:
+    session_state = {"auth": {"rol": "admin", "name": "Staff"}}
+
+db_records.st = MockStreamlit()
+
+
+def _setup(monkeypatch, existentes):
+    consultas, transacciones, refrescos = [], [], []
+
+    def fake_query(sql, params=None, fetch="all"):
+        consultas.append(params)
+        return existentes
+
+    monkeypatch.setattr(db_records, "query", fake_query)
+    monkeypatch.setattr(db_records, "execute_transaction", lambda st: transacciones.append(st) or True)
+    # El recálculo del resumen diario va en la misma transacción que la escritura
+    monkeypatch.setattr(
+        db_records, "daily_loads_statements",
+        lambda pares: refrescos.append(pares) or [("-- wellness_diario", None)],
+    )
+    monkeypatch.setattr(db_records, "clear_daily_loads_cache", lambda: None)
+    return consultas, transacciones, refrescos
+
+
+def test_checkin_por_lotes_una_consulta_y_una_transaccion(monkeypatch):
+    consultas, transacciones, refrescos = _setup(monkeypatch, [
+        # J2 ya tiene check-in ese turno; J3 lo tiene en otra fecha
+        {"id": 7, "id_jugadora": "J2", "fecha_sesion": datetime.date(2025, 3, 10), "turno": "Turno 1"},
+        {"id": 8, "id_jugadora": "J3", "fecha_sesion": datetime.date(2025, 3, 9), "turno": "Turno 1"},
+    ])
+    df = pd.DataFrame([
+        {"id_jugadora": j, "fecha_sesion": "2025-03-10", "turno": "Turno 1", "tipo": "checkIn",
+         "recuperacion": 3, "observacion": None, "usuario": "staff"}
+        for j in ["J1", "J2", "J3", "J3"]
+    ])
+
+    ok, resumen = db_records.upsert_records_db(df, modo="checkin")
+
+    assert ok
+    assert resumen == {"insertados": 2, "actualizados": 0, "omitidos": 2}
+    assert len(consultas) == 1
+    (sql_ins, inserts), (_sql_upd, updates), resumen_diario = transacciones[0]
+    assert resumen_diario == ("-- wellness_diario", None)
+    assert [p["id_jugadora"] for p in inserts] == ["J1", "J3"]
+    assert inserts[0]["fecha_sesion"] == datetime.date(2025, 3, 10)
+    assert inserts[0]["rpe"] is None  # campos ausentes → NULL
+    assert updates == []
+    assert sorted(refrescos[0]) == [("J1", datetime.date(2025, 3, 10)), ("J3", datetime.date(2025, 3, 10))]
+
+
+def test_checkout_por_lotes_solo_actualiza_existentes(monkeypatch):
+    _c, transacciones, _r = _setup(monkeypatch, [
+        {"id": 7, "id_jugadora": "J2", "fecha_sesion": datetime.date(2025, 3, 10), "turno": "Turno 1"},
+    ])
+    registros = [
+        {"id_jugadora": j, "fecha_sesion": datetime.date(2025, 3, 10), "turno": "Turno 1",
+         "minutos_sesion": 60, "rpe": 5, "ua": 300}
+        for j in ["J1", "J2"]
+    ]
+
+    ok, resumen = db_records.upsert_records_db(registros, modo="checkout")
+
+    assert ok
+    assert resumen == {"insertados": 0, "actualizados": 1, "omitidos": 1}
+    _ins, (_sql, updates), _resumen = transacciones[0]
+    assert updates == [{"minutos_sesion": 60, "rpe": 5, "ua": 300, "modified_by": "staff", "id": 7}]
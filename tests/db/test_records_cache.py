@@ -0,0 +1,160 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+import modules.db.db_records as db_records
+
+# Mock Streamlit.session_state
+class MockStreamlit:
+    session_state = {"auth": {"rol": "admin", "name": "staff"}}
+
+db_records.st = MockStreamlit()
+
+
+def _row(id_, fecha_mod, estatus=1):
+    return {
+        "id": id_,
+        "id_jugadora": "J1",
+        "nombre": "Ana",
+        "apellido": "Pérez",
+        "plantel": "1FF",
+        "fecha_sesion": "2025-03-10",
+        "tipo": "checkIn",
+        "turno": "Turno 1",
+        "zonas_anatomicas_dolor": None,
+        "fecha_hora_registro": "2025-03-10 09:00:00",
+        "usuario": "staff",
+        "estatus_id": estatus,
+        "ultima_modificacion": fecha_mod,
+    }
+
+
+def _setup(monkeypatch, respuestas):
+    """Sustituye query() por una cola de respuestas y registra los parámetros."""
+    llamadas = []
+
+    def fake_query(sql, params=None, fetch="all"):
+        llamadas.append(params)
+        return respuestas.pop(0)
+
+    db_records.clear_records_cache()
+    monkeypatch.setattr(db_records, "query", fake_query)
+    monkeypatch.setattr(
+        db_records, "load_catalog_list_db",
+        lambda *a, **k: pd.DataFrame({"id": [], "nombre": []}),
+    )
+    return llamadas
+
+
+def test_get_records_db_reutiliza_cache_sin_consultar(monkeypatch):
+    llamadas = _setup(monkeypatch, [[_row(1, "2025-03-10 09:00:00")]])
+
+    df1 = db_records.get_records_db()
+    df2 = db_records.get_records_db()
+
+    assert len(llamadas) == 1
+    assert df1["id"].tolist() == df2["id"].tolist() == [1]
+    # Las columnas internas de la carga incremental no se exponen
+    assert "estatus_id" not in df1.columns
+    assert "ultima_modificacion" not in df1.columns
+
+
+def test_invalidacion_precisa_y_refresco_incremental(monkeypatch):
+    llamadas = _setup(monkeypatch, [
+        [_row(1, "2025-03-10 09:00:00")],
+        # delta: la fila 1 fue eliminada y aparece la 2
+        [_row(1, "2025-03-10 10:00:00", estatus=3), _row(2, "2025-03-10 10:00:00")],
+    ])
+
+    db_records.get_records_db(start=datetime.date(2025, 3, 1), end=datetime.date(2025, 3, 31))
+
+    # Escrituras fuera de la ventana o de otra visibilidad no invalidan
+    assert db_records.invalidate_records_cache(
+        id_jugadora="J1", fecha_sesion=datetime.date(2025, 4, 2), developer=False
+    ) == 0
+    assert db_records.invalidate_records_cache(
+        id_jugadora="J1", fecha_sesion=datetime.date(2025, 3, 12), developer=True
+    ) == 0
+
+    assert db_records.invalidate_records_cache(
+        id_jugadora="J1", fecha_sesion=datetime.date(2025, 3, 12), developer=False
+    ) == 1
+
+    df = db_records.get_records_db(start=datetime.date(2025, 3, 1), end=datetime.date(2025, 3, 31))
+
+    assert len(llamadas) == 2
+    assert "desde" in llamadas[1]
+    assert df["id"].tolist() == [2]
+
+
+def test_paginacion_por_clave(monkeypatch):
+    filas = [_row(i, "2025-03-10 09:00:00") for i in (5, 4, 3)]
+    sqls = []
+    llamadas = _setup(monkeypatch, [filas, filas[2:]])
+    consulta_original = db_records.query
+
+    def query_con_sql(sql, params=None, fetch="all"):
+        sqls.append(sql)
+        return consulta_original(sql, params, fetch)
+
+    monkeypatch.setattr(db_records, "query", query_con_sql)
+
+    df, siguiente = db_records.get_records_page_db(turno="Turno 1", page_size=2)
+    assert df["id"].tolist() == [5, 4]
+    assert siguiente == ("2025-03-10 09:00:00", 4)
+    assert llamadas[0]["limite"] == 3 and llamadas[0]["turno"] == "Turno 1"
+    assert "k_id" not in llamadas[0]
+
+    df, siguiente = db_records.get_records_page_db(turno="Turno 1", after=siguiente, page_size=2)
+    assert df["id"].tolist() == [3]
+    assert siguiente is None
+    assert llamadas[1]["k_id"] == 4
+    assert "LIMIT" in sqls[1] and "OFFSET" not in sqls[1]
+
+
+def test_indice_de_cumplimiento_se_amplia_con_el_delta(monkeypatch):
+    fecha = datetime.date(2025, 3, 10)
+    checkout = dict(_row(1, "2025-03-10 11:00:00"), tipo="checkout")
+    otra = dict(_row(2, "2025-03-10 11:00:00"), id_jugadora="J2")
+    llamadas = _setup(monkeypatch, [
+        [_row(1, "2025-03-10 09:00:00")],
+        # delta tras guardar: check-out de J1 y check-in de J2
+        [checkout, otra],
+    ])
+
+    indice = db_records.get_check_index_db(start=fecha, end=fecha)
+    assert indice == {(fecha, "turno 1", "checkin"): frozenset({"J1"})}
+
+    db_records.invalidate_records_cache(id_jugadora="J2", fecha_sesion=fecha, developer=False)
+    entrada = next(iter(db_records._records_store()["entradas"].values()))
+    monkeypatch.setattr(db_records, "build_check_index", lambda df: pytest.fail("no debe reconstruirse"))
+
+    indice = db_records.get_check_index_db(start=fecha, end=fecha)
+    assert len(llamadas) == 2
+    assert entrada["indice"] is indice
+    assert indice[(fecha, "turno 1", "checkin")] == {"J1", "J2"}
+    assert indice[(fecha, "turno 1", "checkout")] == {"J1"}
+
+
+def test_cache_guarda_tipos_compactos_tras_fusionar_el_delta(monkeypatch):
+    fila = dict(_row(1, "2025-03-10 09:00:00"), recuperacion=4, rpe=None, zonas_anatomicas_dolor="[1, 2]")
+    nueva = dict(_row(2, "2025-03-10 10:00:00"), id_jugadora="J2", turno="Turno 2", rpe=7)
+    _setup(monkeypatch, [[fila], [nueva]])
+    monkeypatch.setattr(
+        db_records, "load_catalog_list_db",
+        lambda *a, **k: pd.DataFrame({"id": [1, 2], "nombre": ["Rodilla", "Tobillo"]}),
+    )
+
+    df = db_records.get_records_db()
+    db_records.invalidate_records_cache()
+    df = db_records.get_records_db()
+
+    # concat de categorías distintas devuelve texto: se vuelve a compactar
+    for col in ["id_jugadora", "nombre_jugadora", "turno", "tipo", "zonas_anatomicas_dolor"]:
+        assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert str(df["rpe"].dtype) == "Int8" and str(df["recuperacion"].dtype) == "Int8"
+    assert pd.api.types.is_datetime64_any_dtype(df["fecha_sesion"])
+    df = df.sort_values("id")
+    assert df["zonas_anatomicas_dolor"].tolist() == ["Rodilla, Tobillo", ""]
+    assert df["rpe"].isna().tolist() == [True, False]
@@ -0,0 +1,53 @@
+import datetime
+import json
+
+import pandas as pd
+import pytest
+
+from modules.util.records_export import lazy_export, write_csv, write_json, write_parquet
+
+
+def _bloques():
+    """Dos bloques con tipos distintos en la misma columna (NULL / entero)."""
+    yield pd.DataFrame({
+        "id": [1, 2],
+        "fecha_sesion": [datetime.date(2025, 3, 10)] * 2,
+        "rpe": [None, None],
+        "zonas_anatomicas_dolor": [["Rodilla"], []],
+        "turno": ["Turno 1", None],
+    })
+    yield pd.DataFrame({
+        "id": [3],
+        "fecha_sesion": [datetime.date(2025, 3, 11)],
+        "rpe": [6],
+        "zonas_anatomicas_dolor": [[]],
+        "turno": ["Turno 2"],
+    })
+
+
+def test_export_perezoso_no_consulta_hasta_pulsar():
+    llamadas = []
+
+    def factory():
+        llamadas.append(1)
+        return _bloques()
+
+    data = lazy_export(write_csv, factory)
+    assert llamadas == []
+
+    csv = data().read().decode("utf-8").splitlines()
+    assert llamadas == [1]
+    assert csv[0] == "id,fecha_sesion,rpe,zonas_anatomicas_dolor,turno"
+    assert len(csv) == 4  # una sola cabecera
+
+
+def test_json_y_parquet_por_bloques():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    registros = json.loads(write_json(_bloques()).read())
+    assert [r["id"] for r in registros] == [1, 2, 3]
+
+    tabla = pq.read_table(write_parquet(_bloques())).to_pandas()
+    assert tabla["id"].tolist() == [1, 2, 3]
+    assert tabla["rpe"].isna().tolist() == [True, True, False]
+    assert tabla["zonas_anatomicas_dolor"].tolist() == ['["Rodilla"]', "[]", "[]"]
@@ -0,0 +1,230 @@
+import datetime
+import threading
+
+import modules.db.db_absences as db_absences
+import modules.db.db_client as db_client
+import modules.db.db_connection as db_connection
+import modules.db.db_daily_loads as db_daily_loads
+import modules.db.db_records as db_records
+from modules.db.db_sqlite import SQLitePool, translate_sql
+
+# Mock Streamlit: session_state compartido y errores acumulados
+class MockStreamlit:
+    session_state = {"auth": {"rol": "admin", "name": "staff"}}
+    errores = []
+
+    @classmethod
+    def error(cls, msg):
+        cls.errores.append(msg)
+
+    @classmethod
+    def warning(cls, msg):
+        cls.errores.append(msg)
+
+
+def _usar_sqlite(monkeypatch, tmp_path, latencia_ms=0, size=5):
+    for modulo in (db_client, db_connection, db_absences, db_daily_loads, db_records):
+        monkeypatch.setattr(modulo, "st", MockStreamlit())
+    pool = SQLitePool(tmp_path / "wellness.db", latencia_ms=latencia_ms, seed=True)
+    estado = db_connection._pool_state(pool, size, timeout=10)
+    monkeypatch.setattr(db_connection, "init_connection", lambda: estado)
+    db_records.clear_records_cache()
+    monkeypatch.setitem(db_daily_loads._tabla, "lista", False)
+    db_absences._load_absence_index.clear()
+    MockStreamlit.errores.clear()
+    return estado
+
+
+def test_traduce_sql_mysql():
+    sql = translate_sql(
+        "SELECT UPPER(CONCAT(f.nombre, ' ', f.apellido)), GREATEST(a, b) FROM t "
+        "WHERE x = %(x)s AND y = %s AND d = CURDATE() AND e BETWEEN DATE_SUB(l.f, INTERVAL %(dias)s DAY) AND l.f"
+    )
+    assert "(f.nombre || ' ' || f.apellido)" in sql
+    assert "MAX(a, b)" in sql
+    assert ":x" in sql and "y = ?" in sql
+    assert "date('now', 'localtime')" in sql
+    assert "date(l.f, '-' || :dias || ' days')" in sql
+    assert translate_sql("CAST(%(z)s AS JSON), NOW()") == ":z, datetime('now', 'localtime')"
+
+
+def test_capa_db_completa_sobre_sqlite(monkeypatch, tmp_path):
+    _usar_sqlite(monkeypatch, tmp_path)
+
+    df = db_records.get_records_db()
+    assert not df.empty
+    assert isinstance(df["fecha_sesion"].iloc[0], datetime.date)
+
+    hoy = datetime.date.today()
+    registro = {
+        "id_jugadora": "J001", "fecha_sesion": hoy, "tipo": "checkIn", "turno": "Turno 2",
+        "recuperacion": 4, "fatiga": 3, "sueno": 4, "stress": 2, "dolor": 1,
+        "zonas_anatomicas_dolor": "[]", "usuario": "staff",
+    }
+    assert db_records.upsert_record_db(registro)
+    assert db_records.upsert_record_db({**registro, "minutos_sesion": 60, "rpe": 6, "ua": 360}, modo="checkout")
+
+    nuevo = db_records.get_records_db(start=hoy, end=hoy, id_jugadora="J001")
+    fila = nuevo[nuevo["turno"] == "Turno 2"].iloc[0]
+    assert fila["tipo"] == "checkOut" and fila["ua"] == 360
+
+    diario = db_daily_loads.load_daily_loads_db(start=hoy, end=hoy, id_jugadora="J001")
+    assert diario["ua_total"].iloc[0] == 360
+
+    assert not db_absences.load_active_absences_db().empty
+    assert MockStreamlit.errores == []
+
+
+def test_carga_concurrente_sesiones_staff(monkeypatch, tmp_path):
+    """20 sesiones de staff a la vez: lecturas, check-in y ausencias con latencia simulada."""
+    estado = _usar_sqlite(monkeypatch, tmp_path, latencia_ms=2, size=5)
+    hoy = datetime.date.today()
+    fallos = []
+
+    def sesion(n: int):
+        try:
+            assert not db_records.get_records_db(start=hoy - datetime.timedelta(days=14), end=hoy).empty
+            ok = db_records.upsert_record_db({
+                "id_jugadora": f"J{n + 1:03d}", "fecha_sesion": hoy, "tipo": "checkIn",
+                "turno": "Turno 3", "recuperacion": 3, "usuario": "staff",
+            })
+            assert ok
+            assert db_absences.load_active_absences_db() is not None
+        except Exception as e:
+            fallos.append(e)
+
+    hilos = [threading.Thread(target=sesion, args=(n,)) for n in range(20)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert fallos == [] and MockStreamlit.errores == []
+    stats = db_connection.get_pool_stats()
+    assert stats["max_en_uso"] <= estado["size"]
+    assert stats["en_uso"] == 0
+
+    turno3 = db_records.get_records_db(start=hoy, end=hoy)
+    assert (turno3["turno"] == "Turno 3").sum() == 20
+
+
+def test_resumen_diario_en_la_misma_transaccion_y_sin_cachear_fallos(monkeypatch, tmp_path):
+    _usar_sqlite(monkeypatch, tmp_path)
+    hoy = datetime.date.today()
+
+    # Un fallo transitorio al comprobar la tabla no se recuerda
+    execute = db_daily_loads.execute
+    monkeypatch.setattr(db_daily_loads, "execute", lambda *a, **k: False)
+    assert not db_daily_loads.ensure_daily_loads_table()
+    monkeypatch.setattr(db_daily_loads, "execute", execute)
+    assert db_daily_loads.ensure_daily_loads_table()
+
+    # Si falla el recálculo del resumen, tampoco se guarda el registro
+    transacciones = []
+    original = db_records.execute_transaction
+
+    def con_fallo(statements):
+        transacciones.append(statements)
+        return original(statements + [("INSERT INTO tabla_inexistente VALUES (1);", None)])
+
+    monkeypatch.setattr(db_records, "execute_transaction", con_fallo)
+    registro = {"id_jugadora": "J002", "fecha_sesion": hoy, "tipo": "checkIn", "turno": "Turno 2", "usuario": "staff"}
+    assert not db_records.upsert_record_db(registro)
+    assert any("wellness_diario" in sql for sql, _ in transacciones[0])
+    assert db_records.search_existing_record(registro) is None
+
+
+
+def test_resumen_diario_por_conjunto_de_dias(monkeypatch, tmp_path):
+    _usar_sqlite(monkeypatch, tmp_path)
+    dia = datetime.date.today() + datetime.timedelta(days=30)
+    transacciones = []
+    original = db_records.execute_transaction
+    monkeypatch.setattr(db_records, "execute_transaction", lambda st_: transacciones.append(st_) or original(st_))
+
+    registros = [
+        {"id_jugadora": "J003", "fecha_sesion": dia, "tipo": "checkIn", "turno": turno,
+         "recuperacion": valor, "usuario": "staff"}
+        for turno, valor in (("Turno 1", 4), ("Turno 2", 2))
+    ]
+    for registro in registros:
+        assert db_records.upsert_record_db(registro)
+    # Escritura + upsert del resumen + borrado de días vacíos, sin bucle por día
+    assert [len(t) for t in transacciones] == [3, 3]
+
+    diario = db_daily_loads.load_daily_loads_db(start=dia, end=dia, id_jugadora="J003")
+    assert diario["registros"].iloc[0] == 2 and diario["recuperacion"].iloc[0] == 3
+
+    ids = [db_records.search_existing_record(r)["id"] for r in registros]
+    assert db_records.delete_record(ids[:1], "staff")[0]
+    assert db_daily_loads.load_daily_loads_db(start=dia, end=dia, id_jugadora="J003")["registros"].iloc[0] == 1
+    assert db_records.delete_record(ids[1:], "staff")[0]
+    assert db_daily_loads.load_daily_loads_db(start=dia, end=dia, id_jugadora="J003").empty
+    assert MockStreamlit.errores == []
+
+
+def test_lote_con_numero_fijo_de_sentencias(monkeypatch, tmp_path):
+    _usar_sqlite(monkeypatch, tmp_path)
+    inicio = datetime.date.today() + datetime.timedelta(days=40)
+    dias = [inicio, inicio + datetime.timedelta(days=1)]
+    transacciones = []
+    original = db_records.execute_transaction
+    monkeypatch.setattr(db_records, "execute_transaction", lambda st_: transacciones.append(st_) or original(st_))
+
+    lote = [
+        {"id_jugadora": f"J{n:03d}", "fecha_sesion": dia, "tipo": "checkIn", "turno": "Turno 1",
+         "recuperacion": 3, "usuario": "staff", "minutos_sesion": 60, "rpe": 5, "ua": 300}
+        for n in range(1, 13) for dia in dias
+    ]
+    assert db_records.upsert_records_db(lote)[1]["insertados"] == 24
+    assert db_records.upsert_records_db(lote, modo="checkout")[1]["actualizados"] == 24
+
+    # INSERT + UPDATE (executemany) + upsert del resumen + borrado de días vacíos, para 24 días
+    assert [len(t) for t in transacciones] == [4, 4]
+    diario = db_daily_loads.load_daily_loads_db(start=dias[0], end=dias[1])
+    assert len(diario) == 24 and (diario["ua_total"] == 300).all()
+    assert MockStreamlit.errores == []
+
+
+def test_importacion_checkin_y_checkout_en_una_transaccion(monkeypatch, tmp_path):
+    _usar_sqlite(monkeypatch, tmp_path)
+    dia = datetime.date.today() + datetime.timedelta(days=50)
+    transacciones = []
+    original = db_records.execute_transaction
+    monkeypatch.setattr(db_records, "execute_transaction", lambda st_: transacciones.append(st_) or original(st_))
+
+    completa = {"id_jugadora": "J004", "fecha_sesion": dia, "tipo": "checkIn", "turno": "Turno 1",
+                "recuperacion": 3, "usuario": "staff", "minutos_sesion": 90, "rpe": 6, "ua": 540}
+    sin_checkin = {**completa, "id_jugadora": "J005"}
+
+    ok, resumen = db_records.import_records_db([completa], [completa, sin_checkin])
+
+    assert ok and resumen == {"insertados": 1, "actualizados": 1, "omitidos": 1}
+    assert len(transacciones) == 1
+    fila = db_records.get_records_db(start=dia, end=dia, id_jugadora="J004").iloc[0]
+    assert fila["tipo"] == "checkOut" and fila["ua"] == 540 and fila["recuperacion"] == 3
+    assert db_records.get_records_db(start=dia, end=dia, id_jugadora="J005").empty
+
+    # Si falla la escritura no queda ni el check-in
+    otra = {**completa, "fecha_sesion": dia + datetime.timedelta(days=1)}
+    monkeypatch.setattr(db_records, "execute_transaction",
+                        lambda st_: original(st_ + [("INSERT INTO tabla_inexistente VALUES (1);", None)]))
+    assert not db_records.import_records_db([otra], [otra])[0]
+    assert db_records.search_existing_record(otra) is None
+
+
+def test_transaccion_fallida_registra_la_sentencia_que_falla(monkeypatch, tmp_path):
+    import modules.db.db_query_stats as db_query_stats
+
+    _usar_sqlite(monkeypatch, tmp_path)
+    db_query_stats.reset_query_stats()
+
+    ok = db_client.execute_transaction([
+        ("UPDATE wellness SET turno = turno WHERE id = %s", (1,)),
+        ("UPDATE tabla_inexistente SET x = 1", None),
+    ])
+
+    assert ok is False
+    top = db_query_stats.top_queries().set_index("sql")
+    assert top.loc["UPDATE tabla_inexistente SET x = ?", "errores"] == 1
+    assert top.loc["UPDATE wellness SET turno = turno WHERE id = ?", "errores"] == 0
@@ -0,0 +1,45 @@
+import json
+import os
+
+import modules.i18n.i18n as i18n
+
+
+class MockStreamlit:
+    session_state = {"lang": "en"}
+
+
+def _catalogo(tmp_path, monkeypatch, contenido):
+    ruta = tmp_path / "en.json"
+    ruta.write_text(json.dumps(contenido), encoding="utf-8")
+    monkeypatch.setattr(i18n, "_LANG_DIR", tmp_path)
+    monkeypatch.setattr(i18n, "st", MockStreamlit())
+    monkeypatch.setattr(i18n, "_catalogos", {})
+    return ruta
+
+
+def test_catalogo_se_lee_una_vez(tmp_path, monkeypatch):
+    _catalogo(tmp_path, monkeypatch, {"Guardar": "Save"})
+    lecturas = []
+    json_load = json.load
+    monkeypatch.setattr(i18n.json, "load", lambda f: lecturas.append(1) or json_load(f))
+
+    assert [i18n.t("Guardar") for _ in range(200)] == ["Save"] * 200
+    assert i18n.t("Sin traducir") == "Sin traducir"
+    assert len(lecturas) == 1
+
+
+def test_recarga_si_cambia_el_fichero(tmp_path, monkeypatch):
+    ruta = _catalogo(tmp_path, monkeypatch, {"Guardar": "Save"})
+    monkeypatch.setattr(i18n, "_RECHEQUEO_S", 0)
+    assert i18n.t("Guardar") == "Save"
+
+    ruta.write_text(json.dumps({"Guardar": "Store"}), encoding="utf-8")
+    os.utime(ruta, (ruta.stat().st_atime, ruta.stat().st_mtime + 10))
+    assert i18n.t("Guardar") == "Store"
+
+    # Idioma sin fichero: texto original
+    MockStreamlit.session_state["lang"] = "de"
+    try:
+        assert i18n.t("Guardar") == "Guardar"
+    finally:
+        MockStreamlit.session_state["lang"] = "en"
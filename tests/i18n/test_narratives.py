@@ -0,0 +1,43 @@
+import json
+
+import modules.i18n.i18n as i18n
+import modules.i18n.narratives as narratives
+
+
+class MockStreamlit:
+    session_state = {"lang": "es"}
+
+
+compilaciones = []
+
+
+@narratives.narrative("prueba_resumen")
+def _compilar(tr):
+    compilaciones.append(1)
+    return {
+        "plantilla": f"{tr('Carga de')} {{ua:.0f}} UA, {tr('estado')} {{estado}}.",
+        "etiquetas": {"alta": f"**{tr('alta')}**", "n_alertas": f"{{n}} {tr('alertas')}"},
+    }
+
+
+def test_compila_una_vez_por_idioma_y_formatea_valores(tmp_path, monkeypatch):
+    (tmp_path / "en.json").write_text(json.dumps({
+        "Carga de": "Load of", "estado": "status {raw}", "alta": "high", "alertas": "alerts",
+    }), encoding="utf-8")
+    monkeypatch.setattr(i18n, "_LANG_DIR", tmp_path)
+    monkeypatch.setattr(i18n, "_catalogos", {})
+    monkeypatch.setattr(narratives, "st", MockStreamlit())
+    monkeypatch.setattr(narratives, "_compiladas", {})
+    compilaciones.clear()
+
+    for ua in (100, 250.4):
+        texto = narratives.render_narrative("prueba_resumen", {"ua": ua}, {"estado": "alta"})
+    assert texto == "Carga de 250 UA, estado **alta**."
+
+    # Otro idioma (p. ej. para exportar) sin tocar la sesión; las llaves de
+    # la traducción no se interpretan como campos
+    texto = narratives.render_narrative("prueba_resumen", {"ua": 90, "n": 3}, {"estado": "n_alertas"}, lang="en")
+    assert texto == "Load of 90 UA, status {raw} 3 alerts."
+    narratives.render_narrative("prueba_resumen", {"ua": 1}, {"estado": "alta"}, lang="en")
+
+    assert len(compilaciones) == 2
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+# ============================================================
+#  🔹 PRUEBAS DE CARGA DE LAS PÁGINAS
+# ============================================================
+# Solo con WELLNESS_LOAD=1 y por separado del resto de la suite (otros
+# tests sustituyen el módulo st de modules/db por mocks):
+#
+#   WELLNESS_LOAD=1 python -m pytest tests/load -q -s
+#
+# Para una carga mayor, usar el arnés directamente (ver harness.py).
+
+ACTIVO = os.environ.get("WELLNESS_LOAD") == "1"
+
+
+def pytest_collection_modifyitems(config, items):
+    if ACTIVO:
+        return
+    saltar = pytest.mark.skip(reason="pruebas de carga desactivadas (WELLNESS_LOAD=1 para ejecutarlas)")
+    for item in items:
+        if os.sep + "load" + os.sep in str(item.fspath):
+            item.add_marker(saltar)
@@ -0,0 +1,284 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest
+
+from modules.auth_system.auth_core import create_jwt
+from modules.db.db_query_stats import query_count
+from modules.db.db_sqlite import SQLitePool
+
+# ============================================================
+#  🔹 ARNÉS DE CARGA CON SESIONES SIMULADAS (AppTest)
+# ============================================================
+# Simula N sesiones de staff contra las páginas de la app, cada una con su
+# propio session_state y guion de interacciones, sobre el backend SQLite de
+# db_sqlite (sin MySQL).
+#
+#   python tests/load/harness.py --sesiones 20 --rondas 3 --latencia-ms 5
+#   python tests/load/harness.py --sesiones 8 --procesos 8
+#
+# AppTest no es reentrante (sustituye Runtime._instance y st.secrets
+# globales en cada run), así que dentro de un proceso los reruns se
+# ejecutan de uno en uno: las sesiones se intercalan con su tiempo de pausa
+# y comparten las cachés (cache_data, cache_resource, registros, pool). Ese
+# modo mide el coste por rerun y la espera en cola, no la capacidad con
+# sesiones concurrentes.
+#
+# Con --procesos N las sesiones se reparten entre N procesos (uno por
+# sesión si N = sesiones) sobre el mismo fichero SQLite: los reruns de
+# procesos distintos sí corren en paralelo y compiten por CPU y por la BD,
+# pero cada proceso tiene sus propias cachés.
+#
+# Informe por página: reruns, p50/p95/máx del rerun, p95 de la espera en
+# cola, consultas SQL por rerun, errores y RSS; el pico de RSS, el
+# rendimiento (reruns/s) y el paralelismo efectivo (tiempo de rerun sumado
+# / duración): ~1 en modo serializado, cerca de N si no hay contención.
+
+# AppTest deja app.py como __main__ tras un run; spawn lo re-ejecutaría en cada proceso
+_MAIN = sys.modules["__main__"]
+
+PAGINAS = ("app.py", "pages/registro.py", "pages/individual.py", "pages/grupal.py", "pages/admin.py")
+
+def _widget(widgets, etiqueta: str):
+    return next(w for w in widgets if w.label == etiqueta)
+
+def _seleccionar(widgets, etiqueta: str, rng: random.Random):
+    selectbox = _widget(widgets, etiqueta)
+    selectbox.select_index(rng.randrange(len(selectbox.options)))
+
+def _radio(etiqueta: str):
+    def paso(at, rng):
+        radio = _widget(at.radio, etiqueta)
+        radio.set_value(rng.choice(radio.options))
+    return paso
+
+# Interacciones tras abrir cada página; cada paso deja el AppTest listo para run()
+GUIONES = {
+    "app.py": [_radio("Periodo:"), _radio("Periodo:")],
+    "pages/registro.py": [
+        lambda at, rng: _seleccionar(at.selectbox, "Jugadora", rng),
+        _radio("Tipo de registro"),
+    ],
+    "pages/individual.py": [lambda at, rng: _seleccionar(at.selectbox, "Jugadora", rng)],
+    "pages/grupal.py": [lambda at, rng: _seleccionar(at.selectbox, "Turno", rng)],
+    "pages/admin.py": [lambda at, rng: _widget(at.button, "Siguiente :material/chevron_right:").click()],
+}
+
+def _rss_mb() -> float:
+    """RSS actual del proceso (Linux); si no hay /proc, el pico."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return _pico_rss_mb()
+
+def _pico_rss_mb() -> float:
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 2**20 if sys.platform == "darwin" else pico / 2**10
+
+def nueva_sesion(n: int, secrets: dict, rol: str = "admin", timeout: float = 120) -> AppTest:
+    """AppTest de app.py con una sesión ya autenticada (token JWT válido)."""
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout)
+    at.secrets = secrets
+    usuario = f"staff{n}@wellness.test"
+    at.session_state["auth"] = {
+        "is_logged_in": True, "username": usuario, "name": f"staff{n}", "rol": rol,
+        "token": create_jwt(f"staff{n}", usuario, rol, session_id=f"carga-{n}"),
+        "session_id": f"carga-{n}",
+    }
+    at.session_state["_auth_bootstrap_done"] = True
+    return at
+
+class _Medidas:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paginas = {p: {"latencias": [], "esperas": [], "consultas": [], "errores": 0, "rss_mb": 0.0} for p in PAGINAS}
+        self.fallos: list[str] = []
+
+    def anotar(self, pagina, latencia, espera, consultas, errores, rss_mb):
+        with self.lock:
+            m = self.paginas[pagina]
+            m["latencias"].append(latencia)
+            m["esperas"].append(espera)
+            m["consultas"].append(consultas)
+            m["errores"] += len(errores)
+            m["rss_mb"] = max(m["rss_mb"], rss_mb)
+            self.fallos.extend(f"{pagina}: {e}" for e in errores)
+
+    def combinar(self, paginas: dict, fallos: list[str]):
+        """Suma las medidas de otro proceso (ver _proceso)."""
+        with self.lock:
+            for pagina, otra in paginas.items():
+                m = self.paginas[pagina]
+                for clave in ("latencias", "esperas", "consultas"):
+                    m[clave].extend(otra[clave])
+                m["errores"] += otra["errores"]
+                m["rss_mb"] = max(m["rss_mb"], otra["rss_mb"])
+            self.fallos.extend(fallos)
+
+def _rerun(at: AppTest, pagina: str, accion, medidas: _Medidas, turno: threading.Lock):
+    t0 = time.perf_counter()
+    with turno:
+        espera = time.perf_counter() - t0
+        consultas = query_count()
+        inicio = time.perf_counter()
+        try:
+            accion()
+            errores = [str(e.value) for e in at.exception]
+        except Exception as e:  # p. ej. el widget del guion no está en la página
+            errores = [f"{type(e).__name__}: {e}"]
+        latencia = time.perf_counter() - inicio
+        consultas = query_count() - consultas
+        rss = _rss_mb()
+    medidas.anotar(pagina, latencia, espera, consultas, errores, rss)
+
+def _sesion(n: int, secrets: dict, rondas: int, pausa_s: float, medidas: _Medidas, turno: threading.Lock):
+    rng = random.Random(n)
+    at = nueva_sesion(n, secrets)
+    _rerun(at, "app.py", at.run, medidas, turno)
+
+    for _ in range(rondas):
+        for pagina in PAGINAS:
+            time.sleep(rng.uniform(0, pausa_s))
+            _rerun(at, pagina, lambda: at.switch_page(pagina).run(), medidas, turno)
+            for paso in GUIONES[pagina]:
+                time.sleep(rng.uniform(0, pausa_s))
+                _rerun(at, pagina, lambda: (paso(at, rng), at.run()), medidas, turno)
+
+def _intercalar(ids: list[int], secrets: dict, rondas: int, pausa_s: float, medidas: _Medidas) -> tuple[float, float]:
+    """Sesiones intercaladas en este proceso (un rerun a la vez); devuelve (inicio, fin) en time.time()."""
+    turno = threading.Lock()
+    hilos = [
+        threading.Thread(target=_sesion, args=(n, secrets, rondas, pausa_s, medidas, turno), name=f"sesion-{n}")
+        for n in ids
+    ]
+    inicio = time.time()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return inicio, time.time()
+
+def _proceso(ids: list[int], secrets: dict, rondas: int, pausa_s: float) -> dict:
+    """Punto de entrada de cada proceso del modo --procesos (resultado serializable)."""
+    medidas = _Medidas()
+    inicio, fin = _intercalar(ids, secrets, rondas, pausa_s, medidas)
+    return {"paginas": medidas.paginas, "fallos": medidas.fallos,
+            "inicio": inicio, "fin": fin, "rss_pico_mb": _pico_rss_mb()}
+
+def run_load(sesiones: int = 20, rondas: int = 2, latencia_ms: float = 5, pausa_s: float = 0.05,
+             db_path: str | None = None, procesos: int = 1) -> dict:
+    """
+    Lanza las sesiones y devuelve el informe (ver resumen). Con procesos=1
+    se intercalan en este proceso; con procesos>1 se reparten entre procesos
+    que corren en paralelo sobre el mismo fichero SQLite.
+    """
+    db_path = db_path or str(Path(tempfile.mkdtemp(prefix="wellness_carga_")) / "wellness.db")
+    secrets = {"connections": {"mysql": {
+        "backend": "sqlite", "sqlite_path": db_path, "latency_ms": latencia_ms, "seed": True,
+    }}}
+    medidas = _Medidas()
+    procesos = max(1, min(procesos, sesiones))
+
+    if procesos == 1:
+        inicio, fin = _intercalar(list(range(sesiones)), secrets, rondas, pausa_s, medidas)
+        return resumen(medidas, sesiones, fin - inicio)
+
+    # Esquema y datos de ejemplo una sola vez, antes de que los procesos compitan por sembrar
+    SQLitePool(db_path, seed=True)
+    repartos = [list(range(sesiones))[i::procesos] for i in range(procesos)]
+    # spawn: cada proceso arranca con su propio runtime de Streamlit
+    main_actual, sys.modules["__main__"] = sys.modules["__main__"], _MAIN
+    try:
+        with ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futuros = [pool.submit(_proceso, ids, secrets, rondas, pausa_s) for ids in repartos]
+            resultados = [f.result() for f in futuros]
+    finally:
+        sys.modules["__main__"] = main_actual
+
+    for r in resultados:
+        medidas.combinar(r["paginas"], r["fallos"])
+    # Ventana de trabajo real: sin el arranque de los procesos
+    duracion = max(r["fin"] for r in resultados) - min(r["inicio"] for r in resultados)
+    return resumen(medidas, sesiones, duracion, procesos, max(r["rss_pico_mb"] for r in resultados))
+
+def resumen(medidas: _Medidas, sesiones: int, duracion: float, procesos: int = 1,
+            rss_pico_mb: float | None = None) -> dict:
+    paginas = {}
+    for pagina, m in medidas.paginas.items():
+        if not m["latencias"]:
+            continue
+        lat = np.array(m["latencias"]) * 1000
+        paginas[pagina] = {
+            "reruns": len(lat),
+            "p50_ms": round(float(np.percentile(lat, 50)), 1),
+            "p95_ms": round(float(np.percentile(lat, 95)), 1),
+            "max_ms": round(float(lat.max()), 1),
+            "espera_p95_ms": round(float(np.percentile(m["esperas"], 95)) * 1000, 1),
+            "consultas_por_rerun": round(float(np.mean(m["consultas"])), 2),
+            "consultas": int(np.sum(m["consultas"])),
+            "errores": m["errores"],
+            "rss_mb": round(m["rss_mb"], 1),
+        }
+    reruns = sum(p["reruns"] for p in paginas.values())
+    ocupado = sum(sum(m["latencias"]) for m in medidas.paginas.values())
+    return {
+        "modo": "procesos" if procesos > 1 else "serializado",
+        "sesiones": sesiones,
+        "procesos": procesos,
+        "duracion_s": round(duracion, 2),
+        "reruns_por_s": round(reruns / duracion, 2) if duracion else 0.0,
+        "paralelismo": round(ocupado / duracion, 2) if duracion else 0.0,
+        "rss_pico_mb": round(rss_pico_mb if rss_pico_mb is not None else _pico_rss_mb(), 1),
+        "paginas": paginas,
+        "fallos": medidas.fallos[:20],
+    }
+
+def _imprimir(informe: dict) -> None:
+    if informe["modo"] == "procesos":
+        modo = f"{informe['procesos']} procesos en paralelo sobre el mismo SQLite"
+    else:
+        modo = "1 proceso, reruns serializados (no mide capacidad concurrente)"
+    print(f"\nSesiones: {informe['sesiones']} · {modo}\n{informe['duracion_s']} s · "
+          f"{informe['reruns_por_s']} reruns/s · paralelismo {informe['paralelismo']} · "
+          f"RSS pico {informe['rss_pico_mb']} MB{' (por proceso)' if informe['procesos'] > 1 else ''}\n")
+    print(f"{'página':<22}{'reruns':>7}{'p50 ms':>9}{'p95 ms':>9}{'máx ms':>9}"
+          f"{'cola p95':>10}{'SQL/rerun':>11}{'errores':>9}{'RSS MB':>9}")
+    for pagina, p in informe["paginas"].items():
+        print(f"{pagina:<22}{p['reruns']:>7}{p['p50_ms']:>9}{p['p95_ms']:>9}{p['max_ms']:>9}"
+              f"{p['espera_p95_ms']:>10}{p['consultas_por_rerun']:>11}{p['errores']:>9}{p['rss_mb']:>9}")
+    for fallo in informe["fallos"]:
+        print(f"  ! {fallo[:200]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga de las páginas con sesiones simuladas")
+    parser.add_argument("--sesiones", type=int, default=20)
+    parser.add_argument("--rondas", type=int, default=2, help="vueltas de cada sesión por todas las páginas")
+    parser.add_argument("--latencia-ms", type=float, default=5, help="latencia simulada por sentencia SQL")
+    parser.add_argument("--pausa-s", type=float, default=0.05, help="pausa máxima entre interacciones")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="repartir las sesiones entre N procesos en paralelo (1 = serializado)")
+    parser.add_argument("--db", help="fichero SQLite (por defecto, uno temporal con datos de ejemplo)")
+    parser.add_argument("--json", help="guardar el informe en este fichero")
+    args = parser.parse_args()
+
+    informe = run_load(args.sesiones, args.rondas, args.latencia_ms, args.pausa_s, args.db, args.procesos)
+    _imprimir(informe)
+    if args.json:
+        Path(args.json).write_text(json.dumps(informe, indent=2, ensure_ascii=False))
@@ -0,0 +1,35 @@
+import pytest
+import streamlit as st
+
+import modules.db.db_client as db_client
+import modules.db.db_records as db_records
+from harness import PAGINAS, run_load
+
+
+def test_sesiones_intercaladas_recorren_todas_las_paginas(tmp_path):
+    if db_records.st is not st or db_client.st is not st:
+        pytest.skip("st sustituido por otros tests; ejecutar tests/load por separado")
+
+    informe = run_load(sesiones=3, rondas=1, latencia_ms=1, pausa_s=0, db_path=str(tmp_path / "wellness.db"))
+
+    assert informe["fallos"] == []
+    assert set(informe["paginas"]) == set(PAGINAS)
+    for pagina in informe["paginas"].values():
+        assert pagina["errores"] == 0
+        assert pagina["p95_ms"] >= pagina["p50_ms"] > 0
+    # La primera visita a la app carga los datos desde la BD
+    assert informe["paginas"]["app.py"]["consultas"] > 0
+    assert informe["rss_pico_mb"] > 0
+    assert informe["modo"] == "serializado" and informe["paralelismo"] <= 1.01
+
+
+def test_procesos_en_paralelo_sobre_el_mismo_sqlite(tmp_path):
+    informe = run_load(sesiones=2, rondas=1, latencia_ms=1, pausa_s=0,
+                       db_path=str(tmp_path / "wellness.db"), procesos=2)
+
+    assert informe["fallos"] == []
+    assert informe["modo"] == "procesos" and informe["procesos"] == 2
+    assert set(informe["paginas"]) == set(PAGINAS)
+    # Los reruns de ambos procesos se cuentan y se solapan en el tiempo
+    assert informe["paginas"]["pages/admin.py"]["reruns"] == 2 * 2
+    assert informe["paralelismo"] > 1
@@ -0,0 +1,54 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.reports.metrics import compute_acwr_series
+
+
+def _registros():
+    """Dos turnos el día 1, hueco de 3 días y check-in sin UA."""
+    inicio = datetime.date(2025, 3, 1)
+    filas = [
+        (0, 300.0), (0, 200.0),
+        (1, 400.0),
+        (5, 350.0),
+        (6, None),
+    ] + [(d, 250.0) for d in range(7, 40)]
+    return pd.DataFrame([
+        {"fecha_sesion": inicio + datetime.timedelta(days=d), "ua": ua, "energia": 3}
+        for d, ua in filas
+    ])
+
+
+def test_serie_por_dias_naturales():
+    serie = compute_acwr_series(_registros())
+
+    # Un día por fecha natural, huecos con carga 0
+    assert len(serie) == 40
+    assert serie["ua"].iloc[0] == 500.0
+    assert serie.loc[2:4, "ua"].eq(0).all()
+    assert serie["sesiones"].iloc[6] == 0
+
+    # Aguda = media de los últimos 7 días naturales
+    dia = 10
+    esperado = serie["ua"].iloc[dia - 6:dia + 1].mean()
+    assert np.isclose(serie["acute"].iloc[dia], esperado)
+
+    cronica = serie["ua"].iloc[max(0, 30 - 27):31].mean()
+    assert np.isclose(serie["acwr"].iloc[30], serie["acute"].iloc[30] / cronica)
+
+
+def test_ewma_y_metodo_invalido():
+    serie = compute_acwr_series(_registros(), metodo="ewma")
+    ua = serie["ua"]
+    esperado = ua.ewm(alpha=2 / 8, adjust=False).mean() / ua.ewm(alpha=2 / 29, adjust=False).mean()
+    assert np.allclose(serie["acwr"].iloc[7:], esperado.iloc[7:])
+
+    with pytest.raises(ValueError):
+        compute_acwr_series(_registros(), metodo="otro")
+
+
+def test_sin_datos():
+    assert compute_acwr_series(pd.DataFrame()).empty
@@ -0,0 +1,98 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from modules.reports.metrics import (
+    BATCH_METRIC_COLUMNS,
+    RPEFilters,
+    build_daily_loads,
+    compute_rpe_metrics,
+    compute_rpe_metrics_batch,
+    latest_rpe_metrics,
+)
+from modules.reports.plots_grupales import _agregar_diario
+
+
+def _registros():
+    """Dos jugadoras, varios turnos por día y días sin carga."""
+    rng = np.random.default_rng(7)
+    inicio = datetime.date(2025, 1, 1)
+    rows = []
+    for jugadora in ["J1", "J2"]:
+        for d in range(60):
+            if rng.random() < 0.3:
+                continue
+            for _ in range(rng.integers(1, 3)):
+                rows.append({
+                    "id_jugadora": jugadora,
+                    "nombre_jugadora": f"JUGADORA {jugadora}",
+                    "fecha_sesion": inicio + datetime.timedelta(days=d),
+                    "tipo": "checkOut",
+                    "ua": float(rng.integers(100, 600)),
+                    "minutos_sesion": float(rng.integers(30, 90)),
+                })
+    # Un check-in sin UA no debe contar
+    rows.append({"id_jugadora": "J1", "fecha_sesion": inicio, "tipo": "checkIn", "ua": None})
+    return pd.DataFrame(rows)
+
+
+def test_batch_equivale_a_compute_rpe_metrics_por_jugadora_y_dia():
+    df = _registros()
+    batch = compute_rpe_metrics_batch(df)
+
+    assert not batch.empty
+    for _, fila in batch.iterrows():
+        esperado = compute_rpe_metrics(
+            df[df["id_jugadora"] == fila["id_jugadora"]], RPEFilters(end=fila["fecha_sesion"])
+        )
+        for col in BATCH_METRIC_COLUMNS:
+            if esperado[col] is None:
+                assert pd.isna(fila[col]), col
+            else:
+                assert np.isclose(fila[col], esperado[col]), col
+
+
+def test_batch_df_vacio():
+    out = compute_rpe_metrics_batch(pd.DataFrame())
+    assert out.empty
+    assert "acwr" in out.columns
+
+
+def test_latest_rpe_metrics_una_fila_por_jugadora():
+    batch = compute_rpe_metrics_batch(_registros())
+    ultimo = latest_rpe_metrics(batch)
+
+    assert sorted(ultimo["id_jugadora"]) == ["J1", "J2"]
+    for _, fila in ultimo.iterrows():
+        assert fila["fecha_sesion"] == batch.loc[batch["id_jugadora"] == fila["id_jugadora"], "fecha_sesion"].max()
+
+
+def test_batch_desde_resumen_diario_equivale_a_registros():
+    df = _registros()
+    desde_registros = compute_rpe_metrics_batch(df)
+    desde_resumen = compute_rpe_metrics_batch(build_daily_loads(df))
+
+    pd.testing.assert_frame_equal(
+        desde_registros[BATCH_METRIC_COLUMNS].reset_index(drop=True),
+        desde_resumen[BATCH_METRIC_COLUMNS].reset_index(drop=True),
+    )
+
+
+def test_agregado_semanal_recompone_media_y_desviacion():
+    df = _registros()
+    df["rpe"] = np.arange(len(df)) % 10 + 1
+    df.loc[df["tipo"] == "checkIn", "rpe"] = np.nan
+    df["semana"] = pd.to_datetime(df["fecha_sesion"]).dt.isocalendar().week
+
+    diario = build_daily_loads(df)
+    diario["semana"] = pd.to_datetime(diario["fecha_sesion"]).dt.isocalendar().week
+
+    semanal = _agregar_diario(diario, "semana").set_index("semana")
+    crudo = df.groupby("semana").agg(
+        carga_total=("ua", "sum"), carga_media=("ua", "mean"),
+        desv_std=("ua", "std"), rpe_prom=("rpe", "mean"),
+    )
+
+    for col in crudo.columns:
+        assert np.allclose(semanal[col], crudo[col], equal_nan=True), col
@@ -0,0 +1,48 @@
+import datetime
+import random
+
+import pandas as pd
+
+from modules.util.absence_index import absences_between, absent_players, build_absence_index, is_absent
+
+BASE = datetime.date(2025, 1, 1)
+
+
+def _ausencias(n=60, semilla=7):
+    rnd = random.Random(semilla)
+    filas = []
+    for i in range(n):
+        inicio = BASE + datetime.timedelta(days=rnd.randint(0, 90))
+        fin = inicio + datetime.timedelta(days=rnd.randint(0, 20))
+        filas.append({"id": i, "id_jugadora": f"J{rnd.randint(1, 12)}", "fecha_inicio": inicio, "fecha_fin": fin})
+    return pd.DataFrame(filas)
+
+
+def test_consultas_coinciden_con_recorrido_completo():
+    df = _ausencias()
+    indice = build_absence_index(df)
+
+    for dia in range(-5, 120, 3):
+        d = BASE + datetime.timedelta(days=dia)
+        esperadas = set(df.loc[(df["fecha_inicio"] <= d) & (df["fecha_fin"] >= d), "id"])
+        assert absences_between(indice, d) == esperadas
+        jugadoras = set(df.loc[df["id"].isin(esperadas), "id_jugadora"])
+        assert absent_players(indice, d) == jugadoras
+        assert all(is_absent(indice, j, d) == (j in jugadoras) for j in df["id_jugadora"].unique())
+
+        fin = d + datetime.timedelta(days=9)
+        solapan = set(df.loc[(df["fecha_inicio"] <= fin) & (df["fecha_fin"] >= d), "id"])
+        assert absences_between(indice, pd.Timestamp(d), fin) == solapan
+
+
+def test_indice_vacio_y_fechas_invalidas():
+    assert absent_players(build_absence_index(pd.DataFrame()), BASE) == set()
+
+    df = pd.DataFrame([
+        {"id": 1, "id_jugadora": "J1", "fecha_inicio": BASE, "fecha_fin": None},
+        {"id": 2, "id_jugadora": "J2", "fecha_inicio": "2025-01-05", "fecha_fin": "2025-01-03"},
+        {"id": 3, "id_jugadora": "J3", "fecha_inicio": "2025-01-02", "fecha_fin": "2025-01-02"},
+    ])
+    indice = build_absence_index(df)
+    assert absent_players(indice, datetime.date(2025, 1, 2)) == {"J3"}
+    assert not is_absent(indice, "J3", datetime.date(2025, 1, 3))
@@ -137,3 +137,32 @@ def test_compute_player_wellness_means_riesgo_y_no_riesgo():
     assert fila_B["prom_w_1_5"] <= 3
     assert fila_B["dolor_mean"] <= 3
     assert fila_B["en_riesgo"] == False  # np.False_ OK
+
+
+# ==============================
+# ✅ Subconjunto de la caché compacta
+# ==============================
+
+def test_subconjunto_de_la_cache_no_arrastra_jugadoras_ausentes():
+    from modules.db.db_records import _compact_records
+    from modules.ui.ui_components import filtrar_registros
+
+    ids = [f"J{i}" for i in range(10)]
+    cache = _compact_records(pd.DataFrame({
+        "id": range(10),
+        "id_jugadora": ids,
+        "nombre_jugadora": [f"JUGADORA {i}" for i in range(10)],
+        "plantel": "1FF",
+        "tipo": "checkIn",
+        "turno": "Turno 1",
+        "fecha_sesion": pd.Timestamp("2025-03-10"),
+        "recuperacion": 2, "energia": 2, "sueno": 2, "stress": 2, "dolor": 1,
+        "rpe": None,
+    }))
+
+    sub = filtrar_registros(cache, jugadora_opt={"id_jugadora": "J3"}, modo="reporte",
+                            start=pd.Timestamp("2025-03-01"), end=pd.Timestamp("2025-03-31"))
+
+    # Sin category: con pandas 2.x groupby(observed=False) emitiría las 10 jugadoras
+    assert not any(isinstance(t, pd.CategoricalDtype) for t in sub.dtypes)
+    assert compute_player_wellness_means(sub)["nombre_jugadora"].tolist() == ["JUGADORA 3"]
@@ -0,0 +1,55 @@
+import datetime
+
+import pandas as pd
+
+from modules.ui.ui_app import compute_check_status, get_pendientes_check
+
+JUGADORAS = pd.DataFrame({
+    "id_jugadora": ["J1", "J2", "J3", "J4"],
+    "nombre_jugadora": ["DIANA", "ANA", "CARLA", "BEA"],
+    "posicion": ["POR", "DEF", "MC", "DEL"],
+    "plantel": ["1FF", "1FF", "1FF", "2FF"],
+})
+
+HOY = datetime.date(2025, 3, 10)
+AYER = datetime.date(2025, 3, 9)
+
+REGISTROS = pd.DataFrame([
+    # J1: check-in y check-out hoy turno 1
+    {"id_jugadora": "J1", "tipo": "checkIn", "fecha_sesion": HOY, "turno": "Turno 1"},
+    {"id_jugadora": "J1", "tipo": "checkOut", "fecha_sesion": HOY, "turno": "Turno 1"},
+    # J2: solo check-in hoy
+    {"id_jugadora": "J2", "tipo": "checkin", "fecha_sesion": HOY, "turno": "Turno 1"},
+    # J4 (otro plantel): solo check-out ayer
+    {"id_jugadora": "J4", "tipo": "checkout", "fecha_sesion": AYER, "turno": "Turno 2"},
+])
+
+
+def test_pendientes_del_periodo():
+    pendientes_in, pendientes_out = get_pendientes_check(REGISTROS, JUGADORAS)
+
+    assert pendientes_in["id_jugadora"].tolist() == ["J3"]
+    # Ordenadas por nombre: ANA (J2), CARLA (J3)
+    assert pendientes_out["id_jugadora"].tolist() == ["J2", "J3"]
+    assert pendientes_out.columns.tolist() == ["id_jugadora", "nombre_jugadora", "posicion", "plantel"]
+
+
+def test_estado_por_fecha_y_turno_todos_los_planteles():
+    estado = compute_check_status(REGISTROS, JUGADORAS, claves=["fecha_sesion", "turno"])
+
+    # 4 jugadoras × 2 sesiones observadas
+    assert len(estado) == 8
+    hoy = estado[estado["fecha_sesion"] == HOY].set_index("id_jugadora")
+    assert hoy.loc["J1", ["checkin", "checkout"]].tolist() == [True, True]
+    assert hoy.loc["J2", "pendiente_checkout"]
+    assert hoy.loc["J4", "pendiente_checkin"]
+
+    ayer = estado[estado["fecha_sesion"] == AYER].set_index("id_jugadora")
+    assert not ayer.loc["J4", "pendiente_checkin"]
+    assert ayer.loc["J1", "pendiente_checkin"]
+    assert set(estado["plantel"]) == {"1FF", "2FF"}
+
+
+def test_sin_registros_todas_pendientes():
+    pendientes_in, pendientes_out = get_pendientes_check(REGISTROS.iloc[0:0], JUGADORAS)
+    assert len(pendientes_in) == len(pendientes_out) == 4
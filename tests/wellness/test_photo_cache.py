@@ -0,0 +1,108 @@
+import io
+import time
+
+import pytest
+import requests
+from PIL import Image
+
+import modules.util.photo_cache as photo_cache
+
+
+class _Respuesta:
+    def __init__(self, contenido, tipo="image/png", estado=200):
+        self.content = contenido
+        self.headers = {"Content-Type": tipo}
+        self.status_code = estado
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+
+def _png(lado=1200):
+    salida = io.BytesIO()
+    Image.new("RGB", (lado, lado // 2), "red").save(salida, format="PNG")
+    return salida.getvalue()
+
+
+@pytest.fixture
+def descargas(monkeypatch, tmp_path):
+    llamadas = []
+    respuestas = {}
+
+    def fake_get(url, timeout=None):
+        llamadas.append((url, timeout))
+        respuesta = respuestas.get(url)
+        if respuesta is None:
+            raise requests.exceptions.ConnectTimeout(url)
+        return respuesta
+
+    monkeypatch.setattr(photo_cache, "_DIR_DISCO", tmp_path)
+    monkeypatch.setattr(photo_cache.requests, "get", fake_get)
+    photo_cache.clear_photo_cache()
+    return llamadas, respuestas
+
+
+def test_miniatura_cacheada_en_memoria_y_disco(descargas):
+    llamadas, respuestas = descargas
+    url = "https://drive.google.com/file/d/ABC123/view?usp=sharing"
+    respuestas["https://drive.google.com/uc?id=ABC123"] = _Respuesta(_png())
+
+    foto = photo_cache.get_player_photo(url)
+    assert Image.open(io.BytesIO(foto)).size == (600, 300)
+    assert llamadas == [("https://drive.google.com/uc?id=ABC123", photo_cache._TIMEOUT_S)]
+
+    # Rerun: memoria. Proceso nuevo (memoria vacía): disco. Nunca otra descarga.
+    assert photo_cache.get_player_photo(url) == foto
+    photo_cache.clear_photo_cache()
+    assert photo_cache.get_player_photo("https://drive.google.com/open?id=ABC123") == foto
+    assert len(llamadas) == 1
+    assert photo_cache.get_photo_cache_stats()["disco"] == 1
+
+
+def test_caché_negativa_para_urls_que_fallan(descargas):
+    llamadas, respuestas = descargas
+    respuestas["https://cdn.example.com/no-es-imagen.png"] = _Respuesta(b"<html>", tipo="text/html")
+
+    assert photo_cache.get_player_photo("https://cdn.example.com/caida.png") is None
+    assert photo_cache.get_player_photo("https://cdn.example.com/caida.png?size=300") is None
+    assert photo_cache.get_player_photo("https://cdn.example.com/no-es-imagen.png") is None
+
+    assert len(llamadas) == 2
+    stats = photo_cache.get_photo_cache_stats()
+    assert stats["negativos"] == 1 and stats["urls_fallidas"] == 2
+
+
+def test_precarga_de_plantel_en_segundo_plano(descargas):
+    llamadas, respuestas = descargas
+    urls = [f"https://cdn.example.com/j{i}.png?size=120" for i in range(6)]
+    for url in urls:
+        respuestas[url.split("?")[0]] = _Respuesta(_png(200))
+
+    encoladas = photo_cache.prefetch_photos(urls + [urls[0], "No Disponible", None])
+    assert encoladas == 6
+
+    for _ in range(100):
+        if photo_cache.get_photo_cache_stats()["en_cola"] == 0:
+            break
+        time.sleep(0.02)
+
+    # Ya en memoria: no se vuelven a encolar ni a descargar
+    assert photo_cache.prefetch_photos(urls) == 0
+    assert all(photo_cache.get_player_photo(url) for url in urls)
+    assert len(llamadas) == 6
+
+
+def test_caché_negativa_acotada(descargas, monkeypatch):
+    monkeypatch.setattr(photo_cache, "_MAX_FALLOS", 3)
+
+    for i in range(5):
+        assert photo_cache.get_player_photo(f"https://cdn.example.com/caida{i}.png") is None
+    assert list(photo_cache._photo_store()["fallos"]) == [f"https://cdn.example.com/caida{i}.png" for i in (2, 3, 4)]
+
+    # Al anotar un fallo nuevo se purgan los caducados
+    fallos = photo_cache._photo_store()["fallos"]
+    for url in fallos:
+        fallos[url] = time.time() - 1
+    assert photo_cache.get_player_photo("https://cdn.example.com/otra.png") is None
+    assert list(photo_cache._photo_store()["fallos"]) == ["https://cdn.example.com/otra.png"]
@@ -0,0 +1,76 @@
+import os
+import time
+
+import modules.util.profiler as profiler
+
+
+class MockStreamlit:
+    session_state = {}
+
+
+def _setup(monkeypatch, tmp_path, rol="developer", cprofile=False):
+    mock = MockStreamlit()
+    mock.session_state = {"auth": {"rol": rol}, "perfilado": True, "perfilado_cprofile": cprofile}
+    monkeypatch.setattr(profiler, "st", mock)
+    monkeypatch.setattr(profiler, "get_script_run_ctx", lambda **k: object())
+    monkeypatch.setattr(profiler, "_DIR_PERFILES", tmp_path)
+    return mock.session_state
+
+
+def test_secciones_anidadas_y_contadores(monkeypatch, tmp_path):
+    estado = _setup(monkeypatch, tmp_path)
+
+    profiler.start_profile()
+    with profiler.section("Carga de datos"):
+        profiler.count("consultas")
+        profiler.count("sql_s", 0.02)
+        with profiler.section("registros"):
+            profiler.count("registros_miss")
+            time.sleep(0.01)
+    profiler.count("consultas")  # fuera de secciones
+
+    run = estado["_perfil_run"]
+    tabla = profiler._tabla(run, total=0.05)
+    assert tabla["sección"].tolist() == ["Carga de datos", "\u2003registros", "(fuera de secciones)"]
+    assert tabla["consultas"].tolist() == [1, 0, 1]
+    assert tabla.loc[1, "registros hit/miss"] == "0/1"
+    assert tabla.loc[0, "ms"] >= tabla.loc[1, "ms"] >= 10
+
+    resumen = profiler._cerrar(run, completo=True)["resumen"]
+    assert resumen["consultas"] == 2 and resumen["sql_ms"] == 20.0
+    assert estado["_perfil_run"] is None
+    assert estado["perfiles"][-1]["completo"]
+
+
+def test_rerun_detenido_se_cierra_y_vuelca_cprofile(monkeypatch, tmp_path):
+    estado = _setup(monkeypatch, tmp_path, cprofile=True)
+
+    profiler.start_profile()
+    with profiler.section("selection_header"):
+        sum(range(1000))
+    # st.stop(): no llega a render_profile; el siguiente rerun cierra este
+    profiler.start_profile()
+
+    anterior = estado["perfiles"][-1]
+    assert not anterior["completo"]
+    assert anterior["cprofile"].endswith(".prof")
+    assert list(tmp_path.glob("*.prof"))
+    profiler._cerrar(estado["_perfil_run"], completo=True)
+
+
+def test_sin_modo_perfilado_no_registra(monkeypatch, tmp_path):
+    estado = _setup(monkeypatch, tmp_path, rol="admin")
+
+    profiler.start_profile()
+    with profiler.section("Carga de datos"):
+        profiler.count("consultas")
+
+    assert estado.get("_perfil_run") is None
+    assert "perfiles" not in estado
+
+
+def test_call_site_salta_el_directorio_excluido():
+    origen, pagina = profiler.call_site()
+    assert origen == "tests/wellness/test_profiler.py:test_call_site_salta_el_directorio_excluido"
+    assert pagina == "-"
+    assert profiler.call_site(excluir=os.path.dirname(os.path.abspath(__file__)))[0] != origen
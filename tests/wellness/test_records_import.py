@@ -0,0 +1,54 @@
+import datetime
+import io
+
+import pandas as pd
+import pytest
+
+from modules.util.records_import import READ_ERRORS, build_player_index, prepare_chunk, read_chunks
+
+CSV = """Jugadora;Fecha;Turno;Recuperacion;Energia;Sueno;Stress;Dolor;Minutos;RPE
+Ana Pérez;10/03/2025;1;3;2;4;3;1;;
+ANA PEREZ;2025-03-10;Turno 2;;;;;;90;6
+J2;2025-03-11;turno 1;3;2;4;3;1;60;5
+Desconocida;2025-03-11;1;3;2;4;3;1;;
+J2;2025-03-12;1;9;2;4;3;1;;
+J2;2025-03-12;4;3;2;4;3;1;;
+"""
+
+JUGADORAS = pd.DataFrame({"id_jugadora": ["J1", "J2"], "nombre_jugadora": ["ANA PÉREZ", "BEA RUIZ"]})
+
+
+def _bloques(chunksize):
+    archivo = io.BytesIO(CSV.encode("utf-8"))
+    archivo.size = len(CSV.encode("utf-8"))
+    return list(read_chunks(archivo, "datos.csv", chunksize))
+
+
+def test_lectura_por_bloques_con_progreso():
+    bloques = _bloques(chunksize=2)
+    assert [len(b) for b, _ in bloques] == [2, 2, 2]
+    assert "fatiga" in bloques[0][0].columns  # alias energia → fatiga
+    assert bloques[-1][1] == 1.0
+
+
+def test_prepare_chunk_valida_y_calcula_ua():
+    bloque = pd.concat([b for b, _ in _bloques(chunksize=100)])
+    checkins, checkouts, errores = prepare_chunk(bloque, build_player_index(JUGADORAS), "staff")
+
+    assert [(r["id_jugadora"], r["turno"]) for r in checkins] == [("J1", "Turno 1"), ("J2", "Turno 1")]
+    assert checkins[0]["fecha_sesion"] == datetime.date(2025, 3, 10)
+    assert [(r["id_jugadora"], r["ua"]) for r in checkouts] == [("J1", 540), ("J2", 300)]
+    assert [e["fila"] for e in errores] == [5, 6, 7]
+    assert "Desconocida" in errores[0]["error"]
+
+
+@pytest.mark.parametrize("nombre, contenido", [
+    ("vacio.csv", b""),
+    ("utf16.csv", "Jugadora;Fecha\nAna;2025-03-10\n".encode("utf-16")),
+    ("corrupto.xlsx", b"no es un zip"),
+])
+def test_ficheros_ilegibles_dan_errores_de_lectura(nombre, contenido):
+    archivo = io.BytesIO(contenido)
+    archivo.size = len(contenido)
+    with pytest.raises(READ_ERRORS):
+        list(read_chunks(archivo, nombre))